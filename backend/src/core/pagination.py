@@ -0,0 +1,203 @@
+import binascii
+import datetime
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+LEGACY_FALSE_VALUES = ("0", "false", "no", "off")
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder memotong datetime ke milidetik; posisi cursor butuh nilai persis."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination dipakai oleh semua endpoint list.
+
+    - ?page_size=<n>      jumlah item per halaman (maks. max_page_size)
+    - ?cursor=<token>     halaman berikutnya/sebelumnya (dari field next/previous)
+    - ?paginate=false     format lama: list penuh tanpa pagination
+
+    Urutan diambil dari order_by queryset (atau Meta.ordering model),
+    sehingga setiap endpoint tetap memakai urutan yang sama seperti sebelumnya.
+
+    Posisi di cursor berisi nilai *semua* field urutan + pk (bukan hanya
+    field pertama seperti CursorPagination bawaan DRF), sehingga field
+    pertama yang tidak unik (title, created_at, ...) tidak membuat baris
+    terlewat / dobel antar halaman, dan tidak ada OFFSET scan. NULL
+    diurutkan sebagai nilai terbesar (nulls last untuk asc, first untuk desc).
+    """
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    legacy_query_param = "paginate"
+    ordering = "pk"
+
+    def is_legacy_request(self, request):
+        value = request.query_params.get(self.legacy_query_param)
+        return value is not None and value.lower() in LEGACY_FALSE_VALUES
+
+    def get_ordering(self, request, queryset, view):
+        ordering = [f for f in queryset.query.order_by if isinstance(f, str) and f != "?"]
+
+        if not ordering:
+            ordering = [f for f in queryset.model._meta.ordering if isinstance(f, str)]
+
+        # lookup relasi ("user__username") tidak bisa dipakai sebagai posisi cursor
+        ordering = [f for f in ordering if "__" not in f]
+
+        if not ordering:
+            ordering = [self.ordering]
+
+        # tie-breaker unik agar posisi cursor stabil
+        if not any(f.lstrip("-") in ("pk", "id") for f in ordering):
+            ordering.append("-pk" if ordering[0].startswith("-") else "pk")
+
+        return tuple(ordering)
+
+    # -----------------------------------------------------------------
+    # posisi cursor = nilai semua field urutan
+    # -----------------------------------------------------------------
+    def _field_value(self, instance, name):
+        if isinstance(instance, dict):
+            return instance[name]
+        if name != "pk":
+            try:
+                name = instance._meta.get_field(name).attname  # FK → <field>_id
+            except FieldDoesNotExist:
+                pass  # anotasi
+        return getattr(instance, name)
+
+    def _position(self, instance):
+        return [self._field_value(instance, f.lstrip("-")) for f in self.ordering]
+
+    def _order_by(self, reverse):
+        expressions = []
+        for f in self.ordering:
+            descending = f.startswith("-") != reverse
+            field = F(f.lstrip("-"))
+            expressions.append(field.desc(nulls_first=True) if descending else field.asc(nulls_last=True))
+        return expressions
+
+    def _after(self, position, reverse):
+        """
+        Baris setelah `position` dalam arah baca, secara leksikografis:
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for f, value in zip(self.ordering, position):
+            name = f.lstrip("-")
+            descending = f.startswith("-") != reverse
+            if value is None:
+                after = Q(**{f"{name}__isnull": False}) if descending else Q(pk__in=[])
+                same = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__lt": value}) if descending else (
+                    Q(**{f"{name}__gt": value}) | Q(**{f"{name}__isnull": True})
+                )
+                same = Q(**{name: value})
+            condition |= equal & after
+            equal &= same
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_legacy_request(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor.reverse if self.cursor else False
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if self.cursor is not None:
+            queryset = queryset.filter(self._after(self.cursor.position, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        # ada cursor → halaman sebelum/sesudah posisi cursor pasti ada
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._position(self.page[-1])
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._position(self.page[0])
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def encode_cursor(self, cursor):
+        payload = json.dumps({"r": int(cursor.reverse), "p": cursor.position}, cls=CursorEncoder)
+        encoded = urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            reverse = bool(data["r"])
+            position = data["p"]
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+
+class PaginatedActionMixin:
+    """
+    Helper untuk @action list-style di ViewSet agar memakai pagination
+    yang sama dengan endpoint list bawaan.
+    """
+
+    def paginated_response(self, queryset, serializer_class, **kwargs):
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = serializer_class(page, many=True, **kwargs)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = serializer_class(queryset, many=True, **kwargs)
+        return Response(serializer.data)
@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'nested_admin',
@@ -174,6 +175,27 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL ='/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache PDF CV hasil render WeasyPrint (lihat cv/utils/render_cache.py).
+# Jangan diletakkan di MEDIA_ROOT: isinya data pribadi pegawai.
+CV_PDF_CACHE_DIR = os.environ.get('CV_PDF_CACHE_DIR', BASE_DIR / 'cache' / 'cv_pdf')
+CV_PDF_CACHE_MAX_BYTES = int(os.environ.get('CV_PDF_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Hasil generate CV massal (ZIP + status job, lihat cv/batch.py)
+CV_BATCH_DIR = os.environ.get('CV_BATCH_DIR', BASE_DIR / 'cache' / 'cv_batch')
+
+# Sertifikat & transkrip course (lihat exam/certificates.py)
+CERTIFICATE_DIR = os.environ.get('CERTIFICATE_DIR', BASE_DIR / 'cache' / 'certificates')
+
 SITE_ID = 1
 
 X_FRAME_OPTIONS = 'ALLOWALL'
+
+
+# Django REST Framework
+# Semua endpoint list memakai cursor pagination (lihat core/pagination.py).
+# Client lama bisa menambahkan ?paginate=false untuk list penuh.
+
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 50)),
+}
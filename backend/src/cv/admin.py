@@ -1,4 +1,7 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.urls import reverse
+
+from .batch import BatchJob, cv_command_args
 from .models import (
     UserProfile,
     Education,
@@ -58,6 +61,7 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_display = ["full_name", "user", "gender", "phone_number"]
     search_fields = ["full_name", "user__username", "phone_number"]
     list_filter = ["gender", "religion"]
+    actions = ["generate_cv_zip"]
 
     # Inline content (CV lengkap)
     inlines = [
@@ -68,3 +72,18 @@ class UserProfileAdmin(admin.ModelAdmin):
         TrainingHistoryInline,
         CertificationInline,
     ]
+
+    @admin.action(description="Generate CV (ZIP) untuk profil terpilih")
+    def generate_cv_zip(self, request, queryset):
+        users = list(queryset.values_list("user_id", flat=True))
+        params = {"users": users, "theme": "professional"}
+        job = BatchJob.create(params, requested_by=request.user.id)
+        if not job.start("generate_cvs", *cv_command_args(params)):
+            self.message_user(request, f"Job gagal dijalankan: {job.read_status()['error']}", messages.ERROR)
+            return
+        self.message_user(
+            request,
+            f"{len(users)} CV sedang dibuat. Status: {reverse('cv-batch-detail', args=[job.id])} — "
+            f"unduh: {reverse('cv-batch-download', args=[job.id])}",
+            messages.INFO,
+        )
@@ -0,0 +1,308 @@
+"""
+Generate CV massal (semua peserta course / semua pegawai satu unit kerja)
+menjadi satu file ZIP.
+
+- HTML dirender di proses utama (butuh database), layout WeasyPrint
+  dijalankan paralel di ProcessPoolExecutor; tiap worker menyimpan
+  stylesheet tema sendiri (lihat get_theme_stylesheet)
+- PDF ditulis worker ke cache disk CV (cv/utils/render_cache.py), jadi
+  profil yang tidak berubah tidak dirender ulang, dan preview di web
+  ikut memakai hasilnya
+- ZIP ditulis bertahap setiap kali satu PDF selesai (stream bisa tidak
+  seekable, mis. stdout)
+- dijalankan lewat `manage.py generate_cvs`; endpoint API / admin hanya
+  membuat job dan menjalankan command tersebut sebagai proses terpisah,
+  progress dibaca dari file status job
+"""
+import json
+import os
+import subprocess
+import sys
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.text import slugify
+
+from exam.models import CourseParticipant
+
+from .models import EmployeeInfo, UserProfile
+from .utils.generate_pdf import html_to_pdf
+from .utils.render_cache import (
+    PROFILE_RELATIONS,
+    evict,
+    pdf_path,
+    remember,
+    render_generations,
+    render_key,
+    store_pdf,
+    touch,
+)
+
+
+BATCH_SIZE = 200
+
+
+def resolve_user_ids(course_id=None, unit_kerja=None, user_ids=None):
+    ids = set(user_ids or [])
+    if course_id:
+        ids.update(
+            CourseParticipant.objects
+                .filter(course_id=course_id, role="participant")
+                .values_list("user_id", flat=True)
+        )
+    if unit_kerja:
+        ids.update(
+            EmployeeInfo.objects
+                .filter(unit_kerja__iexact=unit_kerja)
+                .values_list("user_id", flat=True)
+        )
+    return sorted(ids)
+
+
+def cv_filename(profile):
+    return f"cv_{slugify(profile.full_name)}_{profile.user_id}.pdf"
+
+
+def iter_profiles(user_ids):
+    """Yield (profile, generasi cache PDF); generasi dibaca sebelum profil dimuat."""
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        chunk = user_ids[start:start + BATCH_SIZE]
+        generations = render_generations(chunk)
+        for profile in (
+            UserProfile.objects
+                .filter(user_id__in=chunk)
+                .prefetch_related(*PROFILE_RELATIONS)
+                .order_by("user_id")
+        ):
+            yield profile, generations[profile.user_id]
+
+
+def profile_context(profile, theme):
+    return {
+        "profile": profile,
+        "education": profile.educations.all(),
+        "work": profile.work_experiences.all(),
+        "skills": profile.skills.all(),
+        "certs": profile.certifications.all(),
+        "languages": profile.languages.all(),
+        "trainings": profile.trainings.all(),
+        "theme": theme,
+        # tanpa request: link stylesheet relatif terhadap base_url (STATIC_ROOT)
+        "STATIC_URL_ABS": "",
+    }
+
+
+# =====================================================================
+# WORKER (proses terpisah)
+# =====================================================================
+def _init_worker():
+    import django
+    from django.apps import apps
+
+    if not apps.ready:  # start method "spawn"
+        django.setup()
+
+
+def _render(job):
+    store_pdf(Path(job["path"]), html_to_pdf(job["html"], job["theme"]))
+
+
+# =====================================================================
+# BATCH
+# =====================================================================
+def render_to_zip(jobs, out, total, workers=None, progress=None, on_done=None):
+    """
+    Render job PDF secara paralel dan tulis hasilnya ke ZIP `out`.
+
+    jobs   : iterable dict {"id", "path", "filename", "theme", "html"};
+             "html" None berarti PDF sudah ada di `path` (cache)
+    progress(done, total) dipanggil setiap satu PDF masuk ZIP,
+    on_done(job) setelah PDF job masuk ZIP.
+    Return (done, rendered, errors).
+    """
+    done = 0
+    rendered = 0
+    errors = {}
+    workers = workers or os.cpu_count() or 1
+
+    def report():
+        if progress:
+            progress(done, total)
+
+    report()
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as zf, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+
+        def finish(job):
+            nonlocal done
+            try:
+                zf.write(job["path"], arcname=job["filename"])
+            except OSError as e:
+                # file cache bisa dihapus (signals / evict) sebelum masuk ZIP
+                errors[job["id"]] = str(e)
+                return
+            if on_done:
+                on_done(job)
+            done += 1
+            report()
+
+        def collect(futures):
+            for future in futures:
+                job = pending.pop(future)
+                try:
+                    future.result()
+                except Exception as e:  # satu PDF gagal tidak menggagalkan batch
+                    errors[job["id"]] = str(e)
+                    continue
+                finish(job)
+
+        pending = {}
+        for job in jobs:
+            if job.get("html") is None:
+                finish(job)
+                continue
+
+            pending[pool.submit(_render, job)] = job
+            rendered += 1
+
+            # batasi job yang antre agar HTML tidak menumpuk di memori
+            if len(pending) >= workers * 4:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+
+        collect(wait(pending).done)
+
+    return done, rendered, errors
+
+
+def generate_batch(user_ids, theme, out, workers=None, progress=None):
+    """
+    Tulis ZIP berisi CV user_ids ke file object `out`.
+    progress(done, total) dipanggil setiap satu CV selesai.
+    Return dict ringkasan.
+    """
+    missing = set(user_ids)
+
+    def jobs():
+        for profile, generation in iter_profiles(user_ids):
+            missing.discard(profile.user_id)
+            key = render_key(profile, theme)
+            job = {
+                "id": profile.user_id,
+                "key": key,
+                "generation": generation,
+                "path": str(pdf_path(profile.user_id, key)),
+                "filename": cv_filename(profile),
+                "theme": theme,
+                "html": None,
+            }
+            if not touch(job["path"]):
+                job["html"] = render_to_string(f"cv_theme/{theme}/index.html", profile_context(profile, theme))
+            yield job
+
+    def on_done(job):
+        remember(job["id"], theme, job["key"], job["filename"], job["generation"])
+
+    done, rendered, errors = render_to_zip(jobs(), out, len(user_ids), workers, progress, on_done)
+
+    # file batch baru bisa membuat cache melewati batas ukuran
+    evict()
+
+    return {
+        "total": len(user_ids),
+        "generated": done,
+        "rendered": rendered,
+        "from_cache": done - rendered,
+        "without_profile": sorted(missing),
+        "errors": errors,
+    }
+
+
+# =====================================================================
+# JOB (dipicu dari API / admin)
+# =====================================================================
+def batch_dir():
+    path = Path(getattr(settings, "CV_BATCH_DIR", Path(settings.BASE_DIR) / "cache" / "cv_batch"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class BatchJob:
+    def __init__(self, job_id):
+        self.id = str(uuid.UUID(str(job_id)))  # ValueError bila id tidak valid
+        self.status_path = batch_dir() / f"{self.id}.json"
+        self.zip_path = batch_dir() / f"{self.id}.zip"
+        self.log_path = batch_dir() / f"{self.id}.log"
+
+    @classmethod
+    def create(cls, params, requested_by=None):
+        job = cls(uuid.uuid4())
+        job.write_status(
+            state="queued",
+            params=params,
+            requested_by=requested_by,
+            created_at=timezone.now().isoformat(),
+            done=0,
+            total=None,
+        )
+        return job
+
+    def read_status(self):
+        try:
+            with open(self.status_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write_status(self, **changes):
+        status = self.read_status() or {"id": self.id}
+        status.update(changes)
+        tmp = self.status_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(status, f)
+        os.replace(tmp, self.status_path)
+        return status
+
+    def start(self, command, *args):
+        """
+        Jalankan `manage.py <command> --job <id> <args>` sebagai proses
+        terpisah; command menulis progress lewat write_status().
+        Return False (status "failed") bila proses gagal dijalankan.
+        """
+        cmd = [
+            sys.executable, str(Path(settings.BASE_DIR) / "manage.py"), command,
+            "--job", self.id,
+            *[str(a) for a in args],
+        ]
+
+        try:
+            # stderr ke file log job: jejak bila proses mati sebelum menulis status
+            with open(self.log_path, "ab") as log:
+                subprocess.Popen(
+                    cmd,
+                    cwd=str(settings.BASE_DIR),
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=log,
+                    start_new_session=True,
+                )
+        except OSError as e:
+            self.write_status(state="failed", error=str(e), finished_at=timezone.now().isoformat())
+            return False
+        return True
+
+
+def cv_command_args(params):
+    """Argumen `generate_cvs` dari data CVBatchRequestSerializer."""
+    args = ["--theme", params["theme"]]
+    if params.get("course"):
+        args += ["--course", params["course"]]
+    if params.get("unit_kerja"):
+        args += ["--unit-kerja", params["unit_kerja"]]
+    for uid in params.get("users") or []:
+        args += ["--user", uid]
+    return args
@@ -0,0 +1,159 @@
+"""
+Export data pegawai (EmployeeInfo) beserta pendidikan, sertifikasi, dan
+riwayat pelatihan dari CV.
+
+- pegawai dibaca per batch (iterator), relasi diambil per batch dengan
+  satu query values_list per tabel → jumlah query = 1 + 4 per batch,
+  tanpa membuat object model
+- XLSX: workbook write-only, satu sheet per relasi; baris langsung
+  ditulis ke file sementara sehingga memori tetap konstan
+- CSV: satu relasi per file (?sheet=), di-stream ke response
+"""
+import csv
+import tempfile
+
+import openpyxl
+
+from .models import Certification, Education, EmployeeInfo, TrainingHistory, UserProfile
+
+
+BATCH_SIZE = 1000
+
+EMPLOYEE_FIELDS = (
+    "user_id",
+    "user__username",
+    "user__email",
+    "nip",
+    "nik",
+    "unit_kerja",
+    "bidang_kerja",
+    "jabatan",
+    "golongan_ruang",
+    "status_kepegawaian",
+)
+
+# sheet → (model, header, kolom values_list); kolom pertama selalu user id
+RELATION_SHEETS = {
+    "pendidikan": (
+        Education,
+        ["Jenjang", "Institusi", "Program Studi", "Tahun Masuk", "Tahun Lulus", "IPK"],
+        ("degree", "institution_name", "study_program", "year_in", "year_out", "gpa"),
+    ),
+    "sertifikasi": (
+        Certification,
+        ["Sertifikasi", "Penerbit", "Tanggal Terbit", "Berlaku Sampai"],
+        ("name", "issuer", "issue_date", "expiry_date"),
+    ),
+    "pelatihan": (
+        TrainingHistory,
+        ["Pelatihan", "Penyelenggara", "Tanggal Mulai", "Tanggal Selesai"],
+        ("title", "organizer", "start_date", "end_date"),
+    ),
+}
+
+EMPLOYEE_HEADER = [
+    "User ID", "Username", "Email", "Nama Lengkap", "NIP", "NIK", "Unit Kerja",
+    "Bidang Kerja", "Jabatan", "Golongan/Ruang", "Status Kepegawaian",
+]
+RELATION_PREFIX = ["User ID", "NIP", "Nama Lengkap"]
+
+SHEETS = ["pegawai", *RELATION_SHEETS]
+
+
+class Echo:
+    """Pseudo-buffer untuk csv.writer pada StreamingHttpResponse."""
+
+    def write(self, value):
+        return value
+
+
+def employee_queryset(unit_kerja=None, bidang_kerja=None):
+    qs = EmployeeInfo.objects.all()
+    if unit_kerja:
+        qs = qs.filter(unit_kerja__iexact=unit_kerja)
+    if bidang_kerja:
+        qs = qs.filter(bidang_kerja__iexact=bidang_kerja)
+    return qs.order_by("user_id")
+
+
+def iter_batches(queryset):
+    """Yield list tuple EMPLOYEE_FIELDS per BATCH_SIZE pegawai."""
+    batch = []
+    for row in queryset.values_list(*EMPLOYEE_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def batch_rows(employees, sheets=SHEETS):
+    """
+    Return {sheet: [baris, ...]} untuk satu batch pegawai; relasi CV
+    dihubungkan lewat UserProfile.user_id.
+    """
+    user_ids = [e[0] for e in employees]
+    names = dict(UserProfile.objects.filter(user_id__in=user_ids).values_list("user_id", "full_name"))
+    nips = {e[0]: e[3] for e in employees}
+
+    rows = {}
+    if "pegawai" in sheets:
+        rows["pegawai"] = [
+            [uid, username, email, names.get(uid), *rest]
+            for uid, username, email, *rest in employees
+        ]
+
+    for sheet, (model, _, fields) in RELATION_SHEETS.items():
+        if sheet not in sheets:
+            continue
+        rows[sheet] = [
+            [uid, nips.get(uid), names.get(uid), *values]
+            for uid, *values in (
+                model.objects
+                    .filter(user__user_id__in=user_ids)
+                    .order_by("user__user_id", "id")
+                    .values_list("user__user_id", *fields)
+            )
+        ]
+    return rows
+
+
+def sheet_header(sheet):
+    if sheet == "pegawai":
+        return EMPLOYEE_HEADER
+    return RELATION_PREFIX + RELATION_SHEETS[sheet][1]
+
+
+# =====================================================================
+# EXPORT (XLSX write-only / CSV streaming)
+# =====================================================================
+def write_xlsx(queryset):
+    """
+    Satu sheet per relasi, ditulis bergantian per batch (tiap sheet
+    write-only punya file sementara sendiri). Return file object yang
+    sudah di-seek ke awal.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    sheets = {}
+    for sheet in SHEETS:
+        sheets[sheet] = wb.create_sheet(sheet.capitalize())
+        sheets[sheet].append(sheet_header(sheet))
+
+    for employees in iter_batches(queryset):
+        for sheet, rows in batch_rows(employees).items():
+            for row in rows:
+                sheets[sheet].append(row)
+
+    tmp = tempfile.TemporaryFile()
+    wb.save(tmp)
+    tmp.seek(0)
+    return tmp
+
+
+def iter_csv(queryset, sheet):
+    writer = csv.writer(Echo())
+    yield writer.writerow(sheet_header(sheet))
+    for employees in iter_batches(queryset):
+        for row in batch_rows(employees, sheets=[sheet])[sheet]:
+            yield writer.writerow(["" if v is None else v for v in row])
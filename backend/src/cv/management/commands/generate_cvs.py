@@ -0,0 +1,71 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from cv.batch import BatchJob, generate_batch, resolve_user_ids
+from cv.utils.render_cache import available_themes
+
+
+class Command(BaseCommand):
+    help = "Generate CV (PDF) banyak user sekaligus ke satu file ZIP."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", type=int, help="Semua peserta course ini.")
+        parser.add_argument("--unit-kerja", help="Semua pegawai dengan unit kerja ini.")
+        parser.add_argument("--user", type=int, action="append", dest="users", help="User id (boleh berulang).")
+        parser.add_argument("--theme", default="professional")
+        parser.add_argument("--output", help="Path file ZIP, atau '-' untuk stdout.")
+        parser.add_argument("--workers", type=int, help="Jumlah proses (default: jumlah CPU).")
+        parser.add_argument("--job", help="ID job (dipakai oleh endpoint batch API).")
+
+    def handle(self, *args, **options):
+        theme = options["theme"]
+        if theme not in available_themes():
+            raise CommandError(f"Tema '{theme}' tidak dikenal. Pilihan: {', '.join(available_themes())}.")
+
+        job = BatchJob(options["job"]) if options["job"] else None
+        if job is None and not options["output"]:
+            raise CommandError("--output wajib diisi.")
+
+        try:
+            self.run(job, theme, options)
+        except Exception as e:
+            if job is not None:
+                job.write_status(state="failed", error=str(e), finished_at=timezone.now().isoformat())
+            raise
+
+    def run(self, job, theme, options):
+        user_ids = resolve_user_ids(options["course"], options["unit_kerja"], options["users"])
+        if not user_ids:
+            raise CommandError("Tidak ada user yang cocok.")
+
+        # progress ke stderr bila ZIP dikirim ke stdout
+        log = self.stderr if options["output"] == "-" else self.stdout
+
+        def progress(done, total):
+            if job is not None:
+                job.write_status(state="running", done=done, total=total)
+            if options["verbosity"] > 0:
+                log.write(f"\r{done}/{total} CV", ending="")
+
+        if options["output"] == "-":
+            summary = generate_batch(user_ids, theme, sys.stdout.buffer, options["workers"], progress)
+        else:
+            output = str(job.zip_path) if job is not None else options["output"]
+            # file .part di-rename setelah selesai, agar ZIP setengah jadi tidak pernah diunduh
+            partial = output + ".part"
+            with open(partial, "wb") as out:
+                summary = generate_batch(user_ids, theme, out, options["workers"], progress)
+            os.replace(partial, output)
+
+        if job is not None:
+            job.write_status(state="done", finished_at=timezone.now().isoformat(), **summary)
+
+        log.write("")
+        log.write(self.style.SUCCESS(
+            f"{summary['generated']} CV ({summary['rendered']} dirender, "
+            f"{summary['from_cache']} dari cache), {len(summary['without_profile'])} user tanpa profil, "
+            f"{len(summary['errors'])} gagal."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from cv.talent import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Index ulang dokumen pencarian talent untuk semua profil CV."
+
+    def handle(self, *args, **options):
+        total = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"{total} profil di-index."))
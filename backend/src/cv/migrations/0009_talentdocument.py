@@ -0,0 +1,161 @@
+# Generated by Django 4.0 on 2026-10-19 13:59
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+TALENT_INDEXES = [
+    django.contrib.postgres.indexes.GinIndex(fields=['skill_tokens'], name='cv_talent_skill_trgm', opclasses=['gin_trgm_ops']),
+    django.contrib.postgres.indexes.GinIndex(fields=['certification_tokens'], name='cv_talent_cert_trgm', opclasses=['gin_trgm_ops']),
+    django.contrib.postgres.indexes.GinIndex(fields=['language_tokens'], name='cv_talent_lang_trgm', opclasses=['gin_trgm_ops']),
+    django.contrib.postgres.indexes.GinIndex(fields=['keywords'], name='cv_talent_keywords_trgm', opclasses=['gin_trgm_ops']),
+]
+
+
+def add_talent_indexes(apps, schema_editor):
+    # index trigram hanya ada di Postgres
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    model = apps.get_model('cv', 'TalentDocument')
+    for index in TALENT_INDEXES:
+        schema_editor.add_index(model, index)
+
+
+def remove_talent_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    model = apps.get_model('cv', 'TalentDocument')
+    for index in TALENT_INDEXES:
+        schema_editor.remove_index(model, index)
+
+
+# salinan beku logika cv/talent.py (document_fields) pada saat migrasi ini
+# dibuat; migrasi tidak boleh bergantung pada kode aplikasi yang bisa berubah
+BACKFILL_BATCH_SIZE = 500
+BACKFILL_DEGREES = ['SLTP', 'SLTA', 'S1', 'Profesi', 'S2', 'Sp1', 'S3', 'Sp2']
+BACKFILL_SKILL_LEVELS = ['Basic', 'Intermediate', 'Advanced', 'Expert']
+BACKFILL_RELATIONS = ('educations', 'skills', 'certifications', 'languages', 'work_experiences', 'trainings')
+
+
+def _normalize(text):
+    return ' '.join((text or '').replace('|', ' ').lower().split())
+
+
+def _join_tokens(values):
+    values = sorted(set(v for v in values if v))
+    return '|' + '|'.join(values) + '|' if values else ''
+
+
+def _rank(levels, value):
+    return levels.index(value) + 1 if value in levels else 0
+
+
+def _document_fields(profile, employee):
+    educations = list(profile.educations.all())
+    skills = list(profile.skills.all())
+    certifications = list(profile.certifications.all())
+    languages = list(profile.languages.all())
+    work = list(profile.work_experiences.all())
+
+    degree_rank = max((_rank(BACKFILL_DEGREES, e.degree) for e in educations), default=0)
+    skill_rank = max((_rank(BACKFILL_SKILL_LEVELS, s.level) for s in skills), default=0)
+
+    unit_kerja = (employee.unit_kerja or '') if employee else ''
+    jabatan = (employee.jabatan or '') if employee else ''
+
+    keywords = [profile.full_name, unit_kerja, jabatan]
+    keywords += [e.degree for e in educations]
+    keywords += [e.institution_name for e in educations]
+    keywords += [e.study_program for e in educations]
+    keywords += [s.skill_name for s in skills]
+    keywords += [s.category for s in skills]
+    keywords += [c.name for c in certifications]
+    keywords += [c.issuer for c in certifications]
+    keywords += [l.language for l in languages]
+    keywords += [w.position for w in work]
+    keywords += [w.company_name for w in work]
+    keywords += [t.title for t in profile.trainings.all()]
+
+    return {
+        'user_id': profile.user_id,
+        'full_name': profile.full_name,
+        'unit_kerja': unit_kerja,
+        'jabatan': jabatan,
+        'highest_degree': BACKFILL_DEGREES[degree_rank - 1] if degree_rank else '',
+        'degree_rank': degree_rank,
+        'top_skill_level': BACKFILL_SKILL_LEVELS[skill_rank - 1] if skill_rank else '',
+        'degree_tokens': _join_tokens(_normalize(e.degree) for e in educations),
+        'skill_tokens': _join_tokens(f'{_normalize(s.skill_name)}:{_normalize(s.level)}' for s in skills),
+        'certification_tokens': _join_tokens(_normalize(c.name) for c in certifications),
+        'language_tokens': _join_tokens(f'{_normalize(l.language)}:{_normalize(l.proficiency)}' for l in languages),
+        'keywords': ' '.join(_normalize(k) for k in keywords if k),
+    }
+
+
+def backfill_talent_documents(apps, schema_editor):
+    UserProfile = apps.get_model('cv', 'UserProfile')
+    EmployeeInfo = apps.get_model('cv', 'EmployeeInfo')
+    TalentDocument = apps.get_model('cv', 'TalentDocument')
+
+    profile_ids = list(UserProfile.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(profile_ids), BACKFILL_BATCH_SIZE):
+        profiles = list(
+            UserProfile.objects
+                .filter(pk__in=profile_ids[start:start + BACKFILL_BATCH_SIZE])
+                .prefetch_related(*BACKFILL_RELATIONS)
+        )
+        employees = {
+            e.user_id: e
+            for e in EmployeeInfo.objects.filter(user_id__in=[p.user_id for p in profiles])
+        }
+        TalentDocument.objects.bulk_create([
+            TalentDocument(profile_id=p.pk, **_document_fields(p, employees.get(p.user_id)))
+            for p in profiles
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('cv', '0008_employeeinfo'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.CreateModel(
+            name='TalentDocument',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='talent_document', serialize=False, to='cv.userprofile')),
+                ('full_name', models.CharField(max_length=255)),
+                ('unit_kerja', models.CharField(blank=True, db_index=True, max_length=255)),
+                ('jabatan', models.CharField(blank=True, max_length=255)),
+                ('highest_degree', models.CharField(blank=True, db_index=True, max_length=20)),
+                ('degree_rank', models.PositiveSmallIntegerField(default=0)),
+                ('top_skill_level', models.CharField(blank=True, db_index=True, max_length=20)),
+                ('degree_tokens', models.TextField(blank=True)),
+                ('skill_tokens', models.TextField(blank=True)),
+                ('certification_tokens', models.TextField(blank=True)),
+                ('language_tokens', models.TextField(blank=True)),
+                ('keywords', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='auth.user')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='talentdocument',
+            index=models.Index(fields=['full_name', 'profile'], name='cv_talent_name_idx'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='talentdocument', index=index)
+                for index in TALENT_INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(add_talent_indexes, remove_talent_indexes),
+            ],
+        ),
+        migrations.RunPython(backfill_talent_documents, migrations.RunPython.noop),
+    ]
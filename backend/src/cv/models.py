@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
 
 User = get_user_model()
 
@@ -150,3 +151,51 @@ class EmployeeInfo(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.jabatan or '-'}"
+
+
+# =======================
+# Talent Search Document
+# =======================
+class TalentDocument(models.Model):
+    """
+    Satu baris per UserProfile: ringkasan CV + data kepegawaian untuk
+    pencarian talent (lihat cv/talent.py). Di-update lewat signals setiap
+    kali profil, relasinya, atau EmployeeInfo berubah.
+
+    Kolom *_tokens berisi nilai huruf kecil berbatas "|", mis.
+    skill_tokens = "|python:advanced|excel:basic|", sehingga filter cukup
+    `contains` yang memakai index trigram di Postgres.
+    """
+    profile = models.OneToOneField(
+        UserProfile, on_delete=models.CASCADE, primary_key=True, related_name="talent_document"
+    )
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="+")
+
+    full_name = models.CharField(max_length=255)
+    unit_kerja = models.CharField(max_length=255, blank=True, db_index=True)
+    jabatan = models.CharField(max_length=255, blank=True)
+
+    highest_degree = models.CharField(max_length=20, blank=True, db_index=True)
+    degree_rank = models.PositiveSmallIntegerField(default=0)
+    top_skill_level = models.CharField(max_length=20, blank=True, db_index=True)
+
+    degree_tokens = models.TextField(blank=True)
+    skill_tokens = models.TextField(blank=True)
+    certification_tokens = models.TextField(blank=True)
+    language_tokens = models.TextField(blank=True)
+    keywords = models.TextField(blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # urutan hasil (full_name, pk) untuk cursor pagination
+            models.Index(fields=["full_name", "profile"], name="cv_talent_name_idx"),
+            GinIndex(fields=["skill_tokens"], name="cv_talent_skill_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["certification_tokens"], name="cv_talent_cert_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["language_tokens"], name="cv_talent_lang_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["keywords"], name="cv_talent_keywords_trgm", opclasses=["gin_trgm_ops"]),
+        ]
+
+    def __str__(self):
+        return self.full_name
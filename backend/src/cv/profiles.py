@@ -0,0 +1,57 @@
+"""
+Resolusi UserProfile milik user yang login.
+
+- data CV (education, skill, dst.) difilter lewat relasi profil →
+  user (`user__user_id`), jadi request baca tidak perlu query profil
+  sama sekali dan tidak ada id profil yang bisa basi
+- object profil (dengan user, select_related) dimuat paling banyak
+  sekali per request
+- profil hanya dibuat saat write (create), dengan full_name default
+  dari nama / username user
+"""
+from .models import UserProfile
+
+
+def default_full_name(user):
+    return (user.get_full_name() or user.username or "")[:255]
+
+
+def remember_profile(request, profile):
+    request._cv_profile = profile
+
+
+def forget_profile(request):
+    if hasattr(request, "_cv_profile"):
+        del request._cv_profile
+
+
+def get_profile(request, create=False):
+    """Object profil user (memo per request); create=True hanya dipakai saat write."""
+    if not hasattr(request, "_cv_profile"):
+        remember_profile(
+            request,
+            UserProfile.objects.select_related("user").filter(user=request.user).first(),
+        )
+
+    if request._cv_profile is None and create:
+        profile, _ = UserProfile.objects.get_or_create(
+            user=request.user,
+            defaults={"full_name": default_full_name(request.user)},
+        )
+        remember_profile(request, profile)
+
+    return request._cv_profile
+
+
+class ProfileOwnedMixin:
+    """
+    ViewSet untuk data CV milik profil user (education, skill, dst.).
+    Turunan cukup mengisi `model`.
+    """
+    model = None
+
+    def get_queryset(self):
+        return self.model.objects.filter(user__user_id=self.request.user.pk)
+
+    def perform_create(self, serializer):
+        serializer.save(user=get_profile(self.request, create=True))
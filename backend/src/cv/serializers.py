@@ -6,8 +6,10 @@ from .models import (
     Skill,
     Certification,
     LanguageSkill,
-    TrainingHistory
+    TrainingHistory,
+    TalentDocument
 )
+from .utils.render_cache import available_themes
 
 # USER PROFILE
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -162,3 +164,50 @@ class FullCVSerializer(serializers.ModelSerializer):
             "languages",
             "trainings",
         ]
+
+
+# BATCH CV (lihat cv/batch.py)
+class CVBatchRequestSerializer(serializers.Serializer):
+    course = serializers.IntegerField(required=False)
+    unit_kerja = serializers.CharField(required=False, allow_blank=False)
+    users = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    theme = serializers.CharField(default="professional")
+
+    def validate_theme(self, value):
+        if value not in available_themes():
+            raise serializers.ValidationError("Tema tidak dikenal.")
+        return value
+
+    def validate(self, attrs):
+        if not any(attrs.get(f) for f in ("course", "unit_kerja", "users")):
+            raise serializers.ValidationError("Isi salah satu: course, unit_kerja, atau users.")
+        return attrs
+
+
+# TALENT SEARCH (lihat cv/talent.py)
+class TalentSearchSerializer(serializers.Serializer):
+    """Query params; filter multi-nilai diulang, mis. ?skill=python&skill=sql"""
+    q = serializers.CharField(required=False, allow_blank=True)
+    skill = serializers.ListField(child=serializers.CharField(), required=False)
+    skill_level = serializers.ChoiceField(choices=Skill.LEVEL_CHOICES, required=False)
+    language = serializers.ListField(child=serializers.CharField(), required=False)
+    language_level = serializers.ChoiceField(choices=LanguageSkill.PROFICIENCY_CHOICES, required=False)
+    certification = serializers.ListField(child=serializers.CharField(), required=False)
+    degree = serializers.ListField(child=serializers.ChoiceField(choices=Education.DEGREE_CHOICES), required=False)
+    min_degree = serializers.ChoiceField(choices=Education.DEGREE_CHOICES, required=False)
+    unit_kerja = serializers.ListField(child=serializers.CharField(), required=False)
+    jabatan = serializers.CharField(required=False, allow_blank=True)
+
+
+class TalentDocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TalentDocument
+        fields = [
+            "profile",
+            "user",
+            "full_name",
+            "unit_kerja",
+            "jabatan",
+            "highest_degree",
+            "top_skill_level",
+        ]
@@ -0,0 +1,76 @@
+from django.db.models.signals import post_save, post_delete
+
+from .models import (
+    UserProfile,
+    Education,
+    WorkExperience,
+    Skill,
+    Certification,
+    LanguageSkill,
+    TrainingHistory,
+    EmployeeInfo,
+)
+from . import talent
+from .utils.document_cache import invalidate_document
+from .utils.render_cache import invalidate_user
+
+
+# =====================================================================
+# CACHE PDF & DOKUMEN CV — dibuang setiap kali profil atau relasinya berubah
+# =====================================================================
+def invalidate_profile_pdf(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_document(instance.user_id)
+    invalidate_user(instance.user_id)
+
+
+def invalidate_related_pdf(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    user_id = (
+        UserProfile.objects.filter(pk=instance.user_id).values_list("user_id", flat=True).first()
+    )
+    if user_id is not None:
+        invalidate_document(user_id)
+        invalidate_user(user_id)
+
+
+post_save.connect(invalidate_profile_pdf, sender=UserProfile, dispatch_uid="cv_pdf_save_UserProfile")
+post_delete.connect(invalidate_profile_pdf, sender=UserProfile, dispatch_uid="cv_pdf_delete_UserProfile")
+
+for model in (Education, WorkExperience, Skill, Certification, LanguageSkill, TrainingHistory):
+    post_save.connect(invalidate_related_pdf, sender=model, dispatch_uid=f"cv_pdf_save_{model.__name__}")
+    post_delete.connect(invalidate_related_pdf, sender=model, dispatch_uid=f"cv_pdf_delete_{model.__name__}")
+
+
+# =====================================================================
+# TALENT SEARCH — dokumen per profil (cv/talent.py)
+# =====================================================================
+def index_talent_profile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    talent.index_profile(instance.pk, create=True)
+
+
+def index_talent_related(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    talent.index_profile(instance.user_id)
+
+
+def index_talent_employee(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    talent.index_user(instance.user_id)
+
+
+# dokumen ikut terhapus lewat CASCADE saat UserProfile dihapus
+post_save.connect(index_talent_profile, sender=UserProfile, dispatch_uid="cv_talent_save_UserProfile")
+
+for model in (Education, WorkExperience, Skill, Certification, LanguageSkill, TrainingHistory):
+    post_save.connect(index_talent_related, sender=model, dispatch_uid=f"cv_talent_save_{model.__name__}")
+    post_delete.connect(index_talent_related, sender=model, dispatch_uid=f"cv_talent_delete_{model.__name__}")
+
+post_save.connect(index_talent_employee, sender=EmployeeInfo, dispatch_uid="cv_talent_save_EmployeeInfo")
+post_delete.connect(index_talent_employee, sender=EmployeeInfo, dispatch_uid="cv_talent_delete_EmployeeInfo")
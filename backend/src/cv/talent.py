@@ -0,0 +1,223 @@
+"""
+Pencarian talent (pegawai) berdasarkan data CV dan kepegawaian.
+
+- setiap UserProfile punya satu TalentDocument (denormalisasi pendidikan,
+  skill, sertifikasi, bahasa, unit kerja, jabatan), di-update per profil
+  lewat signals (cv/signals.py); `manage.py rebuild_talent_index` untuk
+  membangun ulang semuanya (mis. setelah import massal / bulk_create)
+- filter skill / sertifikasi / bahasa / kata kunci = `contains` pada kolom
+  token huruf kecil → index trigram GIN di Postgres
+- facet (jenjang tertinggi, level skill tertinggi, unit kerja) dihitung
+  dari hasil filter dalam satu query GROUP BY
+"""
+from collections import Counter
+
+from django.db.models import Count, Q
+
+from .models import (
+    Education,
+    EmployeeInfo,
+    LanguageSkill,
+    Skill,
+    TalentDocument,
+    UserProfile,
+)
+
+
+DEGREES = [code for code, _ in Education.DEGREE_CHOICES]
+SKILL_LEVELS = [code for code, _ in Skill.LEVEL_CHOICES]
+LANGUAGE_LEVELS = [code for code, _ in LanguageSkill.PROFICIENCY_CHOICES]
+
+DOCUMENT_RELATIONS = ("educations", "skills", "certifications", "languages", "work_experiences", "trainings")
+BATCH_SIZE = 500
+
+
+def normalize(text):
+    """Huruf kecil, spasi tunggal, tanpa pemisah token."""
+    return " ".join((text or "").replace("|", " ").lower().split())
+
+
+def join_tokens(values):
+    values = sorted(set(v for v in values if v))
+    return "|" + "|".join(values) + "|" if values else ""
+
+
+def _rank(levels, value):
+    return levels.index(value) + 1 if value in levels else 0
+
+
+# =====================================================================
+# INDEXING
+# =====================================================================
+def document_fields(profile, employee=None):
+    """Field TalentDocument dari profil (relasi sebaiknya sudah di-prefetch)."""
+    educations = list(profile.educations.all())
+    skills = list(profile.skills.all())
+    certifications = list(profile.certifications.all())
+    languages = list(profile.languages.all())
+
+    degree_rank = max((_rank(DEGREES, e.degree) for e in educations), default=0)
+    skill_rank = max((_rank(SKILL_LEVELS, s.level) for s in skills), default=0)
+
+    unit_kerja = (employee.unit_kerja or "") if employee else ""
+    jabatan = (employee.jabatan or "") if employee else ""
+
+    keywords = [profile.full_name, unit_kerja, jabatan]
+    keywords += [e.degree for e in educations]
+    keywords += [e.institution_name for e in educations]
+    keywords += [e.study_program for e in educations]
+    keywords += [s.skill_name for s in skills]
+    keywords += [s.category for s in skills]
+    keywords += [c.name for c in certifications]
+    keywords += [c.issuer for c in certifications]
+    keywords += [l.language for l in languages]
+    keywords += [w.position for w in profile.work_experiences.all()]
+    keywords += [w.company_name for w in profile.work_experiences.all()]
+    keywords += [t.title for t in profile.trainings.all()]
+
+    return {
+        "user_id": profile.user_id,
+        "full_name": profile.full_name,
+        "unit_kerja": unit_kerja,
+        "jabatan": jabatan,
+        "highest_degree": DEGREES[degree_rank - 1] if degree_rank else "",
+        "degree_rank": degree_rank,
+        "top_skill_level": SKILL_LEVELS[skill_rank - 1] if skill_rank else "",
+        "degree_tokens": join_tokens(normalize(e.degree) for e in educations),
+        "skill_tokens": join_tokens(f"{normalize(s.skill_name)}:{normalize(s.level)}" for s in skills),
+        "certification_tokens": join_tokens(normalize(c.name) for c in certifications),
+        "language_tokens": join_tokens(f"{normalize(l.language)}:{normalize(l.proficiency)}" for l in languages),
+        "keywords": " ".join(normalize(k) for k in keywords if k),
+    }
+
+
+def _load_profiles(**lookup):
+    return UserProfile.objects.filter(**lookup).prefetch_related(*DOCUMENT_RELATIONS)
+
+
+def index_profile(profile_id, create=False):
+    """
+    Bangun ulang dokumen satu profil. Perubahan relasi hanya meng-update
+    dokumen yang sudah ada (create=False), agar delete cascade UserProfile
+    tidak membuat dokumen baru di tengah proses hapus.
+    """
+    profile = _load_profiles(pk=profile_id).first()
+    if profile is None:
+        return None
+
+    employee = EmployeeInfo.objects.filter(user_id=profile.user_id).first()
+    fields = document_fields(profile, employee)
+
+    if create:
+        TalentDocument.objects.update_or_create(profile_id=profile_id, defaults=fields)
+    else:
+        TalentDocument.objects.filter(profile_id=profile_id).update(**fields)
+    return fields
+
+
+def index_user(user_id):
+    """Dipanggil saat EmployeeInfo berubah."""
+    profile_id = UserProfile.objects.filter(user_id=user_id).values_list("pk", flat=True).first()
+    if profile_id is not None:
+        index_profile(profile_id)
+
+
+def rebuild_index():
+    """Index ulang semua profil; return jumlah dokumen."""
+    TalentDocument.objects.all().delete()
+
+    profile_ids = list(UserProfile.objects.order_by("pk").values_list("pk", flat=True))
+    total = 0
+    for start in range(0, len(profile_ids), BATCH_SIZE):
+        profiles = list(_load_profiles(pk__in=profile_ids[start:start + BATCH_SIZE]))
+        employees = {
+            e.user_id: e
+            for e in EmployeeInfo.objects.filter(user_id__in=[p.user_id for p in profiles])
+        }
+        TalentDocument.objects.bulk_create([
+            TalentDocument(profile_id=p.pk, **document_fields(p, employees.get(p.user_id)))
+            for p in profiles
+        ])
+        total += len(profiles)
+    return total
+
+
+# =====================================================================
+# SEARCH
+# =====================================================================
+def _at_least(levels, minimum):
+    return levels[levels.index(minimum):] if minimum in levels else levels
+
+
+def _pair_filter(field, name, levels):
+    """Cocok bila nilai `name` ada dengan level apa pun di `levels`."""
+    q = Q()
+    for level in levels:
+        q |= Q(**{f"{field}__contains": f"|{normalize(name)}:{normalize(level)}|"})
+    return q
+
+
+def filter_documents(params):
+    """params: data tervalidasi TalentSearchSerializer."""
+    qs = TalentDocument.objects.all()
+
+    for token in normalize(params.get("q")).split():
+        qs = qs.filter(keywords__contains=token)
+
+    levels = _at_least(SKILL_LEVELS, params.get("skill_level"))
+    for name in params.get("skill") or []:
+        qs = qs.filter(_pair_filter("skill_tokens", name, levels))
+
+    levels = _at_least(LANGUAGE_LEVELS, params.get("language_level"))
+    for name in params.get("language") or []:
+        qs = qs.filter(_pair_filter("language_tokens", name, levels))
+
+    for name in params.get("certification") or []:
+        qs = qs.filter(certification_tokens__contains=normalize(name))
+
+    if params.get("degree"):
+        q = Q()
+        for degree in params["degree"]:
+            q |= Q(degree_tokens__contains=f"|{normalize(degree)}|")
+        qs = qs.filter(q)
+
+    if params.get("min_degree"):
+        qs = qs.filter(degree_rank__gte=_rank(DEGREES, params["min_degree"]))
+
+    if params.get("unit_kerja"):
+        qs = qs.filter(unit_kerja__in=params["unit_kerja"])
+
+    if params.get("jabatan"):
+        qs = qs.filter(jabatan__icontains=params["jabatan"])
+
+    return qs
+
+
+def facet_counts(qs):
+    """
+    Jumlah hasil per jenjang tertinggi, level skill tertinggi, dan unit
+    kerja — satu query GROUP BY atas kombinasi ketiganya, dijumlahkan di Python.
+    """
+    degrees, levels, units = Counter(), Counter(), Counter()
+    rows = (
+        qs.order_by()
+            .values("highest_degree", "top_skill_level", "unit_kerja")
+            .annotate(n=Count("pk"))
+    )
+    for row in rows:
+        degrees[row["highest_degree"]] += row["n"]
+        levels[row["top_skill_level"]] += row["n"]
+        units[row["unit_kerja"]] += row["n"]
+
+    def ordered(counter, order):
+        return [{"value": v or None, "count": counter[v]} for v in order if counter[v]]
+
+    return {
+        "degree": ordered(degrees, DEGREES + [""]),
+        "skill_level": ordered(levels, SKILL_LEVELS + [""]),
+        "unit_kerja": [
+            {"value": v or None, "count": n}
+            for v, n in sorted(units.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        "total": sum(degrees.values()),
+    }
@@ -10,7 +10,10 @@ from .views import (
     LanguageSkillViewSet,
     TrainingHistoryViewSet,
     FullCVViewSet,
-    CVGeneratorViewSet
+    CVGeneratorViewSet,
+    CVBatchViewSet,
+    TalentSearchViewSet,
+    EmployeeExportViewSet
 )
 
 router = DefaultRouter()
@@ -23,7 +26,10 @@ router.register("certifications", CertificationViewSet, basename="certifications
 router.register("languages", LanguageSkillViewSet, basename="languages")
 router.register("trainings", TrainingHistoryViewSet, basename="trainings")
 router.register("generator", CVGeneratorViewSet, basename="cv-generator")
+router.register("batch", CVBatchViewSet, basename="cv-batch")
 router.register("full", FullCVViewSet, basename="fullcv")
+router.register("talent", TalentSearchViewSet, basename="talent")
+router.register("employees", EmployeeExportViewSet, basename="employees")
 
 
 
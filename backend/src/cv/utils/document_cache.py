@@ -0,0 +1,74 @@
+"""
+Cache dokumen CV lengkap (FullCVSerializer) per user.
+
+- data JSON hasil serializer disimpan di cache Django bersama ETag-nya
+  (hash isi), sehingga request berulang tanpa query relasi sama sekali
+- key memakai versi per user; signals (cv/signals.py) mengganti versi
+  setiap kali profil atau salah satu dari enam relasinya berubah, jadi
+  dokumen yang sedang dibangun saat terjadi perubahan tidak akan terpakai
+"""
+import json
+import uuid
+
+from django.core.cache import cache
+from rest_framework.utils.encoders import JSONEncoder
+
+from exam.caching import make_etag
+
+from ..models import UserProfile
+from ..serializers import FullCVSerializer
+from .render_cache import PROFILE_RELATIONS
+
+
+DOCUMENT_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(user_id):
+    return f"cv-full-version:{user_id}"
+
+
+def _document_key(user_id, version):
+    return f"cv-full:{user_id}:{version}"
+
+
+def document_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), uuid.uuid4().hex, None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+
+def invalidate_document(user_id):
+    """Dipanggil signals saat profil / relasinya berubah."""
+    cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+
+
+def full_cv_document(user_id):
+    """
+    Return (data, etag) dokumen CV lengkap milik user, atau (None, None)
+    bila user belum punya profil. Query hanya saat cache kosong (1 + 6 prefetch).
+    """
+    version = document_version(user_id)
+    key = _document_key(user_id, version)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["data"], cached["etag"]
+
+    profile = (
+        UserProfile.objects
+            .prefetch_related(*PROFILE_RELATIONS)
+            .filter(user_id=user_id)
+            .first()
+    )
+    if profile is None:
+        return None, None
+
+    # simpan sebagai data JSON murni (tanpa object serializer)
+    raw = json.dumps(FullCVSerializer(profile).data, cls=JSONEncoder)
+    data = json.loads(raw)
+    etag = make_etag(user_id, raw)
+
+    cache.set(key, {"data": data, "etag": etag}, DOCUMENT_TIMEOUT)
+    return data, etag
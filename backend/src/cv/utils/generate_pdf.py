@@ -1,12 +1,50 @@
-import os
+import threading
 from django.conf import settings
 from django.http import HttpResponse
 from django.template.loader import get_template
 from weasyprint import HTML, CSS
 from pathlib import Path
 
+try:
+    from weasyprint.text.fonts import FontConfiguration
+except ImportError:  # WeasyPrint < 53
+    from weasyprint.fonts import FontConfiguration
 
-def render_pdf(template_src, context, filename="document.pdf", mode="download"):
+
+# ======================================
+# CACHE STYLESHEET PER TEMA (IN-PROCESS)
+# CSS(filename=...) mem-parse file setiap kali dipanggil; hasil parse dan
+# FontConfiguration disimpan per tema, dimuat ulang bila style.css berubah
+# ======================================
+_stylesheets = {}
+_stylesheets_lock = threading.Lock()
+
+
+def theme_css_path(theme):
+    return Path(settings.BASE_DIR) / "static" / "cv_theme" / theme / "style.css"
+
+
+def get_theme_stylesheet(theme):
+    """Return (CSS, FontConfiguration) untuk tema, atau (None, None) bila CSS tidak ada."""
+    css_path = theme_css_path(theme)
+
+    try:
+        mtime = css_path.stat().st_mtime
+    except OSError:
+        print("⚠️ CSS TIDAK DITEMUKAN:", css_path)
+        return None, None
+
+    with _stylesheets_lock:
+        cached = _stylesheets.get(theme)
+        if cached is None or cached[0] != mtime:
+            font_config = FontConfiguration()
+            css = CSS(filename=str(css_path), font_config=font_config)
+            cached = _stylesheets[theme] = (mtime, css, font_config)
+
+    return cached[1], cached[2]
+
+
+def render_pdf_bytes(template_src, context):
     """
     Generate PDF using WeasyPrint with support for static CSS loading.
     """
@@ -17,6 +55,12 @@ def render_pdf(template_src, context, filename="document.pdf", mode="download"):
     template = get_template(template_src)
     html_string = template.render(context)
 
+    return html_to_pdf(html_string, context.get("theme", "simple"))
+
+
+def html_to_pdf(html_string, theme):
+    """Layout WeasyPrint saja (dipakai juga oleh worker batch, lihat cv/batch.py)."""
+
     # ======================================
     # SET BASE_URL AGAR WEASYPRINT BISA AKSES STATIC
     # ======================================
@@ -25,21 +69,19 @@ def render_pdf(template_src, context, filename="document.pdf", mode="download"):
     # ======================================
     # CARA LOAD CSS: AMBIL FILE CSS ASLI (BUKAN HASH)
     # ======================================
-    theme = context.get("theme", "simple")  # dapatkan tema saat ini
-    css_path = Path(settings.BASE_DIR) / "static" / "cv_theme" / theme / "style.css"
-
-    if not css_path.exists():
-        print("⚠️ CSS TIDAK DITEMUKAN:", css_path)
-
-    css = CSS(filename=str(css_path))
+    # theme None → HTML membawa CSS sendiri (mis. sertifikat, lihat exam/certificates.py)
+    css, font_config = get_theme_stylesheet(theme) if theme else (None, None)
 
     # ======================================
     # GENERATE PDF
     # ======================================
-    pdf_file = HTML(string=html_string, base_url=base_url).write_pdf(
-        stylesheets=[css]
+    return HTML(string=html_string, base_url=base_url).write_pdf(
+        stylesheets=[css] if css is not None else [],
+        font_config=font_config,
     )
 
+
+def pdf_response(pdf_file, filename="document.pdf", mode="download"):
     # ======================================
     # MODE PREVIEW
     # ======================================
@@ -54,3 +96,7 @@ def render_pdf(template_src, context, filename="document.pdf", mode="download"):
     response = HttpResponse(pdf_file, content_type="application/pdf")
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
+
+
+def render_pdf(template_src, context, filename="document.pdf", mode="download"):
+    return pdf_response(render_pdf_bytes(template_src, context), filename, mode)
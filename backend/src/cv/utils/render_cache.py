@@ -0,0 +1,214 @@
+"""
+Cache hasil render PDF CV di disk.
+
+- key = hash isi UserProfile + relasinya (pendidikan, pekerjaan, skill,
+  sertifikasi, bahasa, pelatihan) + tema + mtime template & style.css
+- file PDF disimpan di CV_PDF_CACHE_DIR sebagai <user_id>-<key>.pdf;
+  bila total ukuran melewati CV_PDF_CACHE_MAX_BYTES, file yang paling
+  lama tidak dipakai dihapus lebih dulu (LRU berdasarkan mtime)
+- pointer user+tema → key disimpan di cache Django, sehingga preview
+  berulang tidak perlu query profil sama sekali; pointer dan file
+  dihapus lewat signals (cv/signals.py) saat profil diubah
+- pointer menyimpan generasi user yang dibaca sebelum profil dimuat;
+  signals mengganti generasi, sehingga pointer dari render yang memakai
+  data lama (profil diubah selama render berjalan) diabaikan
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .generate_pdf import render_pdf_bytes, theme_css_path
+
+
+PROFILE_RELATIONS = (
+    "educations",
+    "work_experiences",
+    "skills",
+    "certifications",
+    "languages",
+    "trainings",
+)
+
+THEME_DIR = Path(__file__).resolve().parent.parent / "templates" / "cv_theme"
+POINTER_TIMEOUT = 60 * 60 * 24
+
+_evict_lock = threading.Lock()
+
+
+def available_themes():
+    return sorted(p.name for p in THEME_DIR.iterdir() if (p / "index.html").exists())
+
+
+def cache_dir():
+    path = Path(getattr(settings, "CV_PDF_CACHE_DIR", Path(settings.BASE_DIR) / "cache" / "cv_pdf"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def max_cache_bytes():
+    return getattr(settings, "CV_PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def theme_stamp(theme):
+    """Berubah bila template atau style.css tema diubah / di-collectstatic ulang."""
+    return f"{theme}:{_mtime(THEME_DIR / theme / 'index.html')}:{_mtime(theme_css_path(theme))}"
+
+
+def _pointer_key(user_id, theme):
+    return f"cv-pdf:{user_id}:{theme}"
+
+
+def _generation_key(user_id):
+    return f"cv-pdf-generation:{user_id}"
+
+
+def render_generations(user_ids):
+    """{user_id: generasi}; dibaca sebelum profil dimuat untuk dirender."""
+    keys = {_generation_key(user_id): user_id for user_id in user_ids}
+    found = cache.get_many(list(keys))
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: found.get(key) for key in keys}
+
+
+def render_generation(user_id):
+    return render_generations([user_id])[user_id]
+
+
+def _row(obj):
+    return [str(getattr(obj, f.attname)) for f in obj._meta.concrete_fields]
+
+
+def profile_fingerprint(profile):
+    """Hash isi profil; relasi diambil dari prefetch (lihat PROFILE_RELATIONS)."""
+    graph = {"profile": _row(profile)}
+    for name in PROFILE_RELATIONS:
+        graph[name] = sorted(_row(obj) for obj in getattr(profile, name).all())
+    raw = json.dumps(graph, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def render_key(profile, theme):
+    raw = f"{profile_fingerprint(profile)}|{theme_stamp(theme)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]
+
+
+def pdf_path(user_id, key):
+    return cache_dir() / f"{user_id}-{key}.pdf"
+
+
+def touch(path):
+    """Tandai file baru dipakai (LRU); False bila file tidak ada."""
+    try:
+        os.utime(path)
+        return True
+    except OSError:
+        return False
+
+
+def store_pdf(path, pdf):
+    # tulis ke file sementara lalu rename, agar request lain tidak membaca file setengah jadi
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(pdf)
+    os.replace(tmp, path)
+
+
+def evict(limit=None):
+    """Hapus file paling lama tidak dipakai sampai total ukuran <= limit."""
+    limit = max_cache_bytes() if limit is None else limit
+    with _evict_lock:
+        entries = []
+        total = 0
+        for entry in os.scandir(cache_dir()):
+            if not entry.name.endswith(".pdf"):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def cached_pdf(user_id, theme):
+    """
+    Fast path tanpa query: return (path, filename) bila pointer masih
+    valid dan file-nya masih ada, selain itu (None, None).
+    """
+    pointer_key, generation_key = _pointer_key(user_id, theme), _generation_key(user_id)
+    values = cache.get_many([pointer_key, generation_key])
+    pointer = values.get(pointer_key)
+    generation = values.get(generation_key)
+    if not pointer or pointer["stamp"] != theme_stamp(theme):
+        return None, None
+    if generation is None or pointer.get("generation") != generation:
+        return None, None
+    path = pdf_path(user_id, pointer["key"])
+    if not touch(path):
+        return None, None
+    return path, pointer["filename"]
+
+
+def get_or_render_pdf(profile, theme, template_src, context, filename, generation):
+    """
+    Return path PDF di disk; render dengan WeasyPrint hanya bila key belum ada.
+    `generation` = render_generation(user_id) yang dibaca sebelum profil dimuat.
+    """
+    key = render_key(profile, theme)
+    path = pdf_path(profile.user_id, key)
+
+    if not touch(path):
+        store_pdf(path, render_pdf_bytes(template_src, context))
+        evict()
+
+    remember(profile.user_id, theme, key, filename, generation)
+    return path
+
+
+def remember(user_id, theme, key, filename, generation):
+    cache.set(
+        _pointer_key(user_id, theme),
+        {"key": key, "stamp": theme_stamp(theme), "filename": filename, "generation": generation},
+        POINTER_TIMEOUT,
+    )
+
+
+def invalidate_user(user_id):
+    """Dipanggil signals saat profil / relasinya berubah."""
+    cache.set(_generation_key(user_id), uuid.uuid4().hex, None)
+    cache.delete_many([_pointer_key(user_id, theme) for theme in available_themes()])
+    for path in cache_dir().glob(f"{user_id}-*.pdf"):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -3,9 +3,24 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 
 from django.shortcuts import get_object_or_404
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
 from django.utils.text import slugify
 from django.conf import settings
-from .utils.generate_pdf import render_pdf
+from .batch import BatchJob, cv_command_args
+from . import employee_export
+from .profiles import ProfileOwnedMixin, forget_profile, remember_profile
+from exam.caching import not_modified
+from .utils.document_cache import full_cv_document
+from .utils.generate_pdf import pdf_response
+from .talent import facet_counts, filter_documents
+from .utils.render_cache import (
+    PROFILE_RELATIONS,
+    available_themes,
+    cached_pdf,
+    get_or_render_pdf,
+    render_generation,
+)
 
 from .models import (
     UserProfile,
@@ -25,19 +40,14 @@ from .serializers import (
     CertificationSerializer,
     LanguageSkillSerializer,
     TrainingHistorySerializer,
-    FullCVSerializer
+    FullCVSerializer,
+    CVBatchRequestSerializer,
+    TalentSearchSerializer,
+    TalentDocumentSerializer
 )
 
 
 
-# HELPER: GET OR CREATE PROFILE
-
-def get_or_create_profile(user):
-    profile, created = UserProfile.objects.get_or_create(user=user)
-    return profile
-
-
-
 # USER PROFILE VIEWSET
 
 class UserProfileViewSet(viewsets.ModelViewSet):
@@ -49,102 +59,65 @@ class UserProfileViewSet(viewsets.ModelViewSet):
         return UserProfile.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        remember_profile(self.request, serializer.save(user=self.request.user))
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        forget_profile(self.request)
 
 
 # EDUCATION VIEWSET
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(ProfileOwnedMixin, viewsets.ModelViewSet):
+    model = Education
     serializer_class = EducationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        profile = get_or_create_profile(self.request.user)
-        return Education.objects.filter(user=profile)
-
-    def perform_create(self, serializer):
-        profile = get_or_create_profile(self.request.user)
-        serializer.save(user=profile)
-
 
 
 # WORK EXPERIENCE VIEWSET
 
-class WorkExperienceViewSet(viewsets.ModelViewSet):
+class WorkExperienceViewSet(ProfileOwnedMixin, viewsets.ModelViewSet):
+    model = WorkExperience
     serializer_class = WorkExperienceSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        profile = get_or_create_profile(self.request.user)
-        return WorkExperience.objects.filter(user=profile)
-
-    def perform_create(self, serializer):
-        profile = get_or_create_profile(self.request.user)
-        serializer.save(user=profile)
-
 
 
 # SKILL VIEWSET
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ProfileOwnedMixin, viewsets.ModelViewSet):
+    model = Skill
     serializer_class = SkillSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        profile = get_or_create_profile(self.request.user)
-        return Skill.objects.filter(user=profile)
-
-    def perform_create(self, serializer):
-        profile = get_or_create_profile(self.request.user)
-        serializer.save(user=profile)
 
 
 # CERTIFICATION VIEWSET
 
-class CertificationViewSet(viewsets.ModelViewSet):
+class CertificationViewSet(ProfileOwnedMixin, viewsets.ModelViewSet):
+    model = Certification
     serializer_class = CertificationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        profile = get_or_create_profile(self.request.user)
-        return Certification.objects.filter(user=profile)
-
-    def perform_create(self, serializer):
-        profile = get_or_create_profile(self.request.user)
-        serializer.save(user=profile)
-
 
 
 # LANGUAGE SKILL VIEWSET
 
-class LanguageSkillViewSet(viewsets.ModelViewSet):
+class LanguageSkillViewSet(ProfileOwnedMixin, viewsets.ModelViewSet):
+    model = LanguageSkill
     serializer_class = LanguageSkillSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        profile = get_or_create_profile(self.request.user)
-        return LanguageSkill.objects.filter(user=profile)
-
-    def perform_create(self, serializer):
-        profile = get_or_create_profile(self.request.user)
-        serializer.save(user=profile)
-
 
 
 # TRAINING HISTORY VIEWSET
 
-class TrainingHistoryViewSet(viewsets.ModelViewSet):
+class TrainingHistoryViewSet(ProfileOwnedMixin, viewsets.ModelViewSet):
+    model = TrainingHistory
     serializer_class = TrainingHistorySerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        profile = get_or_create_profile(self.request.user)
-        return TrainingHistory.objects.filter(user=profile)
-
-    def perform_create(self, serializer):
-        profile = get_or_create_profile(self.request.user)
-        serializer.save(user=profile)
-
 
 # FULL CV ENDPOINT (single endpoint CV lengkap)
 
@@ -155,36 +128,20 @@ class FullCVViewSet(viewsets.ViewSet):
 
 
     def list(self, request):
-        profile = get_or_create_profile(request.user)
-        serializer = FullCVSerializer(profile)
-        return Response(serializer.data)
+        data, etag = full_cv_document(request.user.pk)
+        if data is None:
+            return Response({"detail": "Profil CV belum dibuat."}, status=404)
 
+        response = not_modified(request, etag) or Response(data)
+        response["ETag"] = etag
+        # per user: browser boleh menyimpan, tetapi selalu revalidasi (304)
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
-class CVGeneratorViewSet(viewsets.ViewSet):
 
-    @action(detail=True, methods=["get"], url_path="generate")
-    def generate_cv(self, request, pk=None):
-        # Theme default
-
-        if str(request.user.id) != str(pk):
-            return Response({"detail": "Tidak diizinkan mengakses CV ini."}, status=403)
-        
-        theme = request.query_params.get("theme", "professional")
-        mode = request.query_params.get("mode", "preview")
-
-        profile = (
-            UserProfile.objects
-                .prefetch_related(
-                    "educations",
-                    "work_experiences",
-                    "skills",
-                    "certifications",
-                    "languages",
-                    "trainings",
-                )
-                .get(user_id=pk)
-        )
+class CVGeneratorViewSet(viewsets.ViewSet):
 
+    def cv_context(self, request, profile, theme):
         # Ambil data dari prefetch
         education = profile.educations.all()
         work = profile.work_experiences.all()
@@ -193,7 +150,7 @@ class CVGeneratorViewSet(viewsets.ViewSet):
         languages = profile.languages.all()
         trainings = profile.trainings.all()
 
-        context = {
+        return {
             "profile": profile,
             "education": education,
             "work": work,
@@ -205,15 +162,150 @@ class CVGeneratorViewSet(viewsets.ViewSet):
             "STATIC_URL_ABS": request.build_absolute_uri(settings.STATIC_URL),
         }
 
-        filename = f"cv_{slugify(profile.full_name)}_{pk}.pdf"
+    @action(detail=True, methods=["get"], url_path="generate")
+    def generate_cv(self, request, pk=None):
+        # Theme default
+
+        if str(request.user.id) != str(pk):
+            return Response({"detail": "Tidak diizinkan mengakses CV ini."}, status=403)
+        
+        theme = request.query_params.get("theme", "professional")
+        mode = request.query_params.get("mode", "preview")
+
+        if theme not in available_themes():
+            return Response({"detail": "Tema tidak dikenal."}, status=400)
 
         # Theme path
         template_path = f"cv_theme/{theme}/index.html"
 
-        # Render the PDF
-        return render_pdf(
-            template_src=template_path,
-            context=context,
-            filename=filename,
-            mode=mode
-        )
\ No newline at end of file
+        # Preview HTML: template yang sama, CSS tema dimuat browser sebagai
+        # static file, tanpa layout WeasyPrint (PDF hanya saat download)
+        if mode == "html":
+            profile = get_object_or_404(UserProfile.objects.prefetch_related(*PROFILE_RELATIONS), user_id=pk)
+            html = render_to_string(template_path, self.cv_context(request, profile, theme))
+            return HttpResponse(html, content_type="text/html; charset=utf-8")
+
+        # PDF yang sama sudah pernah dirender → langsung dari disk
+        path, filename = cached_pdf(pk, theme)
+        if path is not None:
+            return pdf_response(path.read_bytes(), filename=filename, mode=mode)
+
+        # generasi dibaca sebelum profil dimuat: bila profil diubah selama
+        # render, pointer hasil render ini tidak akan dipakai
+        generation = render_generation(pk)
+        profile = get_object_or_404(
+            UserProfile.objects.prefetch_related(*PROFILE_RELATIONS),
+            user_id=pk,
+        )
+
+        context = self.cv_context(request, profile, theme)
+        filename = f"cv_{slugify(profile.full_name)}_{pk}.pdf"
+
+        # Render the PDF (atau ambil dari cache disk bila isi profil tidak berubah)
+        path = get_or_render_pdf(profile, theme, template_path, context, filename, generation)
+        return pdf_response(path.read_bytes(), filename=filename, mode=mode)
+
+
+# BATCH CV (ZIP) — proses render berjalan di luar web worker (cv/batch.py)
+
+class CVBatchViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_job(self, pk):
+        try:
+            job = BatchJob(pk)
+        except ValueError:
+            return None, None
+        return job, job.read_status()
+
+    def create(self, request):
+        serializer = CVBatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = BatchJob.create(serializer.validated_data, requested_by=request.user.id)
+        job.start("generate_cvs", *cv_command_args(serializer.validated_data))
+        return Response(job.read_status(), status=202)
+
+    def retrieve(self, request, pk=None):
+        job, status = self.get_job(pk)
+        if status is None:
+            return Response({"detail": "Job tidak ditemukan."}, status=404)
+        return Response(status)
+
+    @action(detail=True, methods=["get"], url_path="download")
+    def download(self, request, pk=None):
+        job, status = self.get_job(pk)
+        if status is None:
+            return Response({"detail": "Job tidak ditemukan."}, status=404)
+        if status["state"] != "done" or not job.zip_path.exists():
+            return Response({"detail": "Job belum selesai.", "state": status["state"]}, status=409)
+
+        return FileResponse(
+            open(job.zip_path, "rb"),
+            as_attachment=True,
+            filename=f"cv_batch_{job.id[:8]}.zip",
+            content_type="application/zip",
+        )
+
+
+# TALENT SEARCH — untuk HR (cv/talent.py)
+
+class TalentSearchViewSet(viewsets.GenericViewSet):
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = TalentDocumentSerializer
+
+    def list(self, request):
+        params = TalentSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        qs = filter_documents(params.validated_data)
+        facets = facet_counts(qs)
+        qs = qs.order_by("full_name", "pk")
+
+        page = self.paginate_queryset(qs)
+        if page is None:
+            return Response({
+                "results": TalentDocumentSerializer(qs, many=True).data,
+                "facets": facets,
+            })
+
+        response = self.get_paginated_response(TalentDocumentSerializer(page, many=True).data)
+        response.data["facets"] = facets
+        return response
+
+
+# EXPORT DATA PEGAWAI — pegawai + pendidikan, sertifikasi, pelatihan (cv/employee_export.py)
+# ?type=xlsx (default, satu sheet per relasi) / ?type=csv&sheet=<nama>
+# filter: ?unit_kerja= / ?bidang_kerja=
+
+class EmployeeExportViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAdminUser]
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        queryset = employee_export.employee_queryset(
+            unit_kerja=request.query_params.get("unit_kerja"),
+            bidang_kerja=request.query_params.get("bidang_kerja"),
+        )
+        export_type = request.query_params.get("type", "xlsx")
+
+        if export_type == "csv":
+            sheet = request.query_params.get("sheet", "pegawai")
+            if sheet not in employee_export.SHEETS:
+                return Response(
+                    {"detail": f"sheet harus salah satu dari: {', '.join(employee_export.SHEETS)}."},
+                    status=400,
+                )
+            resp = StreamingHttpResponse(employee_export.iter_csv(queryset, sheet), content_type="text/csv")
+            resp["Content-Disposition"] = f"attachment; filename=pegawai_{sheet}.csv"
+            return resp
+
+        if export_type == "xlsx":
+            return FileResponse(
+                employee_export.write_xlsx(queryset),
+                as_attachment=True,
+                filename="pegawai.xlsx",
+                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+
+        return Response({"detail": "type harus xlsx atau csv."}, status=400)
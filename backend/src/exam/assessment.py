@@ -0,0 +1,210 @@
+"""
+Input penilaian (assessment) banyak peserta × kriteria dalam satu request.
+
+- kriteria course dimuat sekali dan di-cache dengan key versi konten course
+- jawaban di-upsert secara bulk (bulk_update + bulk_create)
+- total_score dihitung ulang di database dengan satu UPDATE agregat
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Sum, Value, FloatField
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .caching import bump_course_results, course_version_stamp
+from .models import CourseAssessment, CourseAssessmentAnswer, CourseAssessmentCriteria, CourseParticipant
+
+
+CRITERIA_CACHE_TIMEOUT = 60 * 60
+STATUS_MAX_LENGTH = CourseAssessment._meta.get_field("status").max_length
+
+
+def get_criteria_map(course):
+    """{criteria_id: {"name", "max_score"}} untuk course."""
+    key = f"assessment-criteria:{course_version_stamp(course)}"
+    criteria = cache.get(key)
+    if criteria is None:
+        criteria = {
+            c["id"]: {"name": c["name"], "max_score": c["max_score"]}
+            for c in CourseAssessmentCriteria.objects.filter(course=course).values("id", "name", "max_score")
+        }
+        cache.set(key, criteria, CRITERIA_CACHE_TIMEOUT)
+    return criteria
+
+
+def recompute_totals(assessment_ids):
+    """total_score = SUM(answers.score), satu UPDATE untuk semua assessment."""
+    totals = (
+        CourseAssessmentAnswer.objects
+            .filter(assessment=OuterRef("pk"))
+            .order_by()
+            .values("assessment")
+            .annotate(total=Sum("score"))
+            .values("total")
+    )
+    return CourseAssessment.objects.filter(pk__in=assessment_ids).update(
+        total_score=Coalesce(Subquery(totals), Value(0.0), output_field=FloatField()),
+        updated_at=timezone.now(),
+    )
+
+
+def validate_matrix(course, entries):
+    """
+    entries: [{"user": id, "scores": {criteria_id: score}, "notes": {criteria_id: note},
+               "status": "...", "note": "..."}]
+    Return (cleaned, errors).
+    """
+    criteria = get_criteria_map(course)
+    if not isinstance(entries, list) or not entries:
+        return [], {"entries": "entries wajib diisi."}
+
+    user_ids = set()
+    for entry in entries:
+        try:
+            user_ids.add(int(entry.get("user")))
+        except (TypeError, ValueError, AttributeError):
+            pass
+    participants = set(
+        CourseParticipant.objects.filter(course=course, user_id__in=user_ids).values_list("user_id", flat=True)
+    )
+
+    cleaned = []
+    errors = {}
+    seen = set()
+    for index, entry in enumerate(entries):
+        row_errors = {}
+        try:
+            user_id = int(entry.get("user"))
+        except (TypeError, ValueError, AttributeError):
+            errors[str(index)] = {"user": "User tidak valid."}
+            continue
+
+        if user_id not in participants:
+            row_errors["user"] = "User bukan peserta course ini."
+        elif user_id in seen:
+            row_errors["user"] = "User dikirim lebih dari sekali."
+        seen.add(user_id)
+
+        scores = {}
+        raw_scores = entry.get("scores") or {}
+        if not isinstance(raw_scores, dict):
+            raw_scores = {}
+            row_errors["scores"] = "scores harus berupa object {criteria_id: nilai}."
+
+        for cid, value in raw_scores.items():
+            try:
+                cid = int(cid)
+            except (TypeError, ValueError):
+                row_errors[str(cid)] = "Kriteria tidak valid."
+                continue
+            if cid not in criteria:
+                row_errors[str(cid)] = "Kriteria tidak ditemukan di course ini."
+                continue
+            try:
+                score = float(value)
+            except (TypeError, ValueError):
+                row_errors[str(cid)] = "Nilai harus berupa angka."
+                continue
+            if not 0 <= score <= criteria[cid]["max_score"]:
+                row_errors[str(cid)] = f"Nilai harus 0 - {criteria[cid]['max_score']}."
+                continue
+            scores[cid] = score
+
+        status = entry.get("status")
+        if status is not None and not isinstance(status, str):
+            row_errors["status"] = "status harus berupa teks."
+        elif status is not None and len(status) > STATUS_MAX_LENGTH:
+            row_errors["status"] = f"status maksimal {STATUS_MAX_LENGTH} karakter."
+
+        note = entry.get("note")
+        if note is not None and not isinstance(note, str):
+            row_errors["note"] = "note harus berupa teks."
+
+        notes = entry.get("notes") or {}
+        notes = {int(k): v for k, v in notes.items() if str(k).isdigit()} if isinstance(notes, dict) else {}
+        for cid, value in notes.items():
+            if value is not None and not isinstance(value, str):
+                row_errors[f"notes.{cid}"] = "Catatan harus berupa teks."
+
+        if row_errors:
+            errors[str(user_id)] = row_errors
+            continue
+
+        cleaned.append({
+            "user_id": user_id,
+            "scores": scores,
+            "notes": notes,
+            "status": status,
+            "note": note,
+        })
+
+    return cleaned, errors
+
+
+@transaction.atomic
+def save_assessment_matrix(course, assessor, cleaned):
+    user_ids = [row["user_id"] for row in cleaned]
+
+    assessments = {
+        a.user_id: a
+        for a in CourseAssessment.objects.select_for_update().filter(course=course, user_id__in=user_ids)
+    }
+    missing = [
+        CourseAssessment(course=course, user_id=uid, assessor=assessor)
+        for uid in user_ids if uid not in assessments
+    ]
+    # request lain bisa membuat assessment yang sama bersamaan (unique
+    # course+user) → abaikan konflik, lalu baca ulang & kunci semua baris
+    CourseAssessment.objects.bulk_create(missing, ignore_conflicts=True)
+    if missing:
+        assessments = {
+            a.user_id: a
+            for a in CourseAssessment.objects.select_for_update().filter(course=course, user_id__in=user_ids)
+        }
+
+    # status / catatan / assessor per peserta
+    for row in cleaned:
+        a = assessments[row["user_id"]]
+        a.assessor = assessor
+        if row["status"] is not None:
+            a.status = row["status"]
+        if row["note"] is not None:
+            a.note = row["note"]
+    CourseAssessment.objects.bulk_update(list(assessments.values()), ["assessor", "status", "note"])
+
+    # upsert jawaban per (assessment, kriteria)
+    assessment_ids = [a.pk for a in assessments.values()]
+    existing = {}
+    for ans in CourseAssessmentAnswer.objects.filter(assessment_id__in=assessment_ids).order_by("id"):
+        existing.setdefault((ans.assessment_id, ans.criteria_id), ans)
+
+    to_update, to_create = [], []
+    for row in cleaned:
+        aid = assessments[row["user_id"]].pk
+        for cid, score in row["scores"].items():
+            note = row["notes"].get(cid)
+            ans = existing.get((aid, cid))
+            if ans is None:
+                to_create.append(CourseAssessmentAnswer(assessment_id=aid, criteria_id=cid, score=score, note=note))
+            else:
+                ans.score = score
+                if note is not None:
+                    ans.note = note
+                to_update.append(ans)
+
+    CourseAssessmentAnswer.objects.bulk_update(to_update, ["score", "note"], batch_size=1000)
+    CourseAssessmentAnswer.objects.bulk_create(to_create, batch_size=1000)
+
+    recompute_totals(assessment_ids)
+    # update / bulk_create tidak memicu signal
+    bump_course_results(pk=course.pk)
+
+    totals = dict(
+        CourseAssessment.objects.filter(pk__in=assessment_ids).values_list("user_id", "total_score")
+    )
+    return {
+        "assessments_created": len(missing),
+        "answers_created": len(to_create),
+        "answers_updated": len(to_update),
+        "totals": totals,
+    }
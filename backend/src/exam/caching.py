@@ -0,0 +1,109 @@
+"""
+Versi konten per course + helper HTTP conditional GET.
+
+Course.content_version dinaikkan (lewat signals, lihat exam/signals.py)
+setiap kali silabus, materi, tugas, ujian, soal, persyaratan atau kriteria
+penilaian course berubah. ETag dibangun dari versi ini, sehingga request
+ulang untuk konten yang sama cukup dijawab 304. Perubahan peserta hanya
+menaikkan Course.roster_version (dipakai ETag bundle).
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Course
+
+
+def bump_course_version(course_id):
+    if not course_id:
+        return
+    Course.objects.filter(pk=course_id).update(
+        content_version=F("content_version") + 1,
+        content_updated_at=timezone.now(),
+    )
+
+
+def bump_course_results(**lookup):
+    """
+    Naikkan results_version course, mis. bump_course_results(pk=1)
+    atau bump_course_results(exams__id=exam_id).
+    """
+    Course.objects.filter(**lookup).update(results_version=F("results_version") + 1)
+
+
+def bump_course_roster(course_id):
+    """Peserta course berubah (ETag bundle + cache evaluasi, bukan konten)."""
+    if not course_id:
+        return
+    Course.objects.filter(pk=course_id).update(roster_version=F("roster_version") + 1)
+
+
+def course_version_stamp(course):
+    """
+    Versi + timestamp: Course.save() dari instance lama bisa menulis
+    ulang content_version, timestamp menjaga ETag tetap unik.
+    """
+    return f"{course.pk}.{course.content_version}.{course.content_updated_at.timestamp():.6f}"
+
+
+def make_etag(*parts):
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return '"%s"' % hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Return HttpResponseNotModified (304) bila If-None-Match /
+    If-Modified-Since dari client masih cocok, selain itu None.
+    """
+    http_request = getattr(request, "_request", request)
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(
+        http_request, etag=etag, last_modified=last_modified_ts
+    )
+
+
+# =====================================================================
+# Mixin: conditional GET + cache server untuk konten course yang
+# jarang berubah (silabus, materi, tugas, template persyaratan, kriteria)
+# =====================================================================
+class CourseContentCacheMixin:
+    """
+    Response dikunci pada versi konten course:
+    - ETag / Last-Modified → 304 bila client / proxy masih punya versi ini
+    - Cache-Control private + no-cache → hanya cache browser user sendiri
+      (endpoint butuh login & keanggotaan course), selalu revalidasi ke server
+    - data response disimpan di cache Django dengan key = versi,
+      sehingga versi lama otomatis tidak terpakai lagi
+    """
+    content_cache_timeout = 60 * 60
+    content_cache_control = "private, no-cache"
+
+    def course_content_response(self, request, course, build):
+        etag = make_etag(course_version_stamp(course), self.action, request.build_absolute_uri())
+        last_modified = course.content_updated_at
+
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            key = "course-content:" + etag.strip('"')
+            data = cache.get(key)
+            if data is None:
+                data = build()
+                if isinstance(data, Response):
+                    data = data.data
+                # simpan sebagai data JSON murni (tanpa object serializer)
+                data = json.loads(json.dumps(data, cls=JSONEncoder))
+                cache.set(key, data, self.content_cache_timeout)
+            response = Response(data)
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+        response["Cache-Control"] = self.content_cache_control
+        return response
@@ -0,0 +1,173 @@
+"""
+Sertifikat kelulusan & transkrip nilai peserta course (PDF).
+
+- data per peserta diambil dari evaluate_course (status akhir + nilai exam)
+- file disimpan di CERTIFICATE_DIR/course_<id>/<user_id>-<jenis>-<hash>.pdf;
+  hash dihitung dari data yang dicetak + template, sehingga generate ulang
+  hanya merender peserta yang datanya berubah
+- render PDF berjalan di proses worker (cv.batch.render_to_zip) lewat
+  `manage.py generate_certificates`, tidak pernah di request
+- unduhan per peserta hanya menyajikan file yang sudah ada
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.text import slugify
+
+from cv.batch import render_to_zip
+from cv.models import UserProfile
+
+from .evaluation import evaluate_course
+
+
+KINDS = {
+    "certificate": "certificates/certificate.html",
+    "transcript": "certificates/transcript.html",
+}
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+
+def course_dir(course_id):
+    base = Path(getattr(settings, "CERTIFICATE_DIR", Path(settings.BASE_DIR) / "cache" / "certificates"))
+    path = base / f"course_{course_id}"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def participant_documents(course, user_ids=None):
+    """
+    Return list data cetak per peserta:
+    {"course", "participant", "final_status", "exams", "assessment"}.
+    """
+    evaluation = evaluate_course(course, user_ids=user_ids)
+    rows = evaluation["participants"]
+
+    names = dict(
+        UserProfile.objects
+            .filter(user_id__in=[r["user_id"] for r in rows])
+            .values_list("user_id", "full_name")
+    )
+    exam_meta = {e["exam_id"]: e for e in evaluation["exams"]}
+    course_data = {
+        "id": course.id,
+        "title": course.title,
+        "start_date": course.start_date.isoformat() if course.start_date else None,
+        "end_date": course.end_date.isoformat() if course.end_date else None,
+    }
+
+    documents = []
+    for row in rows:
+        documents.append({
+            "course": course_data,
+            "participant": {
+                "user_id": row["user_id"],
+                "name": names.get(row["user_id"]) or row["username"],
+            },
+            "final_status": row["final_status"],
+            "exams": [
+                {
+                    "title": exam_meta[r["exam_id"]]["title"],
+                    "passing_grade": exam_meta[r["exam_id"]]["passing_grade"],
+                    "score": r["score"],
+                    "passed": r["passed"],
+                    "mandatory": r["mandatory"],
+                }
+                for r in row["exams"]
+            ],
+            "assessment": row["assessment"],
+        })
+    return documents
+
+
+def document_kinds(document):
+    """Sertifikat hanya untuk yang lulus; transkrip untuk semua peserta."""
+    kinds = ["transcript"]
+    if document["final_status"] == "passed":
+        kinds.insert(0, "certificate")
+    return kinds
+
+
+def document_key(document, kind):
+    template_mtime = os.stat(TEMPLATE_DIR / KINDS[kind]).st_mtime
+    raw = json.dumps([kind, template_mtime, document], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def document_path(document, kind):
+    user_id = document["participant"]["user_id"]
+    return course_dir(document["course"]["id"]) / f"{user_id}-{kind}-{document_key(document, kind)}.pdf"
+
+
+def document_filename(document, kind):
+    name = slugify(document["participant"]["name"]) or document["participant"]["user_id"]
+    return f"{kind}_{name}_{document['participant']['user_id']}.pdf"
+
+
+def remove_stale(document, kind, keep):
+    user_id = document["participant"]["user_id"]
+    for path in course_dir(document["course"]["id"]).glob(f"{user_id}-{kind}-*.pdf"):
+        if path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def generate_course_documents(course, out, kinds=None, workers=None, progress=None):
+    """Tulis ZIP sertifikat / transkrip seluruh peserta course ke `out`."""
+    kinds = set(kinds or KINDS)
+    documents = participant_documents(course)
+
+    planned = [
+        (document, kind)
+        for document in documents
+        for kind in document_kinds(document)
+        if kind in kinds
+    ]
+
+    def jobs():
+        for document, kind in planned:
+            path = document_path(document, kind)
+            html = None
+            if not path.exists():
+                html = render_to_string(KINDS[kind], document)
+            yield {
+                "id": f"{document['participant']['user_id']}-{kind}",
+                "path": str(path),
+                "filename": f"{kind}/{document_filename(document, kind)}",
+                "theme": None,
+                "html": html,
+                "document": document,
+                "kind": kind,
+            }
+
+    def on_done(job):
+        remove_stale(job["document"], job["kind"], Path(job["path"]))
+
+    done, rendered, errors = render_to_zip(jobs(), out, len(planned), workers, progress, on_done)
+
+    return {
+        "participants": len(documents),
+        "certificates": sum(1 for _, kind in planned if kind == "certificate"),
+        "total": len(planned),
+        "generated": done,
+        "rendered": rendered,
+        "from_cache": done - rendered,
+        "errors": errors,
+    }
+
+
+def existing_document(course, user_id, kind):
+    """Return (path, filename) file yang sesuai data terbaru, atau (None, None)."""
+    documents = participant_documents(course, user_ids=[user_id])
+    if not documents or kind not in document_kinds(documents[0]):
+        return None, None
+
+    path = document_path(documents[0], kind)
+    if not path.exists():
+        return None, None
+    return path, document_filename(documents[0], kind)
@@ -0,0 +1,142 @@
+"""
+Deep copy exam / course untuk angkatan berikutnya.
+
+Semua object anak disalin dengan bulk_create + pemetaan id lama → baru,
+termasuk referensi Question.parent_question / parent_choice.
+File materi tidak disalin ulang: object baru menunjuk file yang sama.
+"""
+from django.db import transaction
+
+from . import search
+from .caching import bump_course_version
+from .models import (
+    Choice,
+    Course,
+    CourseAssessmentCriteria,
+    CourseMaterial,
+    CourseRequirementTemplate,
+    CourseSyllabus,
+    CourseTask,
+    Exam,
+    Question,
+    generate_token,
+)
+
+
+def copy_values(obj, exclude=()):
+    """Nilai field konkret (tanpa pk & auto timestamp) untuk membuat salinan."""
+    values = {}
+    for field in obj._meta.concrete_fields:
+        if field.primary_key or field.name in exclude:
+            continue
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            continue
+        values[field.attname] = getattr(obj, field.attname)
+    return values
+
+
+def clone_rows(model, queryset, **overrides):
+    """bulk_create salinan queryset; return {id_lama: object_baru}."""
+    originals = list(queryset.order_by("pk"))
+    copies = [model(**{**copy_values(o), **overrides}) for o in originals]
+    model.objects.bulk_create(copies, batch_size=1000)
+    return {o.pk: c for o, c in zip(originals, copies)}
+
+
+def clone_questions(source_exams, exam_map):
+    """
+    Salin soal + pilihan dari beberapa exam sekaligus.
+    exam_map: {exam_id_lama: exam_baru}
+    """
+    questions = list(Question.objects.filter(exam__in=source_exams).order_by("pk"))
+    new_questions = [
+        Question(**{
+            **copy_values(q, exclude=("parent_question", "parent_choice")),
+            "exam_id": exam_map[q.exam_id].pk,
+        })
+        for q in questions
+    ]
+    Question.objects.bulk_create(new_questions, batch_size=1000)
+    question_map = {q.pk: n for q, n in zip(questions, new_questions)}
+
+    choices = list(Choice.objects.filter(question__exam__in=source_exams).order_by("pk"))
+    new_choices = [
+        Choice(**{**copy_values(c), "question_id": question_map[c.question_id].pk})
+        for c in choices
+    ]
+    Choice.objects.bulk_create(new_choices, batch_size=1000)
+    choice_map = {c.pk: n for c, n in zip(choices, new_choices)}
+
+    # self-reference diisi setelah semua id baru diketahui
+    linked = []
+    for q in questions:
+        if q.parent_question_id or q.parent_choice_id:
+            new = question_map[q.pk]
+            parent = question_map.get(q.parent_question_id)
+            choice = choice_map.get(q.parent_choice_id)
+            new.parent_question_id = parent.pk if parent else None
+            new.parent_choice_id = choice.pk if choice else None
+            linked.append(new)
+    if linked:
+        Question.objects.bulk_update(linked, ["parent_question", "parent_choice"], batch_size=1000)
+
+    return len(new_questions), len(new_choices)
+
+
+def _new_exam_token(exam):
+    return generate_token() if exam.is_private else None
+
+
+@transaction.atomic
+def clone_exam(exam, course=None, title=None):
+    new_exam = Exam(**copy_values(exam, exclude=("token",)))
+    if course is not None:
+        new_exam.course = course
+    new_exam.title = title or f"{exam.title} (Salinan)"
+    new_exam.save()  # save() membuat token baru bila private
+
+    questions, choices = clone_questions([exam], {exam.pk: new_exam})
+    bump_course_version(new_exam.course_id)
+
+    return new_exam, {"questions": questions, "choices": choices}
+
+
+@transaction.atomic
+def clone_course(course, title=None, include_exams=True):
+    new_course = Course(**copy_values(
+        course, exclude=("token", "content_version", "content_updated_at", "results_version", "roster_version")
+    ))
+    new_course.title = title or f"{course.title} (Salinan)"
+    new_course.save()
+
+    counts = {}
+    for name, model, related in (
+        ("syllabus", CourseSyllabus, course.syllabus.all()),
+        ("materials", CourseMaterial, course.materials.all()),
+        ("tasks", CourseTask, course.tasks.all()),
+        ("requirements", CourseRequirementTemplate, course.requirements.all()),
+        ("assessment_criteria", CourseAssessmentCriteria, course.assessment_criteria.all()),
+    ):
+        mapping = clone_rows(model, related, course_id=new_course.pk)
+        counts[name] = len(mapping)
+        if model in (CourseSyllabus, CourseMaterial):
+            search.index_instances(mapping.values())
+
+    if include_exams:
+        exams = list(course.exams.all().order_by("pk"))
+        new_exams = [
+            Exam(**{
+                **copy_values(e, exclude=("token",)),
+                "course_id": new_course.pk,
+                "token": _new_exam_token(e),
+            })
+            for e in exams
+        ]
+        Exam.objects.bulk_create(new_exams)
+        counts["exams"] = len(new_exams)
+        counts["questions"], counts["choices"] = clone_questions(
+            exams, {e.pk: n for e, n in zip(exams, new_exams)}
+        )
+
+    bump_course_version(new_course.pk)
+    return new_course, counts
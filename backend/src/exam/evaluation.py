@@ -0,0 +1,137 @@
+"""
+Evaluasi final course untuk semua peserta sekaligus.
+
+Attempt yang dipakai per (user, exam) dipilih di SQL (latest / best),
+assessment dimuat sekali, lalu aturan evaluation_mode + exam wajib
+diterapkan di memori. Hasil di-cache dengan key versi konten + versi
+hasil course, sehingga grid hanya dihitung ulang bila ada perubahan.
+"""
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+
+from .caching import course_version_stamp
+from .models import CourseAssessment, CourseParticipant, UserExam
+
+
+ATTEMPT_STRATEGIES = {
+    "latest": ("-attempt_number",),
+    "best": ("-score", "-attempt_number"),
+}
+EVALUATION_CACHE_TIMEOUT = 60 * 60
+
+
+def selected_attempts(course, strategy="latest", user_ids=None):
+    """
+    Satu attempt completed per (user, exam).
+    Django 4.0 belum bisa filter ekspresi Window, jadi dipakai
+    subquery berkorelasi (satu query, index user/exam/attempt_number).
+    """
+    completed = UserExam.objects.filter(status="completed")
+    pick = (
+        completed
+            .filter(user_id=OuterRef("user_id"), exam_id=OuterRef("exam_id"))
+            .order_by(*ATTEMPT_STRATEGIES[strategy])
+            .values("pk")[:1]
+    )
+
+    qs = completed.filter(exam__course=course, pk=Subquery(pick))
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+    return qs.values("user_id", "exam_id", "score", "attempt_number")
+
+
+def final_status(mode, exam_results, assessment):
+    if mode == "none":
+        return None
+
+    mandatory_failed = any(r["mandatory"] and r["passed"] is False for r in exam_results)
+    assessment_status = assessment["status"] if assessment else None
+
+    if mode == "exam_only":
+        return "passed" if not mandatory_failed else "not_passed"
+
+    if mode == "combined" and mandatory_failed:
+        return "not_passed"
+
+    # assessment_only, combined, manual
+    return assessment_status
+
+
+def evaluate_course(course, strategy="latest", user_ids=None):
+    exams = list(course.exams.order_by("id").values("id", "title", "passing_grade", "is_mandatory"))
+
+    participants = CourseParticipant.objects.filter(course=course).select_related("user")
+    if user_ids is not None:
+        participants = participants.filter(user_id__in=user_ids)
+    else:
+        participants = participants.filter(role="participant")
+    participants = list(participants.order_by("user__username"))
+
+    attempts = {}
+    for row in selected_attempts(course, strategy, user_ids):
+        attempts[(row["user_id"], row["exam_id"])] = row
+
+    assessments = {
+        a["user_id"]: a
+        for a in CourseAssessment.objects.filter(course=course).values("user_id", "total_score", "status")
+    }
+
+    mode = course.evaluation_mode or "none"
+    rows = []
+    for p in participants:
+        exam_results = []
+        for exam in exams:
+            attempt = attempts.get((p.user_id, exam["id"]))
+            score = attempt["score"] if attempt else None
+            passed = None
+            if score is not None and exam["passing_grade"] is not None:
+                passed = score >= exam["passing_grade"]
+
+            exam_results.append({
+                "exam_id": exam["id"],
+                "score": score,
+                "attempt_number": attempt["attempt_number"] if attempt else None,
+                "passed": passed,
+                "mandatory": exam["is_mandatory"],
+            })
+
+        assessment = assessments.get(p.user_id)
+        rows.append({
+            "user_id": p.user_id,
+            "username": p.user.username,
+            "email": p.user.email,
+            "exams": exam_results,
+            "assessment": (
+                {"total_score": assessment["total_score"], "status": assessment["status"]}
+                if assessment else None
+            ),
+            "final_status": final_status(mode, exam_results, assessment),
+        })
+
+    return {
+        "evaluation_enabled": mode != "none",
+        "mode": mode,
+        "attempt": strategy,
+        "exams": [
+            {
+                "exam_id": e["id"],
+                "title": e["title"],
+                "passing_grade": e["passing_grade"],
+                "mandatory": e["is_mandatory"],
+            }
+            for e in exams
+        ],
+        "participants": rows,
+    }
+
+
+def cached_course_evaluation(course, strategy="latest"):
+    key = (
+        f"course-evaluation:{course_version_stamp(course)}:{course.roster_version}:"
+        f"{course.results_version}:{strategy}"
+    )
+    data = cache.get(key)
+    if data is None:
+        data = evaluate_course(course, strategy)
+        cache.set(key, data, EVALUATION_CACHE_TIMEOUT)
+    return data
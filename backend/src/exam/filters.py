@@ -0,0 +1,17 @@
+from rest_framework.filters import SearchFilter
+
+from .search import search_course_ids
+
+
+class IndexedSearchFilter(SearchFilter):
+    """
+    Pengganti SearchFilter untuk course: tetap memakai parameter ?search=,
+    tetapi pencocokan dilakukan lewat search index (exam/search.py),
+    bukan ILIKE '%q%' pada title/description.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        q = request.query_params.get(self.search_param, "").strip()
+        if not q:
+            return queryset
+        return queryset.filter(pk__in=search_course_ids(q))
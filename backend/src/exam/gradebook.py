@@ -0,0 +1,142 @@
+"""
+Gradebook course: satu baris per peserta berisi nilai exam terbaik,
+nilai tugas dan total assessment.
+
+Nilai diambil per batch peserta dengan tiga query agregat
+(UserExam, CourseTaskSubmission, CourseAssessment) lalu di-pivot di
+memori, sehingga jumlah query tidak bergantung pada jumlah peserta.
+"""
+import csv
+import tempfile
+
+import openpyxl
+from django.db.models import Max
+
+from .models import CourseAssessment, CourseParticipant, CourseTaskSubmission, UserExam
+
+
+BATCH_SIZE = 500
+
+
+class Echo:
+    """Pseudo-buffer untuk csv.writer pada StreamingHttpResponse."""
+
+    def write(self, value):
+        return value
+
+
+def gradebook_columns(course):
+    return {
+        "exams": list(course.exams.order_by("id").values("id", "title")),
+        "tasks": list(course.tasks.order_by("id").values("id", "title")),
+    }
+
+
+def participant_queryset(course):
+    return (
+        CourseParticipant.objects
+            .filter(course=course, role="participant")
+            .select_related("user")
+            .order_by("id")
+    )
+
+
+def gradebook_rows(course, participants):
+    """participants: list CourseParticipant (satu halaman / batch)."""
+    user_ids = [p.user_id for p in participants]
+
+    exam_scores = {}
+    for row in (
+        UserExam.objects
+            .filter(exam__course=course, user_id__in=user_ids, status="completed")
+            .values("user_id", "exam_id")
+            .annotate(best=Max("score"))
+            .order_by()
+    ):
+        exam_scores.setdefault(row["user_id"], {})[row["exam_id"]] = row["best"]
+
+    task_scores = {}
+    for row in (
+        CourseTaskSubmission.objects
+            .filter(task__course=course, user_id__in=user_ids)
+            .values("user_id", "task_id", "score", "graded")
+    ):
+        task_scores.setdefault(row["user_id"], {})[row["task_id"]] = row["score"] if row["graded"] else None
+
+    assessments = dict(
+        CourseAssessment.objects
+            .filter(course=course, user_id__in=user_ids)
+            .values_list("user_id", "total_score")
+    )
+
+    return [
+        {
+            "user_id": p.user_id,
+            "username": p.user.username,
+            "email": p.user.email,
+            "exams": exam_scores.get(p.user_id, {}),
+            "tasks": task_scores.get(p.user_id, {}),
+            "assessment_total": assessments.get(p.user_id),
+        }
+        for p in participants
+    ]
+
+
+def iter_gradebook(course):
+    """Yield baris gradebook untuk semua peserta, per batch."""
+    batch = []
+    for p in participant_queryset(course).iterator(chunk_size=BATCH_SIZE):
+        batch.append(p)
+        if len(batch) >= BATCH_SIZE:
+            yield from gradebook_rows(course, batch)
+            batch = []
+    if batch:
+        yield from gradebook_rows(course, batch)
+
+
+# =====================================================================
+# EXPORT (CSV streaming / XLSX write-only)
+# =====================================================================
+def header_row(columns):
+    return (
+        ["User ID", "Username", "Email"]
+        + [f"Exam: {e['title']}" for e in columns["exams"]]
+        + [f"Tugas: {t['title']}" for t in columns["tasks"]]
+        + ["Total Assessment"]
+    )
+
+
+def flat_row(row, columns):
+    return (
+        [row["user_id"], row["username"], row["email"]]
+        + [row["exams"].get(e["id"]) for e in columns["exams"]]
+        + [row["tasks"].get(t["id"]) for t in columns["tasks"]]
+        + [row["assessment_total"]]
+    )
+
+
+def iter_csv(course):
+    columns = gradebook_columns(course)
+    writer = csv.writer(Echo())
+    yield writer.writerow(header_row(columns))
+    for row in iter_gradebook(course):
+        yield writer.writerow(["" if v is None else v for v in flat_row(row, columns)])
+
+
+def write_xlsx(course):
+    """
+    Workbook write-only (baris tidak disimpan di memori) ke file sementara.
+    Return file object yang sudah di-seek ke awal.
+    """
+    columns = gradebook_columns(course)
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Gradebook")
+    ws.append(header_row(columns))
+    for row in iter_gradebook(course):
+        ws.append(flat_row(row, columns))
+
+    tmp = tempfile.TemporaryFile()
+    wb.save(tmp)
+    tmp.seek(0)
+    return tmp
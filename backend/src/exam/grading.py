@@ -0,0 +1,184 @@
+"""
+Antrian penilaian jawaban manual (TEXT / FILE).
+
+- antrian = jawaban graded=False pada attempt yang sudah selesai
+  (memakai partial index exam_ua_ungraded_idx)
+- penilai meng-claim sebagian antrian dengan SELECT ... SKIP LOCKED,
+  sehingga beberapa assessor bisa menilai exam yang sama bersamaan
+- nilai disimpan sekaligus (satu UPDATE), lalu raw_score / score UserExam
+  yang terdampak dinaikkan sebesar selisih nilainya (delta), tanpa
+  menghitung ulang seluruh jawaban
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Q, Sum, Value, When
+from django.utils import timezone
+
+from .caching import bump_course_results
+from .models import UserAnswer, UserExam
+
+
+MANUAL_TYPES = ("TEXT", "FILE")
+
+
+def manual_answer_queryset(exam=None, question_id=None):
+    qs = UserAnswer.objects.filter(
+        graded=False,
+        question__question_type__in=MANUAL_TYPES,
+        user_exam__status="completed",
+    )
+    if exam is not None:
+        qs = qs.filter(user_exam__exam=exam)
+    if question_id:
+        qs = qs.filter(question_id=question_id)
+    return qs
+
+
+def claimable(qs, user, now=None):
+    """Belum di-claim, lease sudah habis, atau milik user ini sendiri."""
+    expired = (now or timezone.now()) - UserAnswer.CLAIM_LEASE
+    return qs.filter(
+        Q(claimed_by__isnull=True)
+        | Q(claimed_at__lt=expired)
+        | Q(claimed_by=user)
+    )
+
+
+def claim_answers(exam, user, limit, question_id=None):
+    """Return (ids, now). Baris yang sedang di-lock penilai lain dilewati."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            claimable(manual_answer_queryset(exam, question_id), user, now)
+                # lock hanya baris jawaban, bukan user_exam / question yang di-join
+                .select_for_update(skip_locked=True, of=("self",))
+                .order_by("question_id", "id")
+                .values_list("id", flat=True)[:limit]
+        )
+        UserAnswer.objects.filter(id__in=ids).update(claimed_by=user, claimed_at=now)
+    return ids, now
+
+
+def release_answers(exam, user, ids=None):
+    qs = UserAnswer.objects.filter(user_exam__exam=exam, claimed_by=user)
+    if ids:
+        qs = qs.filter(id__in=ids)
+    return qs.update(claimed_by=None, claimed_at=None)
+
+
+def parse_grades(grades):
+    """
+    grades: [{"answer": id, "score": nilai}] → ({answer_id: score}, errors).
+    Rentang nilai dicek di apply_grades (butuh points soal).
+    """
+    if not isinstance(grades, list) or not grades:
+        return {}, {"grades": "grades wajib diisi."}
+
+    cleaned = {}
+    errors = {}
+    for index, item in enumerate(grades):
+        try:
+            answer_id = int(item.get("answer"))
+        except (TypeError, ValueError, AttributeError):
+            errors[str(index)] = "Jawaban tidak valid."
+            continue
+        try:
+            score = float(item.get("score"))
+        except (TypeError, ValueError):
+            errors[str(answer_id)] = "Nilai harus berupa angka."
+            continue
+        if answer_id in cleaned:
+            errors[str(answer_id)] = "Jawaban dikirim lebih dari sekali."
+            continue
+        cleaned[answer_id] = score
+    return cleaned, errors
+
+
+def apply_score_deltas(deltas):
+    """
+    deltas: {user_exam_id: selisih nilai}. raw_score dan score diperbarui
+    dengan satu UPDATE; penyebut score sama dengan finish() (total points
+    soal yang dijawab), diambil dengan satu query agregat.
+    """
+    deltas = {ue_id: d for ue_id, d in deltas.items() if d}
+    if not deltas:
+        return 0
+
+    totals = dict(
+        UserAnswer.objects
+            .filter(user_exam_id__in=deltas)
+            .order_by()
+            .values("user_exam")
+            .annotate(total=Sum("question__points"))
+            .values_list("user_exam", "total")
+    )
+
+    raw_delta = Case(
+        *[When(pk=ue_id, then=Value(d)) for ue_id, d in deltas.items()],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    score_factor = Case(
+        *[When(pk=ue_id, then=Value(100.0 / totals[ue_id])) for ue_id in deltas if totals.get(ue_id)],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    return UserExam.objects.filter(pk__in=deltas).update(
+        raw_score=F("raw_score") + raw_delta,
+        score=(F("raw_score") + raw_delta) * score_factor,
+    )
+
+
+@transaction.atomic
+def apply_grades(exam, grader, scores):
+    """
+    scores: {answer_id: score}. Return (graded_ids, skipped, errors).
+    Jawaban yang sedang di-claim penilai lain (lease belum habis) dilewati.
+    """
+    now = timezone.now()
+    expired = now - UserAnswer.CLAIM_LEASE
+
+    rows = list(
+        UserAnswer.objects
+            .select_for_update(of=("self",))
+            .filter(user_exam__exam=exam, id__in=scores)
+            .values("id", "score", "user_exam_id", "claimed_by_id", "claimed_at", "question__points")
+    )
+
+    errors = {}
+    skipped = []
+    new_scores = {}
+    deltas = defaultdict(float)
+    for row in rows:
+        aid = row["id"]
+        score = scores[aid]
+        if row["claimed_by_id"] not in (None, grader.pk) and row["claimed_at"] and row["claimed_at"] >= expired:
+            skipped.append(aid)
+            continue
+        if not 0 <= score <= row["question__points"]:
+            errors[str(aid)] = f"Nilai harus 0 - {row['question__points']}."
+            continue
+        new_scores[aid] = score
+        deltas[row["user_exam_id"]] += score - row["score"]
+
+    found = {row["id"] for row in rows}
+    for aid in scores:
+        if aid not in found:
+            errors[str(aid)] = "Jawaban tidak ditemukan di exam ini."
+
+    if new_scores:
+        UserAnswer.objects.filter(id__in=new_scores).update(
+            score=Case(
+                *[When(pk=aid, then=Value(s)) for aid, s in new_scores.items()],
+                output_field=FloatField(),
+            ),
+            graded=True,
+            claimed_by=None,
+            claimed_at=None,
+        )
+        apply_score_deltas(deltas)
+        # update() tidak memicu signal
+        bump_course_results(pk=exam.course_id)
+
+    return list(new_scores), skipped, errors
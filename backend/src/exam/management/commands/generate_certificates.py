@@ -0,0 +1,61 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from cv.batch import BatchJob
+from exam.certificates import KINDS, generate_course_documents
+from exam.models import Course
+
+
+class Command(BaseCommand):
+    help = "Generate sertifikat kelulusan dan transkrip nilai seluruh peserta course ke satu file ZIP."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", type=int, required=True)
+        parser.add_argument("--kind", choices=list(KINDS), action="append", dest="kinds",
+                            help="certificate / transcript (boleh berulang, default: keduanya).")
+        parser.add_argument("--output", help="Path file ZIP.")
+        parser.add_argument("--workers", type=int, help="Jumlah proses (default: jumlah CPU).")
+        parser.add_argument("--job", help="ID job (dipakai oleh endpoint API).")
+
+    def handle(self, *args, **options):
+        job = BatchJob(options["job"]) if options["job"] else None
+        if job is None and not options["output"]:
+            raise CommandError("--output wajib diisi.")
+
+        try:
+            self.run(job, options)
+        except Exception as e:
+            if job is not None:
+                job.write_status(state="failed", error=str(e), finished_at=timezone.now().isoformat())
+            raise
+
+    def run(self, job, options):
+        try:
+            course = Course.objects.get(pk=options["course"])
+        except Course.DoesNotExist:
+            raise CommandError("Course tidak ditemukan.")
+
+        def progress(done, total):
+            if job is not None:
+                job.write_status(state="running", done=done, total=total)
+            if options["verbosity"] > 0:
+                self.stdout.write(f"\r{done}/{total} dokumen", ending="")
+
+        output = str(job.zip_path) if job is not None else options["output"]
+        # file .part di-rename setelah selesai, agar ZIP setengah jadi tidak pernah diunduh
+        partial = output + ".part"
+        with open(partial, "wb") as out:
+            summary = generate_course_documents(course, out, options["kinds"], options["workers"], progress)
+        os.replace(partial, output)
+
+        if job is not None:
+            job.write_status(state="done", finished_at=timezone.now().isoformat(), **summary)
+
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['generated']} dokumen untuk {summary['participants']} peserta "
+            f"({summary['rendered']} dirender, {summary['from_cache']} tidak berubah), "
+            f"{len(summary['errors'])} gagal."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from exam.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Index ulang course, silabus, dan materi untuk pencarian."
+
+    def handle(self, *args, **options):
+        total = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"{total} entri search di-index."))
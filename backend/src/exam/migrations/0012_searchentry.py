@@ -0,0 +1,95 @@
+# Generated by Django 4.0 on 2026-10-19 13:29
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+SEARCH_INDEXES = [
+    django.contrib.postgres.indexes.GinIndex(fields=['document'], name='exam_search_document_gin'),
+    django.contrib.postgres.indexes.GinIndex(fields=['title'], name='exam_search_title_trgm', opclasses=['gin_trgm_ops']),
+]
+
+
+def add_search_indexes(apps, schema_editor):
+    # GIN hanya ada di Postgres; database lain memakai fallback inverted index
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    model = apps.get_model('exam', 'SearchEntry')
+    for index in SEARCH_INDEXES:
+        schema_editor.add_index(model, index)
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    model = apps.get_model('exam', 'SearchEntry')
+    for index in SEARCH_INDEXES:
+        schema_editor.remove_index(model, index)
+
+
+def backfill_search_entries(apps, schema_editor):
+    Course = apps.get_model('exam', 'Course')
+    CourseSyllabus = apps.get_model('exam', 'CourseSyllabus')
+    CourseMaterial = apps.get_model('exam', 'CourseMaterial')
+    SearchEntry = apps.get_model('exam', 'SearchEntry')
+
+    entries = []
+    for c in Course.objects.all().iterator():
+        entries.append(SearchEntry(kind='course', object_id=c.id, course_id=c.id,
+                                   title=c.title, body=c.description or ''))
+    for s in CourseSyllabus.objects.all().iterator():
+        body = ' '.join(filter(None, [s.description, s.category, s.sub_category, s.informant]))
+        entries.append(SearchEntry(kind='syllabus', object_id=s.id, course_id=s.course_id,
+                                   title=s.title, body=body))
+    for m in CourseMaterial.objects.all().iterator():
+        entries.append(SearchEntry(kind='material', object_id=m.id, course_id=m.course_id,
+                                   title=m.title, body=m.description or ''))
+    SearchEntry.objects.bulk_create(entries, batch_size=1000)
+
+    if schema_editor.connection.vendor == 'postgresql':
+        SearchEntry.objects.update(
+            document=SearchVector('title', weight='A', config='simple')
+            + SearchVector('body', weight='B', config='simple')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam', '0011_useranswerfile'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('course', 'Course'), ('syllabus', 'Silabus'), ('material', 'Materi')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('document', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='exam.course')),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='searchentry', index=SEARCH_INDEXES[0]),
+                migrations.AddIndex(model_name='searchentry', index=SEARCH_INDEXES[1]),
+            ],
+            database_operations=[
+                migrations.RunPython(add_search_indexes, remove_search_indexes),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchentry',
+            unique_together={('kind', 'object_id')},
+        ),
+        migrations.RunPython(backfill_search_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.0 on 2026-10-19 13:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('exam', '0013_course_content_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courserequirementsubmission',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='courserequirementsubmission',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='requirement_claims', to='auth.user'),
+        ),
+        migrations.AddIndex(
+            model_name='courserequirementsubmission',
+            index=models.Index(fields=['course', 'status', 'submitted_at'], name='exam_reqsub_queue_idx'),
+        ),
+    ]
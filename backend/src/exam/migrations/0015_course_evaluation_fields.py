@@ -0,0 +1,28 @@
+# Generated by Django 4.0 on 2026-10-19 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam', '0014_requirement_claims'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='evaluation_mode',
+            field=models.CharField(choices=[('none', 'No Final Result'), ('exam_only', 'Exam Based'), ('assessment_only', 'Assessment Based'), ('combined', 'Exam + Assessment'), ('manual', 'Manual Decision')], default='none', help_text='Mode evaluasi final untuk course/event', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='results_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='exam',
+            name='is_mandatory',
+            field=models.BooleanField(default=False, help_text='Jika True, exam ini wajib lulus agar peserta dianggap lulus course (bila evaluation_mode membutuhkan)'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.0 on 2026-10-19 13:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('exam', '0015_course_evaluation_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='useranswer',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='useranswer',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='grading_claims', to='auth.user'),
+        ),
+        migrations.AddIndex(
+            model_name='useranswer',
+            index=models.Index(condition=models.Q(('graded', False)), fields=['question', 'user_exam'], name='exam_ua_ungraded_idx'),
+        ),
+    ]
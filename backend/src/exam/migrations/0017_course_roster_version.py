@@ -0,0 +1,18 @@
+# Generated by Django 4.0 on 2026-10-19 14:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam', '0016_useranswer_grading_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='roster_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,9 +1,12 @@
 import uuid
 import random
+from datetime import timedelta
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 
 
@@ -28,6 +31,14 @@ class Course(models.Model):
         ("advanced", "Mahir"),
     ]
 
+    EVALUATION_MODES = [
+        ("none", "No Final Result"),
+        ("exam_only", "Exam Based"),
+        ("assessment_only", "Assessment Based"),
+        ("combined", "Exam + Assessment"),
+        ("manual", "Manual Decision"),
+    ]
+
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
 
@@ -48,9 +59,27 @@ class Course(models.Model):
     end_date = models.DateField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
 
+    evaluation_mode = models.CharField(
+        max_length=50,
+        choices=EVALUATION_MODES,
+        default="none",
+        help_text="Mode evaluasi final untuk course/event"
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # versi konten course (silabus, materi, tugas, ujian, dst.)
+    # dinaikkan lewat signals → dipakai untuk ETag / cache
+    content_version = models.PositiveIntegerField(default=0, editable=False)
+    content_updated_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    # versi hasil (attempt exam & assessment) → cache evaluasi course
+    results_version = models.PositiveIntegerField(default=0, editable=False)
+
+    # versi roster (join, approval, ganti role, import peserta); terpisah
+    # dari content_version agar perubahan peserta tidak membuang cache konten
+    roster_version = models.PositiveIntegerField(default=0, editable=False)
+
     def save(self, *args, **kwargs):
         if not self.token:
             self.token = generate_token()
@@ -125,6 +154,11 @@ class Exam(models.Model):
     attempt_limit = models.PositiveIntegerField(default=1)
     passing_grade = models.FloatField(null=True, blank=True)
 
+    is_mandatory = models.BooleanField(
+        default=False,
+        help_text="Jika True, exam ini wajib lulus agar peserta dianggap lulus course (bila evaluation_mode membutuhkan)"
+    )
+
     # token
     token = models.CharField(max_length=12, unique=True, blank=True, null=True)
 
@@ -266,8 +300,28 @@ class UserAnswer(models.Model):
     score = models.FloatField(default=0.0)
     graded = models.BooleanField(default=False)
 
+    # antrian penilaian manual (TEXT / FILE): jawaban "diklaim" penilai selama CLAIM_LEASE
+    claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        related_name="grading_claims",
+        on_delete=models.SET_NULL
+    )
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    CLAIM_LEASE = timedelta(minutes=10)
+
     class Meta:
         unique_together = ("user_exam", "question")
+        indexes = [
+            # hanya jawaban yang belum dinilai → index tetap kecil
+            models.Index(
+                fields=["question", "user_exam"],
+                condition=models.Q(graded=False),
+                name="exam_ua_ungraded_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Answer: {self.user_exam} - {self.question}"
@@ -413,6 +467,23 @@ class CourseRequirementSubmission(models.Model):
     )
     note = models.TextField(null=True, blank=True)  # catatan admin
 
+    # work queue reviewer: submission "diklaim" admin selama CLAIM_LEASE
+    claimed_by = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        related_name="requirement_claims",
+        on_delete=models.SET_NULL
+    )
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    CLAIM_LEASE = timedelta(minutes=10)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["course", "status", "submitted_at"], name="exam_reqsub_queue_idx"),
+        ]
+
     def __str__(self):
         return f"Submission from {self.user} - {self.course}"
 
@@ -447,32 +518,6 @@ from django.db import models
 
 User = settings.AUTH_USER_MODEL  # use this in ForeignKey definitions below if necessary
 
-# --- COURSE: evaluation_mode (add to Course model) ---
-# inside Course model add:
-EVALUATION_MODES = [
-    ("none", "No Final Result"),
-    ("exam_only", "Exam Based"),
-    ("assessment_only", "Assessment Based"),
-    ("combined", "Exam + Assessment"),
-    ("manual", "Manual Decision")
-]
-
-# Example insertion (edit existing Course model to include this field):
-evaluation_mode = models.CharField(
-    max_length=50,
-    choices=EVALUATION_MODES,
-    default="none",
-    help_text="Mode evaluasi final untuk course/event"
-)
-
-# --- EXAM: is_mandatory (add to Exam model) ---
-# inside Exam model add:
-is_mandatory = models.BooleanField(
-    default=False,
-    help_text="Jika True, exam ini wajib lulus agar peserta dianggap lulus course (bila evaluation_mode membutuhkan)"
-)
-
-
 # ---------------------------------------------------------------------
 # New models for Course Assessment (matrix) — add these near other models
 # ---------------------------------------------------------------------
@@ -505,9 +550,9 @@ class CourseAssessment(models.Model):
         unique_together = ("course", "user")  # one assessment per user per course (adjust if multiple allowed)
 
     def recalc_total(self):
-        total = sum([a.score for a in self.answers.all()])
+        total = self.answers.aggregate(total=models.Sum("score"))["total"] or 0
         self.total_score = total
-        self.save()
+        self.save(update_fields=["total_score", "updated_at"])
         return self.total_score
 
     def __str__(self):
@@ -522,3 +567,36 @@ class CourseAssessmentAnswer(models.Model):
 
     def __str__(self):
         return f"{self.assessment} - {self.criteria.name} - {self.score}"
+
+
+# ---------------------------------------------------------------------
+# Search index (course, silabus, materi) — diisi lewat signals (exam/signals.py)
+# ---------------------------------------------------------------------
+class SearchEntry(models.Model):
+    KIND_CHOICES = [
+        ("course", "Course"),
+        ("syllabus", "Silabus"),
+        ("material", "Materi"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    course = models.ForeignKey("Course", related_name="search_entries", on_delete=models.CASCADE)
+
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+
+    # tsvector (Postgres); null di database lain → pakai fallback inverted index
+    document = SearchVectorField(null=True, editable=False)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("kind", "object_id")
+        indexes = [
+            GinIndex(fields=["document"], name="exam_search_document_gin"),
+            GinIndex(fields=["title"], name="exam_search_title_trgm", opclasses=["gin_trgm_ops"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}#{self.object_id} - {self.title}"
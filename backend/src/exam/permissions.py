@@ -1,5 +1,5 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
-from exam.models import CourseParticipant, CourseTask, Exam, CourseTaskSubmission
+from exam.models import CourseParticipant, CourseTaskSubmission
 
 
 # =====================================================================
@@ -14,6 +14,17 @@ class IsAdmin(BasePermission):
         )
 
 
+# =====================================================================
+# Memoize get_object() pada view
+# permission class dan action memakai object yang sama → satu query
+# =====================================================================
+class CachedObjectMixin:
+    def get_object(self):
+        if not hasattr(self, "_cached_object"):
+            self._cached_object = super().get_object()
+        return self._cached_object
+
+
 # =====================================================================
 # Helper: Ambil course_id dari view OR body
 # =====================================================================
@@ -24,31 +35,25 @@ def extract_course_id(view, request):
     - /courses/<pk>/syllabus
     - /tasks/<pk>/submit → task.course_id
     - /exams/<pk>/questions → exam.course_id
+    - /submissions/<pk>/ → submission.task.course_id
     - POST create exam/material: course_id ada di request.data
+
+    Untuk task/exam/submission, object diambil lewat view.get_object()
+    (di-memoize oleh CachedObjectMixin) sehingga action tidak query ulang.
     """
 
     # From URL
     course_id = view.kwargs.get("pk") or view.kwargs.get("course_id")
 
-    # ----- Task: pk = task_id -----
-    if view.basename == "tasks":
-        task_id = view.kwargs.get("pk")
-        if task_id:
-            try:
-                task = CourseTask.objects.get(id=task_id)
-                return task.course_id
-            except CourseTask.DoesNotExist:
-                pass
-
-    # ----- Exam: pk = exam_id -----
-    if view.basename == "exams":
-        exam_id = view.kwargs.get("pk")
-        if exam_id:
-            try:
-                exam = Exam.objects.get(id=exam_id)
-                return exam.course_id
-            except Exam.DoesNotExist:
-                pass
+    # ----- Task / Exam / Submission: pk bukan course_id -----
+    if view.basename in ("tasks", "exams", "submissions"):
+        if not view.kwargs.get("pk"):
+            course_id = None
+        else:
+            obj = view.get_object()
+            if view.basename == "submissions":
+                return obj.task.course_id
+            return obj.course_id
 
     # Fallback from POST body (important for exam/material creation)
     if not course_id:
@@ -57,21 +62,58 @@ def extract_course_id(view, request):
     return course_id
 
 
+# =====================================================================
+# Helper: role user per course, dimuat sekali per request
+# =====================================================================
+def get_course_roles(request):
+    """
+    Return {course_id: role} untuk user yang login.
+    Hasil disimpan di HttpRequest sehingga semua permission class,
+    view, dan serializer dalam request yang sama tidak query ulang.
+    """
+    http_request = getattr(request, "_request", request)
+    roles = getattr(http_request, "_course_roles", None)
+
+    if roles is None:
+        user = request.user
+        if user and user.is_authenticated:
+            roles = dict(
+                CourseParticipant.objects.filter(user=user).values_list("course_id", "role")
+            )
+        else:
+            roles = {}
+        http_request._course_roles = roles
+
+    return roles
+
+
+def forget_course_roles(request):
+    """Dipanggil setelah CourseParticipant user yang login berubah."""
+    http_request = getattr(request, "_request", request)
+    if hasattr(http_request, "_course_roles"):
+        del http_request._course_roles
+
+
 # =====================================================================
 # Helper: cek role user dalam course
 # =====================================================================
-def user_has_role(user, course_id, roles):
-    if not user or not user.is_authenticated:
+def user_has_role(request, course_id, roles):
+    if not request.user or not request.user.is_authenticated:
         return False
 
     if not course_id:
         return False
 
-    return CourseParticipant.objects.filter(
-        course_id=course_id,
-        user=user,
-        role__in=roles
-    ).exists()
+    try:
+        course_id = int(course_id)
+    except (TypeError, ValueError):
+        return False
+
+    return get_course_roles(request).get(course_id) in roles
+
+
+# dipakai di views: user_role_in_course(request, course.id, ["trainer"])
+user_role_in_course = user_has_role
 
 
 # =====================================================================
@@ -80,7 +122,7 @@ def user_has_role(user, course_id, roles):
 class IsCourseParticipant(BasePermission):
     def has_permission(self, request, view):
         cid = extract_course_id(view, request)
-        return user_has_role(request.user, cid, ["participant", "trainer", "assessor"])
+        return user_has_role(request, cid, ["participant", "trainer", "assessor"])
 
 
 # =====================================================================
@@ -89,7 +131,7 @@ class IsCourseParticipant(BasePermission):
 class IsTrainer(BasePermission):
     def has_permission(self, request, view):
         cid = extract_course_id(view, request)
-        return user_has_role(request.user, cid, ["trainer"])
+        return user_has_role(request, cid, ["trainer"])
 
 
 # =====================================================================
@@ -98,7 +140,7 @@ class IsTrainer(BasePermission):
 class IsAssessor(BasePermission):
     def has_permission(self, request, view):
         cid = extract_course_id(view, request)
-        return user_has_role(request.user, cid, ["assessor"])
+        return user_has_role(request, cid, ["assessor"])
 
 
 # =====================================================================
@@ -107,7 +149,7 @@ class IsAssessor(BasePermission):
 class IsTrainerOrAssessor(BasePermission):
     def has_permission(self, request, view):
         cid = extract_course_id(view, request)
-        return user_has_role(request.user, cid, ["trainer", "assessor"])
+        return user_has_role(request, cid, ["trainer", "assessor"])
 
 
 # =====================================================================
@@ -119,7 +161,7 @@ class IsTrainerOrAdmin(BasePermission):
             return True
 
         cid = extract_course_id(view, request)
-        return user_has_role(request.user, cid, ["trainer"])
+        return user_has_role(request, cid, ["trainer"])
 
 
 # =====================================================================
@@ -133,7 +175,20 @@ class IsExamCreator(BasePermission):
             return True
 
         cid = extract_course_id(view, request)
-        return user_has_role(request.user, cid, ["trainer", "assessor"])
+        return user_has_role(request, cid, ["trainer", "assessor"])
+
+
+# =====================================================================
+# Exam Instructor / Assessor (+ Admin)
+# dipakai untuk hasil, penilaian, analytics, export
+# =====================================================================
+class IsExamInstructorOrAssessor(BasePermission):
+    def has_permission(self, request, view):
+        if request.user.is_authenticated and request.user.is_staff:
+            return True
+
+        cid = extract_course_id(view, request)
+        return user_has_role(request, cid, ["trainer", "assessor"])
 
 
 # =====================================================================
@@ -142,7 +197,7 @@ class IsExamCreator(BasePermission):
 class IsTaskGrader(BasePermission):
     def has_object_permission(self, request, view, submission: CourseTaskSubmission):
         cid = submission.task.course_id
-        return user_has_role(request.user, cid, ["trainer", "assessor"])
+        return user_has_role(request, cid, ["trainer", "assessor"])
 
 
 # =====================================================================
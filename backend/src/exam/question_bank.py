@@ -0,0 +1,202 @@
+"""
+Import / export bank soal satu Exam (soal, pilihan, percabangan).
+
+Format JSON:
+    {"questions": [
+        {"key": "q1", "text": "...", "question_type": "MCQ", ...,
+         "parent_question": null, "parent_choice": null,
+         "choices": [{"key": "q1c1", "text": "...", "score": 1, "order": 0}]},
+        {"key": "q2", ..., "parent_question": "q1", "parent_choice": "q1c1"}
+    ]}
+
+Spreadsheet: sheet "questions" dan "choices" dengan kolom yang sama
+(choices memakai kolom question_key untuk menunjuk soalnya).
+"""
+import openpyxl
+from django.db import transaction
+
+from .caching import bump_course_version
+from .models import Choice, Question, UserExam
+
+
+QUESTION_COLUMNS = [
+    "key", "text", "question_type", "required", "order", "points", "weight",
+    "allow_multiple_files", "allow_blank_answer", "parent_question", "parent_choice",
+]
+CHOICE_COLUMNS = ["question_key", "key", "text", "score", "order"]
+BOOLEAN_COLUMNS = {"required", "allow_multiple_files", "allow_blank_answer"}
+
+
+class QuestionBankFormatError(ValueError):
+    pass
+
+
+class QuestionBankConflictError(Exception):
+    """replace ditolak: exam sudah punya attempt (jawaban & nilai ikut terhapus)."""
+
+
+# =====================================================================
+# EXPORT
+# =====================================================================
+def export_bank(exam):
+    questions = list(
+        Question.objects.filter(exam=exam).order_by("order", "id").prefetch_related("choices")
+    )
+
+    data = []
+    for q in questions:
+        data.append({
+            "key": f"q{q.id}",
+            "text": q.text,
+            "question_type": q.question_type,
+            "required": q.required,
+            "order": q.order,
+            "points": q.points,
+            "weight": q.weight,
+            "allow_multiple_files": q.allow_multiple_files,
+            "allow_blank_answer": q.allow_blank_answer,
+            "parent_question": f"q{q.parent_question_id}" if q.parent_question_id else None,
+            "parent_choice": f"c{q.parent_choice_id}" if q.parent_choice_id else None,
+            "choices": [
+                {"key": f"c{c.id}", "text": c.text, "score": c.score, "order": c.order}
+                for c in q.choices.all()
+            ],
+        })
+
+    return {"exam": {"id": exam.id, "title": exam.title}, "questions": data}
+
+
+def bank_to_workbook(bank):
+    wb = openpyxl.Workbook()
+    ws_q = wb.active
+    ws_q.title = "questions"
+    ws_q.append(QUESTION_COLUMNS)
+
+    ws_c = wb.create_sheet("choices")
+    ws_c.append(CHOICE_COLUMNS)
+
+    for q in bank.get("questions", []):
+        ws_q.append([q.get(col) for col in QUESTION_COLUMNS])
+        for c in q.get("choices", []):
+            ws_c.append([q["key"]] + [c.get(col) for col in CHOICE_COLUMNS[1:]])
+
+    return wb
+
+
+# =====================================================================
+# IMPORT
+# =====================================================================
+def _cell(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value if value != "" else None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "ya", "y")
+    return bool(value)
+
+
+def _sheet_rows(ws, columns):
+    rows = ws.iter_rows(values_only=True)
+    header = [str(h).strip().lower() if h is not None else "" for h in next(rows, [])]
+    missing = [c for c in ("key", "text") if c not in header]
+    if missing:
+        raise QuestionBankFormatError(f"Sheet '{ws.title}' tidak memiliki kolom: {', '.join(missing)}.")
+
+    for row in rows:
+        item = {h: _cell(v) for h, v in zip(header, row) if h in columns}
+        if any(v is not None for v in item.values()):
+            yield {k: v for k, v in item.items() if v is not None}
+
+
+def workbook_to_bank(uploaded_file):
+    try:
+        wb = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    except Exception:
+        raise QuestionBankFormatError("File spreadsheet tidak bisa dibaca.")
+
+    if "questions" not in wb.sheetnames:
+        raise QuestionBankFormatError("Sheet 'questions' tidak ditemukan.")
+
+    questions = []
+    by_key = {}
+    for row in _sheet_rows(wb["questions"], QUESTION_COLUMNS):
+        for col in BOOLEAN_COLUMNS & row.keys():
+            row[col] = _bool(row[col])
+        row["key"] = str(row.get("key", ""))
+        row["choices"] = []
+        questions.append(row)
+        by_key[row["key"]] = row
+
+    if "choices" in wb.sheetnames:
+        for row in _sheet_rows(wb["choices"], CHOICE_COLUMNS):
+            owner = by_key.get(str(row.pop("question_key", "")))
+            if owner is None:
+                raise QuestionBankFormatError(f"Pilihan '{row.get('key')}' menunjuk soal yang tidak ada.")
+            row["key"] = str(row.get("key", ""))
+            owner["choices"].append(row)
+
+    return {"questions": questions}
+
+
+@transaction.atomic
+def import_bank(exam, questions, replace=False):
+    """
+    questions: data tervalidasi QuestionBankSerializer.
+    Semua soal & pilihan dibuat lewat bulk_create, lalu link percabangan
+    diisi dengan satu bulk_update.
+    """
+    if replace:
+        # hapus soal → UserAnswer ikut terhapus (CASCADE); hanya boleh bila
+        # belum ada yang mengerjakan, selain itu import harus append
+        if UserExam.objects.filter(exam=exam).exists():
+            raise QuestionBankConflictError(
+                "Exam sudah memiliki attempt peserta; soal tidak bisa diganti, import tanpa replace."
+            )
+        Question.objects.filter(exam=exam).delete()
+
+    field_names = [c for c in QUESTION_COLUMNS if c not in ("key", "parent_question", "parent_choice")]
+
+    question_objs = [
+        Question(exam=exam, **{f: q[f] for f in field_names if f in q})
+        for q in questions
+    ]
+    Question.objects.bulk_create(question_objs)
+    question_ids = {q["key"]: obj for q, obj in zip(questions, question_objs)}
+
+    choice_objs = []
+    choice_keys = []
+    for q, obj in zip(questions, question_objs):
+        for c in q.get("choices", []):
+            choice_objs.append(Choice(
+                question=obj,
+                text=c["text"],
+                score=c.get("score", 0.0),
+                order=c.get("order", 0),
+            ))
+            choice_keys.append(c["key"])
+    Choice.objects.bulk_create(choice_objs)
+    choice_ids = dict(zip(choice_keys, choice_objs))
+
+    linked = []
+    for q, obj in zip(questions, question_objs):
+        if q.get("parent_question"):
+            obj.parent_question = question_ids[q["parent_question"]]
+            obj.parent_choice = choice_ids.get(q.get("parent_choice") or "")
+            linked.append(obj)
+    if linked:
+        Question.objects.bulk_update(linked, ["parent_question", "parent_choice"])
+
+    # bulk_create tidak memicu signal
+    bump_course_version(exam.course_id)
+
+    return {
+        "questions_created": len(question_objs),
+        "choices_created": len(choice_objs),
+        "keys": {key: obj.id for key, obj in question_ids.items()},
+    }
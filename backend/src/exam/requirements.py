@@ -0,0 +1,121 @@
+"""
+Schema persyaratan course (CourseRequirementTemplate) yang sudah
+"dikompilasi": template dimuat sekali lalu disimpan di cache dengan key
+versi konten course (lihat exam/caching.py), sehingga validasi pengajuan
+tidak lagi query template per jawaban.
+"""
+from django.core.cache import cache
+
+from .caching import course_version_stamp
+from .models import CourseRequirementTemplate
+
+
+SCHEMA_CACHE_TIMEOUT = 60 * 60
+
+
+class RequirementSchema:
+    def __init__(self, fields):
+        # fields: list of dict (id, field_name, field_type, required, options)
+        self.fields = {f["id"]: f for f in fields}
+
+    def __bool__(self):
+        return bool(self.fields)
+
+    def _clean_value(self, field, ans):
+        """Return (value_text, value_number, value_file) atau raise ValueError."""
+        ftype = field["field_type"]
+        text = ans.get("value_text")
+        text = text.strip() if isinstance(text, str) else text
+        text = text if text not in ("", None) else None
+
+        if ftype == "number":
+            raw = ans.get("value_number")
+            if raw in ("", None):
+                raw = text
+            if raw is None:
+                number = None
+            else:
+                try:
+                    number = float(raw)
+                except (TypeError, ValueError):
+                    raise ValueError("Harus berupa angka.")
+            if field["required"] and number is None:
+                raise ValueError("Wajib diisi.")
+            return text, number, None
+
+        if ftype == "file":
+            f = ans.get("value_file") or None
+            if field["required"] and f is None:
+                raise ValueError("File wajib diunggah.")
+            return None, None, f
+
+        if ftype == "select":
+            if text is not None and text not in field["options"]:
+                raise ValueError("Pilihan tidak valid.")
+
+        if field["required"] and text is None:
+            raise ValueError("Wajib diisi.")
+
+        return text, None, None
+
+    def validate(self, answers_list):
+        """
+        Return (cleaned, errors).
+        cleaned : list of dict siap untuk CourseRequirementAnswer
+        errors  : {requirement_id: pesan}
+        """
+        cleaned = []
+        errors = {}
+        seen = set()
+
+        for ans in answers_list:
+            try:
+                rid = int(ans.get("requirement"))
+            except (TypeError, ValueError, AttributeError):
+                errors["requirement"] = "ID persyaratan tidak valid."
+                continue
+
+            field = self.fields.get(rid)
+            if field is None:
+                errors[str(rid)] = "Persyaratan tidak ditemukan di course ini."
+                continue
+
+            if rid in seen:
+                errors[str(rid)] = "Jawaban dikirim lebih dari sekali."
+                continue
+            seen.add(rid)
+
+            try:
+                value_text, value_number, value_file = self._clean_value(field, ans)
+            except ValueError as e:
+                errors[str(rid)] = str(e)
+                continue
+
+            cleaned.append({
+                "requirement_id": rid,
+                "value_text": value_text,
+                "value_number": value_number,
+                "value_file": value_file,
+            })
+
+        for rid, field in self.fields.items():
+            if field["required"] and rid not in seen and str(rid) not in errors:
+                errors[str(rid)] = f"{field['field_name']} wajib diisi."
+
+        return cleaned, errors
+
+
+def get_requirement_schema(course):
+    key = f"requirement-schema:{course_version_stamp(course)}"
+    fields = cache.get(key)
+
+    if fields is None:
+        fields = []
+        templates = CourseRequirementTemplate.objects.filter(course=course).order_by("order")
+        for t in templates.values("id", "field_name", "field_type", "required", "options"):
+            options = t["options"] or []
+            t["options"] = [str(o) for o in options] if isinstance(options, list) else []
+            fields.append(t)
+        cache.set(key, fields, SCHEMA_CACHE_TIMEOUT)
+
+    return RequirementSchema(fields)
@@ -0,0 +1,229 @@
+"""
+Import roster peserta course dari CSV / XLSX.
+
+Kolom (header, tidak case-sensitive):
+    email | nip | role | username | first_name | last_name
+User dicari lewat email atau NIP (cv.EmployeeInfo.nip). File dibaca
+baris per baris dan diproses per batch, sehingga cohort besar tidak
+pernah dimuat penuh ke memori dan query per batch jumlahnya tetap.
+"""
+import csv
+import io
+import os
+
+import openpyxl
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+
+from cv.models import EmployeeInfo
+
+from .models import CourseParticipant
+
+
+User = get_user_model()
+
+BATCH_SIZE = 500
+VALID_ROLES = {choice for choice, _ in CourseParticipant.ROLE_CHOICES}
+
+
+class RosterFormatError(ValueError):
+    pass
+
+
+def _clean(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # NIP dari Excel sering terbaca sebagai angka
+    return str(value).strip()
+
+
+def users_by_email(emails):
+    """
+    Return {email huruf kecil: user_id}. Email di database bisa
+    menyimpan huruf besar (create_user hanya menormalkan domain).
+    """
+    found = {}
+    rows = (
+        User.objects
+            .annotate(email_l=Lower("email"))
+            .filter(email_l__in=emails)
+            .order_by("id")
+            .values_list("email_l", "id")
+    )
+    for email, uid in rows:
+        found.setdefault(email, uid)
+    return found
+
+
+def iter_roster_rows(uploaded_file):
+    """Yield (nomor_baris, dict) dari file CSV atau XLSX."""
+    ext = os.path.splitext(uploaded_file.name or "")[1].lower()
+
+    if ext == ".csv":
+        text = io.TextIOWrapper(uploaded_file.file, encoding="utf-8-sig", newline="")
+        reader = csv.reader(text)
+    elif ext in (".xlsx", ".xlsm"):
+        wb = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+        reader = wb.active.iter_rows(values_only=True)
+    else:
+        raise RosterFormatError("Format file harus .csv atau .xlsx.")
+
+    header = None
+    for line_no, row in enumerate(reader, start=1):
+        if header is None:
+            header = [_clean(h).lower() for h in row]
+            if "email" not in header and "nip" not in header:
+                raise RosterFormatError("Header harus memiliki kolom 'email' atau 'nip'.")
+            continue
+
+        values = [_clean(v) for v in row]
+        if not any(values):
+            continue
+        yield line_no, dict(zip(header, values))
+
+
+class RosterImporter:
+    def __init__(self, course, default_role="participant", create_missing=False):
+        self.course = course
+        self.default_role = default_role
+        self.create_missing = create_missing
+        self.seen_user_ids = set()
+        self.report = {"created": [], "updated": [], "unchanged": [], "rejected": [], "accounts_created": []}
+
+    def reject(self, line_no, row, reason):
+        self.report["rejected"].append({
+            "row": line_no,
+            "email": row.get("email", ""),
+            "nip": row.get("nip", ""),
+            "reason": reason,
+        })
+
+    def run(self, rows):
+        batch = []
+        for item in rows:
+            batch.append(item)
+            if len(batch) >= BATCH_SIZE:
+                self.process_batch(batch)
+                batch = []
+        if batch:
+            self.process_batch(batch)
+        return self.report
+
+    # -----------------------------------------------------------------
+    def resolve_users(self, batch):
+        emails = {r["email"].lower() for _, r in batch if r.get("email")}
+        nips = {r["nip"] for _, r in batch if r.get("nip")}
+
+        by_email = users_by_email(emails) if emails else {}
+
+        by_nip = dict(
+            EmployeeInfo.objects.filter(nip__in=nips).values_list("nip", "user_id")
+        ) if nips else {}
+
+        return by_email, by_nip
+
+    def create_accounts(self, pending):
+        """pending: list of (line_no, row) tanpa akun; akun dibuat dari email."""
+        emails = [r["email"].lower() for _, r in pending]
+        usernames = {
+            r["email"].lower(): (r.get("username") or r["email"])[:150]
+            for _, r in pending
+        }
+        taken = set(User.objects.filter(username__in=usernames.values()).values_list("username", flat=True))
+        # akun dengan email yang sama (beda huruf besar/kecil) tidak dibuat ulang
+        registered = set(users_by_email(emails))
+
+        new_users = []
+        planned = set()
+        for line_no, row in pending:
+            email = row["email"].lower()
+            if email in planned:
+                continue  # baris duplikat → ditolak saat upsert
+            planned.add(email)
+            if email in registered:
+                self.reject(line_no, row, f"Email '{row['email']}' sudah terdaftar.")
+                continue
+            username = usernames[email]
+            if username in taken:
+                self.reject(line_no, row, f"Username '{username}' sudah dipakai.")
+                continue
+            taken.add(username)
+            user = User(
+                username=username,
+                email=email,
+                first_name=row.get("first_name", "")[:150],
+                last_name=row.get("last_name", "")[:150],
+            )
+            user.set_unusable_password()
+            new_users.append(user)
+
+        User.objects.bulk_create(new_users)
+        self.report["accounts_created"].extend(u.email for u in new_users)
+        return users_by_email([u.email for u in new_users]) if new_users else {}
+
+    def process_batch(self, batch):
+        by_email, by_nip = self.resolve_users(batch)
+
+        resolved = []   # (line_no, row, user_id, role)
+        missing = []
+        for line_no, row in batch:
+            role = (row.get("role") or self.default_role).lower()
+            if role not in VALID_ROLES:
+                self.reject(line_no, row, f"Role '{role}' tidak dikenal.")
+                continue
+
+            email = row.get("email", "").lower()
+            uid = by_email.get(email) if email else None
+            if uid is None and row.get("nip"):
+                uid = by_nip.get(row["nip"])
+
+            if uid is None:
+                if self.create_missing and email:
+                    missing.append((line_no, row))
+                else:
+                    self.reject(line_no, row, "User tidak ditemukan.")
+                continue
+
+            resolved.append((line_no, row, uid, role))
+
+        if missing:
+            created = self.create_accounts(missing)
+            for line_no, row in missing:
+                uid = created.get(row["email"].lower())
+                if uid is not None:
+                    role = (row.get("role") or self.default_role).lower()
+                    resolved.append((line_no, row, uid, role))
+
+        self.upsert(resolved)
+
+    def upsert(self, resolved):
+        existing = dict(
+            CourseParticipant.objects
+                .filter(course=self.course, user_id__in=[uid for _, _, uid, _ in resolved])
+                .values_list("user_id", "role")
+        )
+
+        to_create = []
+        to_update = {}  # role -> [user_id]
+        for line_no, row, uid, role in resolved:
+            if uid in self.seen_user_ids:
+                self.reject(line_no, row, "Duplikat di file.")
+                continue
+            self.seen_user_ids.add(uid)
+
+            entry = {"row": line_no, "user_id": uid, "role": role}
+            if uid not in existing:
+                to_create.append(CourseParticipant(course=self.course, user_id=uid, role=role))
+                self.report["created"].append(entry)
+            elif existing[uid] != role:
+                to_update.setdefault(role, []).append(uid)
+                self.report["updated"].append(entry)
+            else:
+                self.report["unchanged"].append(entry)
+
+        # Django 4.0 belum punya bulk_create(update_conflicts=...):
+        # insert baris baru sekaligus, lalu satu UPDATE per role
+        CourseParticipant.objects.bulk_create(to_create, ignore_conflicts=True)
+        for role, user_ids in to_update.items():
+            CourseParticipant.objects.filter(course=self.course, user_id__in=user_ids).update(role=role)
@@ -0,0 +1,316 @@
+"""
+Search index untuk course, silabus, dan materi.
+
+Setiap Course / CourseSyllabus / CourseMaterial punya satu baris SearchEntry
+(di-update lewat signals, lihat exam/signals.py).
+
+- Postgres : tsvector + GIN index (prefix match) dan trigram similarity
+             pada judul untuk salah ketik.
+- Lainnya  : inverted index in-memory (pure Python) yang dibangun ulang
+             hanya bila isi tabel SearchEntry berubah.
+"""
+import bisect
+import difflib
+import re
+import threading
+from collections import defaultdict
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db import connection
+from django.db.models import Count, F, Max, Q
+
+from .models import Course, CourseMaterial, CourseSyllabus, SearchEntry
+
+
+SEARCH_CONFIG = "simple"
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+# =====================================================================
+# INDEXING
+# =====================================================================
+def entry_fields(instance):
+    """
+    Return (kind, course_id, title, body) untuk instance yang di-index,
+    atau None bila model tidak di-index.
+    """
+    if isinstance(instance, Course):
+        return "course", instance.id, instance.title, instance.description or ""
+
+    if isinstance(instance, CourseSyllabus):
+        body = " ".join(filter(None, [
+            instance.description,
+            instance.category,
+            instance.sub_category,
+            instance.informant,
+        ]))
+        return "syllabus", instance.course_id, instance.title, body
+
+    if isinstance(instance, CourseMaterial):
+        return "material", instance.course_id, instance.title, instance.description or ""
+
+    return None
+
+
+def document_vector():
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("body", weight="B", config=SEARCH_CONFIG)
+    )
+
+
+def index_instance(instance):
+    fields = entry_fields(instance)
+    if fields is None:
+        return None
+
+    kind, course_id, title, body = fields
+    entry, _ = SearchEntry.objects.update_or_create(
+        kind=kind,
+        object_id=instance.pk,
+        defaults={"course_id": course_id, "title": title, "body": body},
+    )
+
+    if connection.vendor == "postgresql":
+        SearchEntry.objects.filter(pk=entry.pk).update(document=document_vector())
+
+    return entry
+
+
+def index_instances(instances):
+    """Index banyak object baru sekaligus (mis. setelah bulk_create)."""
+    entries = []
+    for obj in instances:
+        fields = entry_fields(obj)
+        if fields is None:
+            continue
+        kind, course_id, title, body = fields
+        entries.append(SearchEntry(
+            kind=kind, object_id=obj.pk, course_id=course_id, title=title, body=body
+        ))
+
+    created = SearchEntry.objects.bulk_create(entries, batch_size=1000)
+
+    if created and connection.vendor == "postgresql":
+        SearchEntry.objects.filter(pk__in=[e.pk for e in created]).update(document=document_vector())
+
+    return len(created)
+
+
+def remove_instance(instance):
+    fields = entry_fields(instance)
+    if fields is None:
+        return
+    SearchEntry.objects.filter(kind=fields[0], object_id=instance.pk).delete()
+
+
+def rebuild_index():
+    """Index ulang semua course, silabus, dan materi."""
+    SearchEntry.objects.all().delete()
+
+    entries = []
+    for model in (Course, CourseSyllabus, CourseMaterial):
+        for obj in model.objects.all().iterator():
+            kind, course_id, title, body = entry_fields(obj)
+            entries.append(SearchEntry(
+                kind=kind, object_id=obj.pk, course_id=course_id, title=title, body=body
+            ))
+    SearchEntry.objects.bulk_create(entries, batch_size=1000)
+
+    if connection.vendor == "postgresql":
+        SearchEntry.objects.update(document=document_vector())
+
+    return len(entries)
+
+
+# =====================================================================
+# BACKEND: POSTGRES (tsvector + trigram)
+# =====================================================================
+class PostgresSearchBackend:
+    def search(self, q, kinds=None, limit=DEFAULT_LIMIT):
+        tokens = tokenize(q)
+        if not tokens:
+            return []
+
+        # prefix match per kata → cocok untuk search-as-you-type
+        query = SearchQuery(
+            " & ".join(f"{t}:*" for t in tokens),
+            search_type="raw",
+            config=SEARCH_CONFIG,
+        )
+
+        qs = SearchEntry.objects.filter(Q(document=query) | Q(title__trigram_similar=q))
+        if kinds:
+            qs = qs.filter(kind__in=kinds)
+
+        qs = (
+            qs.annotate(
+                text_rank=SearchRank(F("document"), query),
+                similarity=TrigramSimilarity("title", q),
+            )
+            .order_by(F("text_rank").desc(nulls_last=True), "-similarity", "id")
+            .values("id", "kind", "object_id", "course_id", "title", "body", "text_rank", "similarity")
+        )[:limit]
+
+        return [
+            {
+                "id": row["id"],
+                "kind": row["kind"],
+                "object_id": row["object_id"],
+                "course_id": row["course_id"],
+                "title": row["title"],
+                "body": row["body"],
+                "rank": (row["text_rank"] or 0) + (row["similarity"] or 0),
+            }
+            for row in qs
+        ]
+
+
+# =====================================================================
+# BACKEND: PURE PYTHON INVERTED INDEX (sqlite / dev)
+# =====================================================================
+class InvertedIndexBackend:
+    title_weight = 2.0
+    body_weight = 1.0
+    prefix_factor = 0.8
+    typo_factor = 0.5
+    typo_cutoff = 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._postings = {}
+        self._vocabulary = []
+        self._entries = {}
+
+    def _current_version(self):
+        agg = SearchEntry.objects.aggregate(n=Count("id"), last=Max("updated_at"))
+        return agg["n"], agg["last"]
+
+    def _ensure_fresh(self):
+        version = self._current_version()
+        if version == self._version:
+            return
+
+        with self._lock:
+            if version == self._version:
+                return
+
+            postings = defaultdict(dict)
+            entries = {}
+            rows = SearchEntry.objects.values(
+                "id", "kind", "object_id", "course_id", "title", "body"
+            )
+            for row in rows.iterator():
+                entries[row["id"]] = row
+                for token in tokenize(row["title"]):
+                    postings[token][row["id"]] = postings[token].get(row["id"], 0) + self.title_weight
+                for token in tokenize(row["body"]):
+                    postings[token][row["id"]] = postings[token].get(row["id"], 0) + self.body_weight
+
+            self._postings = dict(postings)
+            self._vocabulary = sorted(self._postings)
+            self._entries = entries
+            self._version = version
+
+    def _expand(self, token):
+        """Term di vocabulary yang cocok: exact, prefix, lalu typo."""
+        terms = []
+        if token in self._postings:
+            terms.append((token, 1.0))
+
+        i = bisect.bisect_left(self._vocabulary, token)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(token):
+            if self._vocabulary[i] != token:
+                terms.append((self._vocabulary[i], self.prefix_factor))
+            i += 1
+
+        if not terms:
+            for term in difflib.get_close_matches(token, self._vocabulary, n=3, cutoff=self.typo_cutoff):
+                terms.append((term, self.typo_factor))
+
+        return terms
+
+    def search(self, q, kinds=None, limit=DEFAULT_LIMIT):
+        tokens = tokenize(q)
+        if not tokens:
+            return []
+
+        self._ensure_fresh()
+
+        scores = None
+        for token in tokens:
+            token_scores = defaultdict(float)
+            for term, factor in self._expand(token):
+                for entry_id, weight in self._postings[term].items():
+                    token_scores[entry_id] = max(token_scores[entry_id], weight * factor)
+
+            # semua kata harus cocok (AND), sama seperti tsquery "a & b"
+            if scores is None:
+                scores = dict(token_scores)
+            else:
+                scores = {eid: s + token_scores[eid] for eid, s in scores.items() if eid in token_scores}
+
+            if not scores:
+                return []
+
+        results = []
+        for entry_id, score in scores.items():
+            row = self._entries[entry_id]
+            if kinds and row["kind"] not in kinds:
+                continue
+            results.append(dict(row, rank=score))
+
+        results.sort(key=lambda r: (-r["rank"], r["id"]))
+        return results[:limit]
+
+
+_inverted_index = InvertedIndexBackend()
+_postgres_backend = PostgresSearchBackend()
+
+
+def get_backend():
+    if connection.vendor == "postgresql":
+        return _postgres_backend
+    return _inverted_index
+
+
+def search(q, kinds=None, limit=DEFAULT_LIMIT):
+    try:
+        limit = int(limit or DEFAULT_LIMIT)
+    except (TypeError, ValueError):
+        limit = DEFAULT_LIMIT
+    limit = max(1, min(limit, MAX_LIMIT))
+    return get_backend().search(q, kinds=kinds, limit=limit)
+
+
+def search_course_ids(q, limit=MAX_LIMIT * 5):
+    """Id course yang cocok (dipakai filter ?search= pada list course)."""
+    return [r["object_id"] for r in get_backend().search(q, kinds=["course"], limit=limit)]
+
+
+def snippet(text, q, width=160):
+    """Potongan teks di sekitar kata pertama yang cocok."""
+    text = text or ""
+    tokens = tokenize(q)
+    lower = text.lower()
+    pos = min((lower.find(t) for t in tokens if lower.find(t) >= 0), default=0)
+    start = max(0, pos - width // 4)
+    cut = text[start:start + width]
+    if start > 0:
+        cut = "…" + cut
+    if start + width < len(text):
+        cut = cut + "…"
+    return cut
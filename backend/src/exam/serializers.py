@@ -23,12 +23,55 @@ from .models import (
     UserAnswerFile
 )
 
+# ============================================================
+# SPARSE FIELDSET (?fields= / ?expand=)
+# ============================================================
+
+def query_param_list(request, name):
+    if not request:
+        return []
+    raw = request.query_params.get(name, "")
+    return [f.strip() for f in raw.split(",") if f.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    - ?fields=id,title      → hanya field yang disebut
+    - ?expand=questions     → field berat di Meta.expandable_fields
+                              hanya ikut bila diminta
+    Hanya berlaku untuk serializer paling luar (nested serializer
+    belum punya context saat __init__).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        if not request or not hasattr(request, "query_params"):
+            return
+
+        expand = set(query_param_list(request, "expand"))
+        for name in getattr(self.Meta, "expandable_fields", []):
+            if name not in expand:
+                self.fields.pop(name, None)
+
+        only = set(query_param_list(request, "fields"))
+        if only:
+            for name in list(self.fields):
+                if name not in only and name not in expand:
+                    self.fields.pop(name)
+
+
+def requested_expand(request):
+    return set(query_param_list(request, "expand"))
+
+
 # ============================================================
 # BASIC SERIALIZERS (COURSE)
 # ============================================================
 
-class CourseSerializer(serializers.ModelSerializer):
-    participants_count = serializers.IntegerField(source='participants.count', read_only=True)
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    participants_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Course
@@ -43,14 +86,22 @@ class CourseSerializer(serializers.ModelSerializer):
             "start_date",
             "end_date",
             "token",        # hanya admin lihat token
+            "evaluation_mode",
             "created_at",
         ]
         read_only_fields = ["id", "participants_count", "created_at"]
 
+    # pakai anotasi dari CourseViewSet.get_queryset bila tersedia
+    def get_participants_count(self, obj):
+        if hasattr(obj, "participants_total"):
+            return obj.participants_total
+        return obj.participants.count()
+
 # ============================================================
 # COURSE PUBLIC SERIALIZER (UNTUK FRONTEND)
 # ============================================================
 from .models import CourseParticipant, CourseRequirementSubmission
+from .permissions import get_course_roles
 
 class CoursePublicSerializer(CourseSerializer):
     joined = serializers.SerializerMethodField()
@@ -71,10 +122,14 @@ class CoursePublicSerializer(CourseSerializer):
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
             return False
-        return CourseParticipant.objects.filter(course=obj, user=request.user).exists()
+        if hasattr(obj, "is_joined"):
+            return obj.is_joined
+        return obj.id in get_course_roles(request)
 
     # apakah course punya requirement template
     def get_requires_approval(self, obj):
+        if hasattr(obj, "has_requirements"):
+            return obj.has_requirements
         return obj.requirements.exists()
 
     # pending / approved / rejected / None
@@ -83,6 +138,9 @@ class CoursePublicSerializer(CourseSerializer):
         if not request or not request.user.is_authenticated:
             return None
 
+        if hasattr(obj, "latest_requirement_status"):
+            return obj.latest_requirement_status
+
         sub = CourseRequirementSubmission.objects.filter(
             course=obj, user=request.user
         ).order_by("-submitted_at").first()
@@ -174,7 +232,7 @@ class QuestionAdminSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class ExamAdminSerializer(serializers.ModelSerializer):
+class ExamAdminSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     questions = QuestionAdminSerializer(many=True, read_only=True)
 
     class Meta:
@@ -194,6 +252,7 @@ class ExamAdminSerializer(serializers.ModelSerializer):
             "random_question_count",
             "attempt_limit",
             "passing_grade",
+            "is_mandatory",
             "is_active",
             "created_at",
             "questions",
@@ -271,7 +330,7 @@ class QuestionCreateUpdateSerializer(serializers.ModelSerializer):
         return super().validate(attrs)
 
 
-class ExamPublicSerializer(serializers.ModelSerializer):
+class ExamPublicSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     questions = QuestionPublicSerializer(many=True, read_only=True)
     user_attempt = serializers.SerializerMethodField()
 
@@ -298,6 +357,43 @@ class ExamPublicSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
+# ---------- SUMMARY (LIST / LANDING PAGE) ----------
+class ExamSummarySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Ringkasan exam tanpa soal. Angka-angka dibaca dari anotasi
+    (lihat exam_summary_queryset di views.py); soal hanya ikut
+    dengan ?expand=questions.
+    """
+    question_count = serializers.IntegerField(read_only=True)
+    total_points = serializers.FloatField(read_only=True)
+    attempts_used = serializers.IntegerField(read_only=True)
+    user_attempt = serializers.IntegerField(read_only=True)
+    questions = QuestionPublicSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Exam
+        fields = [
+            "id",
+            "course",
+            "title",
+            "description",
+            "is_private",
+            "duration_minutes",
+            "start_time",
+            "end_time",
+            "is_active",
+            "attempt_limit",
+            "passing_grade",
+            "question_count",
+            "total_points",
+            "attempts_used",
+            "user_attempt",
+            "questions",
+        ]
+        read_only_fields = fields
+        expandable_fields = ["questions"]
+
+
 # ============================================================
 # USER EXAM + USER ANSWER
 # ============================================================
@@ -328,6 +424,29 @@ class UserAnswerSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "score", "graded"]
 
 
+class GradingAnswerSerializer(serializers.ModelSerializer):
+    """Item antrian penilaian manual (lihat exam/grading.py)."""
+    user_id = serializers.IntegerField(source="user_exam.user_id", read_only=True)
+    user = serializers.CharField(source="user_exam.user.username", read_only=True)
+    attempt_number = serializers.IntegerField(source="user_exam.attempt_number", read_only=True)
+    question_text = serializers.CharField(source="question.text", read_only=True)
+    question_type = serializers.CharField(source="question.question_type", read_only=True)
+    points = serializers.FloatField(source="question.points", read_only=True)
+    claimed_by = serializers.SerializerMethodField()
+    files = UserAnswerFileSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = UserAnswer
+        fields = (
+            "id", "user_exam", "user_id", "user", "attempt_number",
+            "question", "question_text", "question_type", "points",
+            "text_answer", "files", "score", "graded", "claimed_by", "claimed_at",
+        )
+
+    def get_claimed_by(self, obj):
+        return obj.claimed_by.username if obj.claimed_by else None
+
+
 class UserExamSerializer(serializers.ModelSerializer):
     answers = UserAnswerSerializer(many=True, read_only=True)
     exam_title = serializers.CharField(source="exam.title", read_only=True)
@@ -514,6 +633,82 @@ class ChoiceCreateUpdateSerializer(serializers.ModelSerializer):
         ]
 
 
+# ============================================================
+# QUESTION BANK (import / export)
+# parent_question / parent_choice memakai key lokal dokumen, bukan id DB
+# ============================================================
+
+class QuestionBankChoiceSerializer(ChoiceCreateUpdateSerializer):
+    key = serializers.CharField(max_length=100)
+
+    class Meta(ChoiceCreateUpdateSerializer.Meta):
+        fields = ["key"] + ChoiceCreateUpdateSerializer.Meta.fields
+
+
+class QuestionBankQuestionSerializer(serializers.ModelSerializer):
+    key = serializers.CharField(max_length=100)
+    parent_question = serializers.CharField(max_length=100, required=False, allow_null=True, allow_blank=True)
+    parent_choice = serializers.CharField(max_length=100, required=False, allow_null=True, allow_blank=True)
+    choices = QuestionBankChoiceSerializer(many=True, required=False)
+
+    class Meta:
+        model = Question
+        fields = [
+            "key",
+            "text",
+            "question_type",
+            "required",
+            "order",
+            "points",
+            "weight",
+            "allow_multiple_files",
+            "allow_blank_answer",
+            "parent_question",
+            "parent_choice",
+            "choices",
+        ]
+
+
+class QuestionBankSerializer(serializers.Serializer):
+    questions = QuestionBankQuestionSerializer(many=True)
+    replace = serializers.BooleanField(required=False, default=False)
+
+    def validate_questions(self, questions):
+        question_keys = {}
+        choice_owner = {}
+
+        for q in questions:
+            if q["key"] in question_keys:
+                raise serializers.ValidationError(f"Key soal '{q['key']}' duplikat.")
+            question_keys[q["key"]] = q
+
+            for c in q.get("choices", []):
+                if c["key"] in choice_owner:
+                    raise serializers.ValidationError(f"Key pilihan '{c['key']}' duplikat.")
+                choice_owner[c["key"]] = q["key"]
+
+        for q in questions:
+            parent = q.get("parent_question") or None
+            parent_choice = q.get("parent_choice") or None
+
+            if parent_choice and not parent:
+                raise serializers.ValidationError(f"Soal '{q['key']}': parent_choice diberikan tanpa parent_question.")
+            if parent and parent not in question_keys:
+                raise serializers.ValidationError(f"Soal '{q['key']}': parent_question '{parent}' tidak ditemukan.")
+            if parent_choice and choice_owner.get(parent_choice) != parent:
+                raise serializers.ValidationError(f"Soal '{q['key']}': parent_choice harus milik parent_question yang sama.")
+
+            # percabangan tidak boleh melingkar
+            seen = {q["key"]}
+            while parent:
+                if parent in seen:
+                    raise serializers.ValidationError(f"Soal '{q['key']}': percabangan melingkar.")
+                seen.add(parent)
+                parent = question_keys[parent].get("parent_question") or None
+
+        return questions
+
+
 class ExamResultSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source="user.username", read_only=True)
     user_email = serializers.EmailField(source="user.email", read_only=True)
@@ -641,6 +836,24 @@ class CourseRequirementSubmissionSerializer(serializers.ModelSerializer):
         return submission
 
 
+# Review (admin): user & reviewer dari select_related, answers dari prefetch
+class CourseRequirementReviewSerializer(serializers.ModelSerializer):
+    user = serializers.CharField(source="user.username", read_only=True)
+    user_email = serializers.EmailField(source="user.email", read_only=True)
+    reviewer = serializers.SerializerMethodField()
+    answers = CourseRequirementAnswerSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = CourseRequirementSubmission
+        fields = (
+            "id", "user_id", "user", "user_email", "status", "submitted_at",
+            "reviewed_at", "reviewer", "note", "answers",
+        )
+
+    def get_reviewer(self, obj):
+        return obj.reviewer.username if obj.reviewer else None
+
+
 # Criteria serializer
 class CourseAssessmentCriteriaSerializer(serializers.ModelSerializer):
     class Meta:
@@ -675,8 +888,9 @@ class CourseAssessmentCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         answers_data = validated_data.pop("answers", [])
         assessment = CourseAssessment.objects.create(**validated_data)
-        for a in answers_data:
-            CourseAssessmentAnswer.objects.create(assessment=assessment, **a)
+        CourseAssessmentAnswer.objects.bulk_create(
+            [CourseAssessmentAnswer(assessment=assessment, **a) for a in answers_data]
+        )
         assessment.recalc_total()
         return assessment
 
@@ -688,7 +902,8 @@ class CourseAssessmentCreateSerializer(serializers.ModelSerializer):
         if answers_data is not None:
             # simple approach: delete old answers and recreate
             instance.answers.all().delete()
-            for a in answers_data:
-                CourseAssessmentAnswer.objects.create(assessment=instance, **a)
+            CourseAssessmentAnswer.objects.bulk_create(
+                [CourseAssessmentAnswer(assessment=instance, **a) for a in answers_data]
+            )
         instance.recalc_total()
         return instance
\ No newline at end of file
@@ -0,0 +1,107 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    Course,
+    CourseParticipant,
+    CourseSyllabus,
+    CourseMaterial,
+    CourseTask,
+    CourseRequirementTemplate,
+    CourseAssessmentCriteria,
+    CourseAssessment,
+    Exam,
+    Question,
+    UserExam,
+)
+from . import search
+from .caching import bump_course_results, bump_course_roster, bump_course_version
+
+
+# =====================================================================
+# SEARCH INDEX — sinkron dengan Course / Silabus / Materi
+# =====================================================================
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=CourseSyllabus)
+@receiver(post_save, sender=CourseMaterial)
+def update_search_entry(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_instance(instance)
+
+
+@receiver(post_delete, sender=CourseSyllabus)
+@receiver(post_delete, sender=CourseMaterial)
+def delete_search_entry(sender, instance, **kwargs):
+    # entry milik Course ikut terhapus lewat FK (CASCADE)
+    search.remove_instance(instance)
+
+
+# =====================================================================
+# VERSI KONTEN COURSE — untuk ETag / cache
+# =====================================================================
+COURSE_CONTENT_MODELS = (
+    CourseSyllabus,
+    CourseMaterial,
+    CourseTask,
+    CourseRequirementTemplate,
+    CourseAssessmentCriteria,
+    Exam,
+)
+
+
+@receiver(post_save, sender=Course)
+def bump_course_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_course_version(instance.pk)
+
+
+def bump_course_content(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_course_version(instance.course_id)
+
+
+for model in COURSE_CONTENT_MODELS:
+    post_save.connect(bump_course_content, sender=model, dispatch_uid=f"course_version_save_{model.__name__}")
+    post_delete.connect(bump_course_content, sender=model, dispatch_uid=f"course_version_delete_{model.__name__}")
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def bump_course_on_question(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    course_id = Exam.objects.filter(pk=instance.exam_id).values_list("course_id", flat=True).first()
+    bump_course_version(course_id)
+
+
+# =====================================================================
+# VERSI ROSTER COURSE — join / approval / role (ETag bundle)
+# =====================================================================
+@receiver(post_save, sender=CourseParticipant)
+@receiver(post_delete, sender=CourseParticipant)
+def bump_course_on_participant(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_course_roster(instance.course_id)
+
+
+# =====================================================================
+# VERSI HASIL COURSE — untuk cache evaluasi
+# =====================================================================
+@receiver(post_save, sender=UserExam)
+@receiver(post_delete, sender=UserExam)
+def bump_results_on_attempt(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_course_results(exams__id=instance.exam_id)
+
+
+@receiver(post_save, sender=CourseAssessment)
+@receiver(post_delete, sender=CourseAssessment)
+def bump_results_on_assessment(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_course_results(pk=instance.course_id)
@@ -1,17 +1,42 @@
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
-from django.db.models import Q
+from django.db import connection, transaction
+from django.db.models import Prefetch, Q, Count, Sum, Exists, OuterRef, Subquery, Value, BooleanField, CharField, IntegerField, FloatField
+from django.db.models.functions import Coalesce
 
 
-from rest_framework import viewsets, status, permissions as drf_permissions,filters
+from rest_framework import viewsets, status, permissions as drf_permissions
 from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+import json
 import openpyxl
 from openpyxl.utils import get_column_letter
+
+from core.pagination import PaginatedActionMixin
+from cv.batch import BatchJob
 from .permissions import IsAdmin
+from .filters import IndexedSearchFilter
+from . import search as search_index
+from . import gradebook as course_gradebook
+from .requirements import get_requirement_schema
+from .assessment import save_assessment_matrix, validate_matrix as validate_assessment_matrix
+from .certificates import KINDS as CERTIFICATE_KINDS, existing_document as existing_certificate
+from .cloning import clone_course, clone_exam
+from .evaluation import ATTEMPT_STRATEGIES, cached_course_evaluation, evaluate_course
+from .grading import apply_grades, claim_answers, manual_answer_queryset, parse_grades, release_answers
+from .question_bank import (
+    QuestionBankConflictError,
+    QuestionBankFormatError,
+    bank_to_workbook,
+    export_bank,
+    import_bank,
+    workbook_to_bank,
+)
+from .roster import RosterFormatError, RosterImporter, VALID_ROLES, iter_roster_rows
+from .caching import CourseContentCacheMixin, bump_course_roster, course_version_stamp, make_etag, not_modified
 # ============================
 # IMPORT MODELS
 # ============================
@@ -52,13 +77,17 @@ from .serializers import (
 
     ExamAdminSerializer,
     ExamPublicSerializer,
+    ExamSummarySerializer,
     ExamResultSerializer,
+    GradingAnswerSerializer,
+    requested_expand,
 
     QuestionCreateUpdateSerializer,
     QuestionPublicSerializer,
 
     SubmitAnswerSerializer,
     QuestionAdminSerializer,
+    QuestionBankSerializer,
 
     CourseTaskSerializer,
     CourseTaskSubmissionSerializer,
@@ -68,6 +97,7 @@ from .serializers import (
     CourseRequirementTemplateSerializer,
     CourseRequirementSubmissionSerializer,
     CourseRequirementAnswerSerializer,
+    CourseRequirementReviewSerializer,
     CourseRequirementSubmission,
     CourseRequirementTemplate,  
 
@@ -85,30 +115,236 @@ from .permissions import (
     IsAssessor,
     IsTrainerOrAssessor,
     IsCourseParticipant,
-    IsExamParticipant,
     IsExamInstructorOrAssessor,
     IsTaskSubmissionOwner,
     IsTaskGrader,
     IsTrainerOrAdmin,
     IsExamCreator,
+    CachedObjectMixin,
     user_role_in_course,
+    forget_course_roles,
 )
 
 
+# ================================================================
+# HELPER: EXAM SUMMARY (dipakai list exam & landing page)
+# ================================================================
+def exam_summary_queryset(qs, request):
+    """
+    Anotasi untuk ExamSummarySerializer: jumlah soal, total poin,
+    attempt yang sudah dipakai user dan attempt terakhir user.
+    Semua lewat subquery sehingga list exam tetap satu query.
+    """
+    questions = Question.objects.filter(exam=OuterRef("pk")).order_by().values("exam")
+
+    qs = qs.annotate(
+        question_count=Coalesce(
+            Subquery(questions.annotate(c=Count("id")).values("c")),
+            Value(0), output_field=IntegerField(),
+        ),
+        total_points=Coalesce(
+            Subquery(questions.annotate(p=Sum("points")).values("p")),
+            Value(0.0), output_field=FloatField(),
+        ),
+    )
+
+    user = request.user
+    if not user.is_authenticated:
+        qs = qs.annotate(
+            attempts_used=Value(0, output_field=IntegerField()),
+            user_attempt=Value(None, output_field=IntegerField()),
+        )
+    else:
+        attempts = UserExam.objects.filter(exam=OuterRef("pk"), user=user).order_by()
+        qs = qs.annotate(
+            attempts_used=Coalesce(
+                Subquery(attempts.values("exam").annotate(c=Count("id")).values("c")),
+                Value(0), output_field=IntegerField(),
+            ),
+            user_attempt=Subquery(attempts.order_by("-attempt_number").values("id")[:1]),
+        )
+
+    if "questions" in requested_expand(request):
+        qs = qs.prefetch_related("questions__choices", "questions__child_questions")
+
+    return qs
+
+
+# ================================================================
+# HELPER: RESPONSE XLSX
+# ================================================================
+def workbook_response(wb, filename):
+    resp = HttpResponse(
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    resp["Content-Disposition"] = f"attachment; filename={filename}"
+    wb.save(resp)
+    return resp
+
+
+# ================================================================
+# HELPER: REVIEW PERSYARATAN
+# ================================================================
+def review_queryset(qs):
+    return qs.select_related("user", "reviewer").prefetch_related(
+        Prefetch("answers", queryset=CourseRequirementAnswer.objects.order_by("requirement__order", "id"))
+    )
+
+
+def latest_submission_per_user(qs):
+    """
+    Hanya submission terbaru tiap user (pengajuan ulang lama diabaikan).
+    Postgres: DISTINCT ON (user_id); DB lain: NOT EXISTS submission yang lebih baru.
+    """
+    if connection.vendor == "postgresql":
+        latest_ids = (
+            qs.order_by("user_id", "-submitted_at", "-id")
+              .distinct("user_id")
+              .values("id")
+        )
+        return qs.filter(id__in=latest_ids)
+
+    newer = CourseRequirementSubmission.objects.filter(
+        course_id=OuterRef("course_id"),
+        user_id=OuterRef("user_id"),
+    ).filter(
+        Q(submitted_at__gt=OuterRef("submitted_at"))
+        | Q(submitted_at=OuterRef("submitted_at"), id__gt=OuterRef("id"))
+    )
+    return qs.filter(~Exists(newer))
+
+
 # ================================================================
 # ⚡  COURSE VIEWSET
 # ================================================================
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(CachedObjectMixin, CourseContentCacheMixin, PaginatedActionMixin, viewsets.ModelViewSet):
     queryset = Course.objects.all().order_by("-created_at")
     serializer_class = CourseSerializer
     permission_classes = [drf_permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["title", "description"]
+    filter_backends = [IndexedSearchFilter]
 
     def get_permissions(self):
         if self.action in ["create", "update", "partial_update", "destroy"]:
             return [IsTrainerOrAdmin()]
-        return [drf_permissions.IsAuthenticated()]
+        # permission_classes dari @action(...) (default: IsAuthenticated)
+        return super().get_permissions()
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+
+        if self.action not in ["list", "retrieve", "bundle"]:
+            return qs
+
+        # Semua field turunan CoursePublicSerializer dihitung di SQL,
+        # sehingga list course tidak lagi 4 query per baris.
+        qs = qs.annotate(
+            participants_total=Count("participants", distinct=True),
+            has_requirements=Exists(
+                CourseRequirementTemplate.objects.filter(course=OuterRef("pk"))
+            ),
+        )
+
+        user = self.request.user
+        if not user.is_authenticated:
+            return qs.annotate(
+                is_joined=Value(False, output_field=BooleanField()),
+                latest_requirement_status=Value(None, output_field=CharField()),
+            )
+
+        latest_requirement = (
+            CourseRequirementSubmission.objects
+                .filter(course=OuterRef("pk"), user=user)
+                .order_by("-submitted_at")
+        )
+        qs = qs.annotate(
+            is_joined=Exists(
+                CourseParticipant.objects.filter(course=OuterRef("pk"), user=user)
+            ),
+            latest_requirement_status=Subquery(latest_requirement.values("status")[:1]),
+        )
+
+        if self.action == "bundle":
+            # bagian per-user dari ETag bundle
+            qs = qs.annotate(
+                latest_requirement_id=Subquery(latest_requirement.values("id")[:1]),
+                latest_requirement_reviewed_at=Subquery(latest_requirement.values("reviewed_at")[:1]),
+                latest_attempt_id=Subquery(
+                    UserExam.objects
+                        .filter(exam__course=OuterRef("pk"), user=user)
+                        .order_by("-id")
+                        .values("id")[:1]
+                ),
+            )
+
+        return qs
+
+    # =====================================================================
+    # SEARCH — course, silabus, materi (ranked)
+    # =====================================================================
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        q = request.query_params.get("q", "").strip()
+        if not q:
+            return Response({"query": q, "results": []})
+
+        kinds = [k for k in request.query_params.get("kind", "").split(",") if k]
+        results = search_index.search(q, kinds=kinds or None, limit=request.query_params.get("limit"))
+
+        return Response({
+            "query": q,
+            "results": [
+                {
+                    "kind": r["kind"],
+                    "id": r["object_id"],
+                    "course": r["course_id"],
+                    "title": r["title"],
+                    "snippet": search_index.snippet(r["body"], q),
+                    "rank": round(r["rank"], 4),
+                }
+                for r in results
+            ]
+        })
+
+    # =====================================================================
+    # BUNDLE — semua data halaman detail course dalam satu response
+    # =====================================================================
+    @action(detail=True, methods=["get"], url_path="bundle")
+    def bundle(self, request, pk=None):
+        course = self.get_object()
+
+        # versi konten + roster course (jumlah peserta) + state milik user
+        # (join, persyaratan, attempt)
+        etag = make_etag(
+            course_version_stamp(course),
+            course.roster_version,
+            request.user.pk,
+            request.user.is_staff,
+            getattr(course, "is_joined", None),
+            getattr(course, "latest_requirement_id", None),
+            getattr(course, "latest_requirement_status", None),
+            getattr(course, "latest_requirement_reviewed_at", None),
+            getattr(course, "latest_attempt_id", None),
+            request.META.get("QUERY_STRING", ""),
+        )
+        cache_control = "private, no-cache"
+
+        response = not_modified(request, etag)
+        if response is None:
+            context = {"request": request}
+            exams = exam_summary_queryset(course.exams.all().order_by("-created_at"), request)
+
+            response = Response({
+                "course": CoursePublicSerializer(course, context=context).data,
+                "requirements": self.requirements_payload(course, request.user),
+                "syllabus": CourseSyllabusSerializer(course.syllabus.all().order_by("id"), many=True).data,
+                "materials": CourseMaterialSerializer(course.materials.all().order_by("id"), many=True).data,
+                "tasks": CourseTaskSerializer(course.tasks.all().order_by("-created_at"), many=True).data,
+                "exams": ExamSummarySerializer(exams, many=True, context=context).data,
+            })
+
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        return response
 
     # =====================================================================
     # JOIN COURSE
@@ -139,6 +375,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         if not created:
             return Response({"detail": "Anda sudah terdaftar."}, status=400)
 
+        forget_course_roles(request)
         return Response({"detail": "Berhasil join.", "participant_id": cp.id})
 
     # =====================================================================
@@ -147,8 +384,8 @@ class CourseViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["get"], url_path="participants")
     def participants(self, request, pk=None):
         course = self.get_object()
-        qs = CourseParticipant.objects.filter(course=course)
-        return Response(CourseParticipantSerializer(qs, many=True).data)
+        qs = CourseParticipant.objects.filter(course=course).select_related("user")
+        return self.paginated_response(qs, CourseParticipantSerializer)
 
     # =====================================================================
     # ASSIGN ROLE
@@ -157,7 +394,7 @@ class CourseViewSet(viewsets.ModelViewSet):
     def assign_role(self, request, pk=None):
         course = self.get_object()
 
-        if not (request.user.is_staff or user_role_in_course(request.user, course.id, ["trainer"])):
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
         ser = AssignRoleSerializer(data=request.data)
@@ -173,19 +410,206 @@ class CourseViewSet(viewsets.ModelViewSet):
         return Response({"detail": "Role diperbarui."})
 
     # =====================================================================
-    # REQUIREMENTS — LIST TEMPLATE + USER SUBMISSION
+    # CLONE COURSE (silabus, materi, tugas, persyaratan, kriteria, exam)
     # =====================================================================
-    @action(detail=True, methods=["get"], url_path="requirements")
-    def list_requirements(self, request, pk=None):
+    @action(detail=True, methods=["post"], url_path="clone")
+    def clone(self, request, pk=None):
+        course = self.get_object()
+
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        include_exams = str(request.data.get("include_exams", "true")).lower() not in ("0", "false", "no", "off")
+        new_course, counts = clone_course(
+            course,
+            title=request.data.get("title"),
+            include_exams=include_exams,
+        )
+
+        # pembuat salinan otomatis jadi trainer di course baru
+        if not request.user.is_staff:
+            CourseParticipant.objects.create(course=new_course, user=request.user, role="trainer")
+            forget_course_roles(request)
+
+        return Response({
+            "detail": "Course berhasil disalin.",
+            "course_id": new_course.id,
+            "copied": counts,
+        }, status=201)
+
+    # =====================================================================
+    # GRADEBOOK (peserta × exam × tugas × assessment)
+    # ?type=csv / ?type=xlsx → file; default JSON ber-pagination
+    # =====================================================================
+    @action(detail=True, methods=["get"], url_path="gradebook")
+    def gradebook(self, request, pk=None):
+        course = self.get_object()
+
+        if not (request.user.is_staff
+                or user_role_in_course(request, course.id, ["trainer", "assessor"])):
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        export_type = request.query_params.get("type")
+
+        if export_type == "csv":
+            resp = StreamingHttpResponse(course_gradebook.iter_csv(course), content_type="text/csv")
+            resp["Content-Disposition"] = f"attachment; filename=course_{course.id}_gradebook.csv"
+            return resp
+
+        if export_type == "xlsx":
+            return FileResponse(
+                course_gradebook.write_xlsx(course),
+                as_attachment=True,
+                filename=f"course_{course.id}_gradebook.xlsx",
+                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+
+        participants = course_gradebook.participant_queryset(course)
+        page = self.paginate_queryset(participants)
+        rows = course_gradebook.gradebook_rows(course, page if page is not None else list(participants))
+        columns = course_gradebook.gradebook_columns(course)
+
+        if page is not None:
+            response = self.get_paginated_response(rows)
+            response.data["columns"] = columns
+            return response
+        return Response({"columns": columns, "results": rows})
+
+    # =====================================================================
+    # SERTIFIKAT & TRANSKRIP (lihat exam/certificates.py)
+    # generate berjalan di proses terpisah (manage.py generate_certificates),
+    # endpoint hanya membuat job, membaca progress, dan menyajikan file
+    # =====================================================================
+    @action(detail=True, methods=["post"], url_path="certificates/generate")
+    def generate_certificates(self, request, pk=None):
         course = self.get_object()
 
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        kinds = request.data.get("kinds") or list(CERTIFICATE_KINDS)
+        if not isinstance(kinds, list) or any(k not in CERTIFICATE_KINDS for k in kinds):
+            return Response({"detail": f"kinds harus berisi: {', '.join(CERTIFICATE_KINDS)}."}, status=400)
+
+        job = BatchJob.create({"course": course.id, "kinds": kinds}, requested_by=request.user.id)
+        args = ["--course", course.id]
+        for kind in kinds:
+            args += ["--kind", kind]
+        job.start("generate_certificates", *args)
+
+        return Response(job.read_status(), status=202)
+
+    def certificate_job(self, request, course, job_id):
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
+            return None, Response({"detail": "Tidak diizinkan."}, status=403)
+
+        try:
+            job = BatchJob(job_id)
+        except ValueError:
+            return None, Response({"detail": "Job tidak ditemukan."}, status=404)
+        status_data = job.read_status()
+        if status_data is None or status_data.get("params", {}).get("course") != course.id:
+            return None, Response({"detail": "Job tidak ditemukan."}, status=404)
+        return job, status_data
+
+    @action(detail=True, methods=["get"], url_path=r"certificates/jobs/(?P<job_id>[0-9a-f-]{36})")
+    def certificate_job_status(self, request, pk=None, job_id=None):
+        job, result = self.certificate_job(request, self.get_object(), job_id)
+        return result if job is None else Response(result)
+
+    @action(detail=True, methods=["get"], url_path=r"certificates/jobs/(?P<job_id>[0-9a-f-]{36})/download")
+    def certificate_job_download(self, request, pk=None, job_id=None):
+        course = self.get_object()
+        job, result = self.certificate_job(request, course, job_id)
+        if job is None:
+            return result
+        if result["state"] != "done" or not job.zip_path.exists():
+            return Response({"detail": "Job belum selesai.", "state": result["state"]}, status=409)
+
+        return FileResponse(
+            open(job.zip_path, "rb"),
+            as_attachment=True,
+            filename=f"course_{course.id}_certificates.zip",
+            content_type="application/zip",
+        )
+
+    @action(detail=True, methods=["get"], url_path=r"certificates/(?P<user_id>[0-9]+)")
+    def participant_certificate(self, request, pk=None, user_id=None):
+        """?kind=certificate (default) / transcript"""
+        course = self.get_object()
+        user_id = int(user_id)
+
+        if not (request.user.id == user_id
+                or request.user.is_staff
+                or user_role_in_course(request, course.id, ["trainer", "assessor"])):
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        kind = request.query_params.get("kind", "certificate")
+        if kind not in CERTIFICATE_KINDS:
+            return Response({"detail": "kind tidak valid."}, status=400)
+
+        path, filename = existing_certificate(course, user_id, kind)
+        if path is None:
+            return Response({"detail": "Dokumen belum tersedia. Generate ulang sertifikat course."}, status=404)
+
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=filename, content_type="application/pdf")
+
+    # =====================================================================
+    # IMPORT ROSTER PESERTA (CSV / XLSX)
+    # =====================================================================
+    @action(detail=True, methods=["post"], url_path="participants/import")
+    def import_participants(self, request, pk=None):
+        course = self.get_object()
+
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response({"detail": "File roster wajib diunggah."}, status=400)
+
+        default_role = request.data.get("default_role") or "participant"
+        if default_role not in VALID_ROLES:
+            return Response({"detail": "default_role tidak valid."}, status=400)
+
+        flag = lambda name: str(request.data.get(name, "")).lower() in ("1", "true", "yes", "on")
+        importer = RosterImporter(
+            course,
+            default_role=default_role,
+            create_missing=flag("create_missing") and request.user.is_staff,
+        )
+
+        try:
+            with transaction.atomic():
+                report = importer.run(iter_roster_rows(upload))
+                if flag("dry_run"):
+                    transaction.set_rollback(True)
+        except RosterFormatError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        if not flag("dry_run"):
+            # bulk_create / update tidak memicu signal
+            bump_course_roster(course.id)
+            forget_course_roles(request)
+
+        return Response({
+            "detail": "Import roster selesai.",
+            "dry_run": flag("dry_run"),
+            "summary": {key: len(rows) for key, rows in report.items()},
+            **report,
+        })
+
+    # =====================================================================
+    # REQUIREMENTS — LIST TEMPLATE + USER SUBMISSION
+    # =====================================================================
+    def requirements_payload(self, course, user):
         templates = CourseRequirementTemplate.objects.filter(course=course).order_by("order")
         temp_ser = CourseRequirementTemplateSerializer(templates, many=True).data
 
         # get latest submission per user
         latest = CourseRequirementSubmission.objects.filter(
             course=course,
-            user=request.user
+            user=user
         ).order_by("-submitted_at").first()
 
         submission_data = None
@@ -197,15 +621,29 @@ class CourseViewSet(viewsets.ModelViewSet):
                 "status": latest.status,
                 "submitted_at": latest.submitted_at,
                 "reviewed_at": latest.reviewed_at,
-                "reviewer": latest.reviewer.id if latest.reviewer else None,
+                "reviewer": latest.reviewer_id,
                 "note": latest.note,
                 "answers": CourseRequirementAnswerSerializer(answers, many=True).data
             }
 
-        return Response({
+        return {
             "templates": temp_ser,
             "user_submission": submission_data
-        })
+        }
+
+    @action(detail=True, methods=["get"], url_path="requirements")
+    def list_requirements(self, request, pk=None):
+        course = self.get_object()
+        return Response(self.requirements_payload(course, request.user))
+
+    # template saja (tanpa submission user) → bisa di-cache bersama
+    @action(detail=True, methods=["get"], url_path="requirements/templates")
+    def list_requirement_templates(self, request, pk=None):
+        course = self.get_object()
+        templates = CourseRequirementTemplate.objects.filter(course=course).order_by("order")
+        return self.course_content_response(
+            request, course, lambda: CourseRequirementTemplateSerializer(templates, many=True).data
+        )
 
     # =====================================================================
     # SUBMIT REQUIREMENTS  (file upload supported)
@@ -214,7 +652,8 @@ class CourseViewSet(viewsets.ModelViewSet):
     def submit_requirements(self, request, pk=None):
         course = self.get_object()
 
-        if not course.requirements.exists():
+        schema = get_requirement_schema(course)
+        if not schema:
             return Response({"detail": "Course ini tidak memiliki persyaratan."}, status=400)
 
         import json
@@ -241,30 +680,23 @@ class CourseViewSet(viewsets.ModelViewSet):
         if not answers_list:
             return Response({"detail": "Tidak ada jawaban dikirim."}, status=400)
 
-        # create submission
-        submission = CourseRequirementSubmission.objects.create(
-            course=course,
-            user=request.user,
-            status="pending"
-        )
+        cleaned, errors = schema.validate(answers_list)
+        if errors:
+            return Response({"detail": "Persyaratan tidak valid.", "errors": errors}, status=400)
 
-        created_ids = []
-        for ans in answers_list:
-            req = CourseRequirementTemplate.objects.filter(
-                id=ans.get("requirement"),
-                course=course
-            ).first()
-            if not req:
-                continue
-
-            obj = CourseRequirementAnswer.objects.create(
-                submission=submission,
-                requirement=req,
-                value_text=ans.get("value_text"),
-                value_number=ans.get("value_number"),
-                value_file=ans.get("value_file", None)
+        # submission + semua jawaban dalam satu transaksi
+        with transaction.atomic():
+            submission = CourseRequirementSubmission.objects.create(
+                course=course,
+                user=request.user,
+                status="pending"
             )
-            created_ids.append(obj.id)
+            answers = CourseRequirementAnswer.objects.bulk_create([
+                CourseRequirementAnswer(submission=submission, **row)
+                for row in cleaned
+            ])
+
+        created_ids = [a.id for a in answers]
 
         return Response({
             "detail": "Persyaratan berhasil diajukan.",
@@ -282,22 +714,166 @@ class CourseViewSet(viewsets.ModelViewSet):
         if not request.user.is_staff:
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
-        subs = CourseRequirementSubmission.objects.filter(course=course).order_by("-submitted_at")
-
-        data = []
-        for s in subs:
-            answers = CourseRequirementAnswer.objects.filter(submission=s)
-            data.append({
-                "id": s.id,
-                "user": s.user.username,
-                "status": s.status,
-                "submitted_at": s.submitted_at,
-                "reviewed_at": s.reviewed_at,
-                "reviewer": s.reviewer.username if s.reviewer else None,
-                "answers": CourseRequirementAnswerSerializer(answers, many=True).data
-            })
+        subs = review_queryset(
+            CourseRequirementSubmission.objects.filter(course=course)
+        ).order_by("-submitted_at")
+        return self.paginated_response(subs, CourseRequirementReviewSerializer)
+
+    # =====================================================================
+    # REQUIREMENTS — REVIEW QUEUE (submission terakhir per user)
+    # =====================================================================
+    @action(detail=True, methods=["get"], url_path="submissions/queue")
+    def submission_queue(self, request, pk=None):
+        course = self.get_object()
+
+        if not request.user.is_staff:
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        subs = latest_submission_per_user(
+            CourseRequirementSubmission.objects.filter(course=course)
+        )
 
-        return Response(data)
+        status_filter = request.query_params.get("status")
+        if status_filter:
+            subs = subs.filter(status__in=status_filter.split(","))
+
+        subs = review_queryset(subs).order_by("-submitted_at")
+        return self.paginated_response(subs, CourseRequirementReviewSerializer)
+
+    # =====================================================================
+    # REQUIREMENTS — WORK QUEUE (claim → bulk approve / reject)
+    # beberapa admin bisa review bersamaan tanpa saling bentrok:
+    # baris yang sedang di-lock admin lain dilewati (SKIP LOCKED)
+    # =====================================================================
+    @action(detail=True, methods=["post"], url_path="submissions/claim")
+    def claim_submissions(self, request, pk=None):
+        course = self.get_object()
+
+        if not request.user.is_staff:
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        try:
+            limit = max(1, min(int(request.data.get("limit", 10)), 100))
+        except (TypeError, ValueError):
+            return Response({"detail": "limit harus berupa angka."}, status=400)
+
+        now = timezone.now()
+        expired = now - CourseRequirementSubmission.CLAIM_LEASE
+
+        with transaction.atomic():
+            ids = list(
+                CourseRequirementSubmission.objects
+                    .select_for_update(skip_locked=True)
+                    .filter(course=course, status="pending")
+                    .filter(
+                        Q(claimed_by__isnull=True)
+                        | Q(claimed_at__lt=expired)
+                        | Q(claimed_by=request.user)
+                    )
+                    .order_by("submitted_at", "id")
+                    .values_list("id", flat=True)[:limit]
+            )
+            CourseRequirementSubmission.objects.filter(id__in=ids).update(
+                claimed_by=request.user,
+                claimed_at=now,
+            )
+
+        subs = review_queryset(
+            CourseRequirementSubmission.objects.filter(id__in=ids)
+        ).order_by("submitted_at", "id")
+
+        return Response({
+            "lease_expires_at": now + CourseRequirementSubmission.CLAIM_LEASE,
+            "results": CourseRequirementReviewSerializer(subs, many=True).data,
+        })
+
+    @action(detail=True, methods=["post"], url_path="submissions/bulk-review")
+    def bulk_review_submissions(self, request, pk=None):
+        course = self.get_object()
+
+        if not request.user.is_staff:
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        decision = request.data.get("action")
+        if decision not in ("approve", "reject"):
+            return Response({"detail": "action harus 'approve' atau 'reject'."}, status=400)
+
+        ids = request.data.get("ids") or []
+        if not isinstance(ids, list) or not ids:
+            return Response({"detail": "ids wajib diisi."}, status=400)
+        try:
+            ids = [int(i) for i in ids]
+        except (TypeError, ValueError):
+            return Response({"detail": "ids harus berupa angka."}, status=400)
+
+        now = timezone.now()
+        expired = now - CourseRequirementSubmission.CLAIM_LEASE
+
+        with transaction.atomic():
+            # hanya yang masih di-claim oleh admin ini (lease belum habis)
+            claimed = (
+                CourseRequirementSubmission.objects
+                    .select_for_update()
+                    .filter(
+                        course=course,
+                        id__in=ids,
+                        status="pending",
+                        claimed_by=request.user,
+                        claimed_at__gte=expired,
+                    )
+            )
+            rows = list(claimed.values_list("id", "user_id"))
+            done_ids = [sid for sid, _ in rows]
+
+            update = {
+                "status": "approved" if decision == "approve" else "rejected",
+                "reviewed_at": now,
+                "reviewer": request.user,
+                "claimed_by": None,
+                "claimed_at": None,
+            }
+            if decision == "reject":
+                update["note"] = request.data.get("note", "")
+
+            CourseRequirementSubmission.objects.filter(id__in=done_ids).update(**update)
+
+            if decision == "approve" and rows:
+                CourseParticipant.objects.bulk_create(
+                    [CourseParticipant(course=course, user_id=uid) for _, uid in rows],
+                    ignore_conflicts=True,
+                )
+                # bulk_create tidak memicu signal
+                bump_course_roster(course.id)
+
+        skipped = [i for i in ids if i not in done_ids]
+        return Response({
+            "detail": f"{len(done_ids)} submission diproses.",
+            "processed": done_ids,
+            "skipped": skipped,
+        })
+
+    @action(detail=True, methods=["post"], url_path="submissions/release")
+    def release_submissions(self, request, pk=None):
+        course = self.get_object()
+
+        if not request.user.is_staff:
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        # ids kosong → lepas semua claim milik admin ini
+        ids = request.data.get("ids") or []
+        if not isinstance(ids, list):
+            return Response({"detail": "ids harus berupa list."}, status=400)
+        try:
+            ids = [int(i) for i in ids]
+        except (TypeError, ValueError):
+            return Response({"detail": "ids harus berupa angka."}, status=400)
+
+        qs = CourseRequirementSubmission.objects.filter(course=course, claimed_by=request.user)
+        if ids:
+            qs = qs.filter(id__in=ids)
+
+        released = qs.update(claimed_by=None, claimed_at=None)
+        return Response({"detail": f"{released} submission dilepas."})
 
     # =====================================================================
     # REQUIREMENTS — APPROVE
@@ -312,6 +888,8 @@ class CourseViewSet(viewsets.ModelViewSet):
         submission = get_object_or_404(CourseRequirementSubmission, id=sid, course=course)
 
         submission.status = "approved"
+        submission.claimed_by = None
+        submission.claimed_at = None
         submission.reviewed_at = timezone.now()
         submission.reviewer = request.user
         submission.save()
@@ -337,6 +915,8 @@ class CourseViewSet(viewsets.ModelViewSet):
         submission = get_object_or_404(CourseRequirementSubmission, id=sid, course=course)
 
         submission.status = "rejected"
+        submission.claimed_by = None
+        submission.claimed_at = None
         submission.note = request.data.get("note", "")
         submission.reviewed_at = timezone.now()
         submission.reviewer = request.user
@@ -392,13 +972,14 @@ class CourseViewSet(viewsets.ModelViewSet):
     def list_syllabus(self, request, pk=None):
         course = self.get_object()
         syllabus = course.syllabus.all().order_by("id")
-        serializer = CourseSyllabusSerializer(syllabus, many=True)
-        return Response(serializer.data)
+        return self.course_content_response(
+            request, course, lambda: self.paginated_response(syllabus, CourseSyllabusSerializer)
+        )
 
     @action(detail=True, methods=["post"], url_path="syllabus/create")
     def syllabus_create(self, request, pk=None):
         course = self.get_object()
-        if not (request.user.is_staff or user_role_in_course(request.user, course.id, ["trainer"])):
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
         serializer = CourseSyllabusCreateUpdateSerializer(data=request.data)
@@ -410,7 +991,7 @@ class CourseViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["patch"], url_path="syllabus/(?P<sid>[^/.]+)/update")
     def syllabus_update(self, request, pk=None, sid=None):
         course = self.get_object()
-        if not (request.user.is_staff or user_role_in_course(request.user, course.id, ["trainer"])):
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
         syllabus = get_object_or_404(CourseSyllabus, id=sid, course=course)
@@ -423,7 +1004,7 @@ class CourseViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["delete"], url_path="syllabus/(?P<sid>[^/.]+)/delete")
     def syllabus_delete(self, request, pk=None, sid=None):
         course = self.get_object()
-        if not (request.user.is_staff or user_role_in_course(request.user, course.id, ["trainer"])):
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
         syllabus = get_object_or_404(CourseSyllabus, id=sid, course=course)
@@ -437,8 +1018,9 @@ class CourseViewSet(viewsets.ModelViewSet):
     def list_tasks(self, request, pk=None):
         course = self.get_object()
         tasks = course.tasks.all().order_by("-created_at")
-        serializer = CourseTaskSerializer(tasks, many=True)
-        return Response(serializer.data)
+        return self.course_content_response(
+            request, course, lambda: self.paginated_response(tasks, CourseTaskSerializer)
+        )
 
     # =====================================================================
     # MATERIAL CRUD
@@ -447,14 +1029,15 @@ class CourseViewSet(viewsets.ModelViewSet):
     def list_materials(self, request, pk=None):
         course = self.get_object()
         materials = course.materials.all().order_by("id")
-        serializer = CourseMaterialSerializer(materials, many=True)
-        return Response(serializer.data)
+        return self.course_content_response(
+            request, course, lambda: self.paginated_response(materials, CourseMaterialSerializer)
+        )
 
     @action(detail=True, methods=["post"], url_path="materials/create")
     def create_material(self, request, pk=None):
         course = self.get_object()
 
-        if not (request.user.is_staff or user_role_in_course(request.user, course.id, ["trainer"])):
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
         ser = CourseMaterialCreateUpdateSerializer(data=request.data)
@@ -467,7 +1050,7 @@ class CourseViewSet(viewsets.ModelViewSet):
     def update_material(self, request, pk=None, mid=None):
         course = self.get_object()
 
-        if not (request.user.is_staff or user_role_in_course(request.user, course.id, ["trainer"])):
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
         mat = get_object_or_404(CourseMaterial, id=mid, course=course)
@@ -481,7 +1064,7 @@ class CourseViewSet(viewsets.ModelViewSet):
     def delete_material(self, request, pk=None, mid=None):
         course = self.get_object()
 
-        if not (request.user.is_staff or user_role_in_course(request.user, course.id, ["trainer"])):
+        if not (request.user.is_staff or user_role_in_course(request, course.id, ["trainer"])):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
         mat = get_object_or_404(CourseMaterial, id=mid, course=course)
@@ -494,9 +1077,8 @@ class CourseViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["get"], url_path="exams")
     def list_exams(self, request, pk=None):
         course = self.get_object()
-        exams = course.exams.all().order_by("-created_at")
-        serializer = ExamPublicSerializer(exams, many=True, context={"request": request})
-        return Response(serializer.data)
+        exams = exam_summary_queryset(course.exams.all().order_by("-created_at"), request)
+        return self.paginated_response(exams, ExamSummarySerializer, context={"request": request})
 
     # =====================================================================
     # ASSESSMENT & EVALUATION
@@ -515,7 +1097,9 @@ class CourseViewSet(viewsets.ModelViewSet):
     def list_criteria(self, request, pk=None):
         course = self.get_object()
         qs = CourseAssessmentCriteria.objects.filter(course=course).order_by("order")
-        return Response(CourseAssessmentCriteriaSerializer(qs, many=True).data)
+        return self.course_content_response(
+            request, course, lambda: self.paginated_response(qs, CourseAssessmentCriteriaSerializer)
+        )
 
     @action(detail=True, methods=["patch"], url_path="assessment/criteria/(?P<cid>[^/.]+)/update", permission_classes=[IsAdmin])
     def update_criteria(self, request, pk=None, cid=None):
@@ -543,7 +1127,19 @@ class CourseViewSet(viewsets.ModelViewSet):
         assessment = serializer.save(assessor=request.user)
         return Response(CourseAssessmentSerializer(assessment).data, status=201)
 
-    @action(detail=True, methods=["get"], url_path="assessment/(?P<user_id>[^/.]+)")
+    # grid peserta × kriteria, disimpan sekali
+    @action(detail=True, methods=["post"], url_path="assessment/matrix", permission_classes=[IsTrainer|IsAdmin|IsAssessor])
+    def submit_assessment_matrix(self, request, pk=None):
+        course = self.get_object()
+
+        cleaned, errors = validate_assessment_matrix(course, request.data.get("entries"))
+        if errors:
+            return Response({"detail": "Data penilaian tidak valid.", "errors": errors}, status=400)
+
+        result = save_assessment_matrix(course, request.user, cleaned)
+        return Response({"detail": "Penilaian disimpan.", **result})
+
+    @action(detail=True, methods=["get"], url_path="assessment/(?P<user_id>[0-9]+)")
     def get_assessment(self, request, pk=None, user_id=None):
         course = self.get_object()
         assessment = CourseAssessment.objects.filter(course=course, user__id=user_id).first()
@@ -551,64 +1147,64 @@ class CourseViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Not found"}, status=404)
         return Response(CourseAssessmentSerializer(assessment).data)
 
-    @action(detail=True, methods=["get"], url_path="evaluation/(?P<user_id>[^/.]+)")
-    def evaluation(self, request, pk=None, user_id=None):
+    @action(detail=True, methods=["get"], url_path="evaluation")
+    def evaluation_matrix(self, request, pk=None):
         """
-        Mode evaluasi final course.
+        Grid hasil evaluasi final semua peserta course (satu request).
+        ?attempt=latest|best
         """
         course = self.get_object()
-        mode = course.evaluation_mode or "none"
-
-        exams = []
-        mandatory_failed = False
-        for exam in course.exams.all():
-            ue = exam.userexams.filter(user__id=user_id).order_by("-attempt_number").first()
-            score = ue.score if ue else None
-            passed = None
-            if score is not None and exam.passing_grade is not None:
-                passed = (score >= exam.passing_grade)
-
-            exams.append({
-                "exam_id": exam.id,
-                "title": exam.title,
-                "score": score,
-                "passing_grade": exam.passing_grade,
-                "passed": passed,
-                "mandatory": bool(exam.is_mandatory)
-            })
 
-            if exam.is_mandatory and passed is False:
-                mandatory_failed = True
+        if not (request.user.is_staff
+                or user_role_in_course(request, course.id, ["trainer", "assessor"])):
+            return Response({"detail": "Tidak diizinkan."}, status=403)
 
-        assessment = CourseAssessment.objects.filter(course=course, user__id=user_id).first()
-        assessment_data = CourseAssessmentSerializer(assessment).data if assessment else None
+        strategy = request.query_params.get("attempt", "latest")
+        if strategy not in ATTEMPT_STRATEGIES:
+            return Response({"detail": "attempt harus 'latest' atau 'best'."}, status=400)
 
-        final_status = None
+        return Response(cached_course_evaluation(course, strategy))
 
-        if mode == "none":
-            return Response({"evaluation_enabled": False})
+    @action(detail=True, methods=["get"], url_path="evaluation/(?P<user_id>[0-9]+)")
+    def evaluation(self, request, pk=None, user_id=None):
+        """
+        Mode evaluasi final course.
+        """
+        course = self.get_object()
 
-        if mode == "exam_only":
-            final_status = "passed" if not mandatory_failed else "not_passed"
+        if not (request.user.is_staff
+                or str(request.user.id) == str(user_id)
+                or user_role_in_course(request, course.id, ["trainer", "assessor"])):
+            return Response({"detail": "Tidak diizinkan."}, status=403)
 
-        elif mode == "assessment_only":
-            final_status = assessment.status if assessment else None
+        if (course.evaluation_mode or "none") == "none":
+            return Response({"evaluation_enabled": False})
 
-        elif mode == "combined":
-            if mandatory_failed:
-                final_status = "not_passed"
-            else:
-                final_status = assessment.status if assessment else None
+        result = evaluate_course(course, user_ids=[int(user_id)])
+        titles = {e["exam_id"]: e for e in result["exams"]}
+        row = result["participants"][0] if result["participants"] else None
 
-        elif mode == "manual":
-            final_status = assessment.status if assessment else None
+        exams = [
+            {
+                "exam_id": r["exam_id"],
+                "title": titles[r["exam_id"]]["title"],
+                "score": r["score"],
+                "passing_grade": titles[r["exam_id"]]["passing_grade"],
+                "passed": r["passed"],
+                "mandatory": r["mandatory"],
+            }
+            for r in (row["exams"] if row else [])
+        ]
+
+        assessment = CourseAssessment.objects.filter(course=course, user__id=user_id).first()
+        assessment_data = CourseAssessmentSerializer(assessment).data if assessment else None
 
         return Response({
             "evaluation_enabled": True,
-            "mode": mode,
+            "mode": result["mode"],
             "exams": exams,
             "assessment": assessment_data,
-            "final_status": final_status
+            "final_status": row["final_status"] if row else None
         })
 
 
@@ -617,7 +1213,7 @@ class CourseViewSet(viewsets.ModelViewSet):
 # ================================================================
 # ⚡  EXAM VIEWSET (SUPER FIXED)
 # ================================================================
-class ExamViewSet(viewsets.ModelViewSet):
+class ExamViewSet(CachedObjectMixin, PaginatedActionMixin, viewsets.ModelViewSet):
     queryset = Exam.objects.all().order_by("-created_at")
     serializer_class = ExamAdminSerializer
     permission_classes = [drf_permissions.IsAuthenticated]
@@ -629,43 +1225,67 @@ class ExamViewSet(viewsets.ModelViewSet):
         if self.action in ["start", "questions", "submit", "finish", "my_result"]:
             return [IsCourseParticipant()]
 
-        if self.action in ["list_results", "user_result", "grade_answer", "analytics", "export"]:
+        if self.action in ["list_results", "user_result", "grade_answer", "analytics", "export",
+                           "grading_queue", "claim_grading", "bulk_grade", "release_grading"]:
             return [IsExamInstructorOrAssessor()]
 
         if self.action in ["create", "update", "partial_update", "destroy",
-                           "create_question", "update_question", "delete_question"]:
+                           "create_question", "update_question", "delete_question",
+                           "import_questions", "export_questions", "question_template",
+                           "clone"]:
             return [IsExamCreator()]
 
         return [drf_permissions.IsAuthenticated()]
 
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action in ["list", "summary"]:
+            return exam_summary_queryset(qs, self.request)
+
+        if self.action == "retrieve":
+            fields = self.request.query_params.get("fields", "")
+            if not fields or "questions" in fields.split(","):
+                qs = qs.prefetch_related("questions__choices", "questions__child_questions")
+        return qs
+
     # --------------------------------------------
     # SAFE SERIALIZER HANDLING
     # --------------------------------------------
     def get_serializer_class(self):
         user = self.request.user
 
-        # LIST
-        if self.action == "list":
-            return ExamPublicSerializer
+        # LIST / LANDING → ringkasan tanpa soal
+        if self.action in ["list", "summary"]:
+            return ExamSummarySerializer
 
         # CRUD
         if self.action in ["create", "update", "partial_update", "destroy"]:
             return ExamAdminSerializer
 
-        # DETAIL
-        try:
-            exam = self.get_object()
-        except:
-            exam = None
-
         if user.is_staff:
             return ExamAdminSerializer
 
-        if exam and user_role_in_course(user, exam.course_id, ["trainer", "assessor"]):
-            return ExamAdminSerializer
+        # DETAIL (object di-memoize, tidak query ulang)
+        if self.kwargs.get("pk"):
+            try:
+                exam = self.get_object()
+            except Exception:
+                exam = None
+
+            if exam and user_role_in_course(self.request, exam.course_id, ["trainer", "assessor"]):
+                return ExamAdminSerializer
 
         return ExamPublicSerializer
 
+    # ============================================================
+    # SUMMARY (landing page: tanpa soal)
+    # ============================================================
+    @action(detail=True, methods=["get"], url_path="summary")
+    def summary(self, request, pk=None):
+        exam = self.get_object()
+        serializer = self.get_serializer(exam)
+        return Response(serializer.data)
+
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
         ctx["request"] = self.request
@@ -677,8 +1297,8 @@ class ExamViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["get"], url_path="results")
     def list_results(self, request, pk=None):
         exam = self.get_object()
-        results = UserExam.objects.filter(exam=exam)
-        return Response(ExamResultSerializer(results, many=True).data)
+        results = UserExam.objects.filter(exam=exam).select_related("user")
+        return self.paginated_response(results, ExamResultSerializer)
 
     @action(detail=True, methods=["get"], url_path="results/(?P<user_id>[^/.]+)")
     def user_result(self, request, pk=None, user_id=None):
@@ -707,19 +1327,96 @@ class ExamViewSet(viewsets.ModelViewSet):
         exam = self.get_object()
         ans = get_object_or_404(UserAnswer, id=answer_id, user_exam__exam=exam)
 
-        if not CourseParticipant.objects.filter(
-            course=exam.course,
-            user=request.user,
-            role="assessor"
-        ).exists() and not request.user.is_staff:
+        if not (request.user.is_staff or user_role_in_course(request, exam.course_id, ["assessor"])):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
-        ans.score = request.data.get("score")
-        ans.graded = True
-        ans.save()
+        scores, errors = parse_grades([{"answer": ans.id, "score": request.data.get("score")}])
+        if not errors:
+            graded, skipped, errors = apply_grades(exam, request.user, scores)
+            if skipped:
+                return Response({"detail": "Jawaban sedang dinilai penilai lain."}, status=409)
+        if errors:
+            return Response({"detail": next(iter(errors.values()))}, status=400)
 
         return Response({"detail": "Jawaban dinilai."})
 
+    # ============================================================
+    # GRADING QUEUE — jawaban TEXT / FILE yang belum dinilai
+    # (claim → bulk grade; beberapa assessor bisa menilai bersamaan,
+    # baris yang sedang di-lock penilai lain dilewati / SKIP LOCKED)
+    # ============================================================
+    def grading_answers(self, qs):
+        return qs.select_related("user_exam__user", "question", "claimed_by").prefetch_related("files")
+
+    @action(detail=True, methods=["get"], url_path="grading/queue")
+    def grading_queue(self, request, pk=None):
+        exam = self.get_object()
+        qs = manual_answer_queryset(exam, request.query_params.get("question"))
+
+        claimed = request.query_params.get("claimed")
+        if claimed == "me":
+            qs = qs.filter(claimed_by=request.user)
+        elif claimed == "none":
+            qs = qs.filter(claimed_by__isnull=True)
+
+        return self.paginated_response(self.grading_answers(qs).order_by("id"), GradingAnswerSerializer)
+
+    @action(detail=True, methods=["post"], url_path="grading/claim")
+    def claim_grading(self, request, pk=None):
+        exam = self.get_object()
+
+        if not (request.user.is_staff or user_role_in_course(request, exam.course_id, ["assessor"])):
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        try:
+            limit = max(1, min(int(request.data.get("limit", 20)), 200))
+        except (TypeError, ValueError):
+            return Response({"detail": "limit harus berupa angka."}, status=400)
+
+        ids, now = claim_answers(exam, request.user, limit, request.data.get("question"))
+        answers = self.grading_answers(UserAnswer.objects.filter(id__in=ids)).order_by("question_id", "id")
+
+        return Response({
+            "lease_expires_at": now + UserAnswer.CLAIM_LEASE,
+            "results": GradingAnswerSerializer(answers, many=True).data,
+        })
+
+    @action(detail=True, methods=["post"], url_path="grading/bulk")
+    def bulk_grade(self, request, pk=None):
+        """Body: {"grades": [{"answer": id, "score": nilai}, ...]}"""
+        exam = self.get_object()
+
+        if not (request.user.is_staff or user_role_in_course(request, exam.course_id, ["assessor"])):
+            return Response({"detail": "Tidak diizinkan."}, status=403)
+
+        scores, errors = parse_grades(request.data.get("grades"))
+        if errors:
+            return Response({"detail": "Data nilai tidak valid.", "errors": errors}, status=400)
+
+        graded, skipped, errors = apply_grades(exam, request.user, scores)
+        return Response({
+            "detail": f"{len(graded)} jawaban dinilai.",
+            "graded": graded,
+            "skipped": skipped,
+            "errors": errors,
+        })
+
+    @action(detail=True, methods=["post"], url_path="grading/release")
+    def release_grading(self, request, pk=None):
+        exam = self.get_object()
+
+        # ids kosong → lepas semua claim milik user ini
+        ids = request.data.get("ids") or []
+        if not isinstance(ids, list):
+            return Response({"detail": "ids harus berupa list."}, status=400)
+        try:
+            ids = [int(i) for i in ids]
+        except (TypeError, ValueError):
+            return Response({"detail": "ids harus berupa angka."}, status=400)
+
+        released = release_answers(exam, request.user, ids)
+        return Response({"detail": f"{released} jawaban dilepas."})
+
     # ============================================================
     # START EXAM
     # ============================================================
@@ -730,7 +1427,7 @@ class ExamViewSet(viewsets.ModelViewSet):
         if not exam.is_open():
             return Response({"detail": "Exam tidak aktif."}, status=400)
 
-        if not CourseParticipant.objects.filter(course=exam.course, user=request.user).exists():
+        if not user_role_in_course(request, exam.course_id, ["participant", "trainer", "assessor"]):
             return Response({"detail": "Anda bukan peserta."}, status=403)
 
         prev = UserExam.objects.filter(user=request.user, exam=exam).count()
@@ -779,6 +1476,79 @@ class ExamViewSet(viewsets.ModelViewSet):
         q.delete()
         return Response({"detail": "Deleted."})
 
+    # ============================================================
+    # CLONE EXAM (soal, pilihan, percabangan)
+    # ============================================================
+    @action(detail=True, methods=["post"], url_path="clone")
+    def clone(self, request, pk=None):
+        exam = self.get_object()
+
+        target = exam.course
+        target_id = request.data.get("course")
+        if target_id and str(target_id) != str(exam.course_id):
+            target = get_object_or_404(Course, pk=target_id)
+            if not (request.user.is_staff
+                    or user_role_in_course(request, target.id, ["trainer", "assessor"])):
+                return Response({"detail": "Tidak diizinkan pada course tujuan."}, status=403)
+
+        new_exam, counts = clone_exam(exam, course=target, title=request.data.get("title"))
+
+        return Response({
+            "detail": "Exam berhasil disalin.",
+            "exam_id": new_exam.id,
+            "course_id": new_exam.course_id,
+            "copied": counts,
+        }, status=201)
+
+    # ============================================================
+    # QUESTION BANK — IMPORT / EXPORT (JSON & spreadsheet)
+    # ============================================================
+    @action(detail=True, methods=["get"], url_path="questions/export")
+    def export_questions(self, request, pk=None):
+        exam = self.get_object()
+        bank = export_bank(exam)
+
+        if request.query_params.get("type") == "xlsx":
+            return workbook_response(bank_to_workbook(bank), f"exam_{exam.id}_questions.xlsx")
+        return Response(bank)
+
+    @action(detail=True, methods=["get"], url_path="questions/template")
+    def question_template(self, request, pk=None):
+        exam = self.get_object()
+        return workbook_response(bank_to_workbook({"questions": []}), f"exam_{exam.id}_template.xlsx")
+
+    @action(detail=True, methods=["post"], url_path="questions/import")
+    def import_questions(self, request, pk=None):
+        exam = self.get_object()
+
+        upload = request.FILES.get("file")
+        if upload:
+            try:
+                if upload.name.lower().endswith(".json"):
+                    data = json.load(upload)
+                else:
+                    data = workbook_to_bank(upload)
+            except (QuestionBankFormatError, ValueError) as e:
+                return Response({"detail": str(e) or "Format file tidak valid."}, status=400)
+            if not isinstance(data, dict):
+                return Response({"detail": "Format file tidak valid."}, status=400)
+            data["replace"] = request.data.get("replace", data.get("replace", False))
+        else:
+            data = request.data
+
+        ser = QuestionBankSerializer(data=data)
+        ser.is_valid(raise_exception=True)
+
+        try:
+            result = import_bank(
+                exam,
+                ser.validated_data["questions"],
+                replace=ser.validated_data["replace"],
+            )
+        except QuestionBankConflictError as e:
+            return Response({"detail": str(e)}, status=409)
+        return Response({"detail": "Bank soal berhasil diimport.", **result}, status=201)
+
     # ============================================================
     # GET QUESTIONS
     # ============================================================
@@ -787,7 +1557,7 @@ class ExamViewSet(viewsets.ModelViewSet):
         exam = self.get_object()
 
         # permission check
-        if not CourseParticipant.objects.filter(course=exam.course, user=request.user).exists():
+        if not user_role_in_course(request, exam.course_id, ["participant", "trainer", "assessor"]):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
         # Ambil semua pertanyaan exam
@@ -983,7 +1753,7 @@ class ExamViewSet(viewsets.ModelViewSet):
         exam = self.get_object()
 
         user_exams = UserExam.objects.filter(exam=exam)
-        participants = CourseParticipant.objects.filter(course=exam.course, role="participant")
+        participants = CourseParticipant.objects.filter(course_id=exam.course_id, role="participant")
         completed = user_exams.filter(status="completed")
 
         scores = list(completed.values_list("score", flat=True))
@@ -1114,7 +1884,7 @@ class ExamViewSet(viewsets.ModelViewSet):
 # ================================================================
 # TASK VIEWSET
 # ================================================================
-class CourseTaskViewSet(viewsets.ModelViewSet):
+class CourseTaskViewSet(CachedObjectMixin, viewsets.ModelViewSet):
     queryset = CourseTask.objects.all().order_by("-created_at")
     serializer_class = CourseTaskSerializer
     permission_classes = [drf_permissions.IsAuthenticated]
@@ -1132,7 +1902,7 @@ class CourseTaskViewSet(viewsets.ModelViewSet):
         task = self.get_object()
 
         # must be participant
-        if not CourseParticipant.objects.filter(course=task.course, user=request.user).exists():
+        if not user_role_in_course(request, task.course_id, ["participant", "trainer", "assessor"]):
             return Response({"detail": "Tidak diizinkan."}, status=403)
 
         # check existing submission
@@ -1193,7 +1963,7 @@ class CourseTaskViewSet(viewsets.ModelViewSet):
 # ================================================================
 # TASK SUBMISSION VIEWSET
 # ================================================================
-class TaskSubmissionViewSet(viewsets.ReadOnlyModelViewSet):
+class TaskSubmissionViewSet(CachedObjectMixin, viewsets.ReadOnlyModelViewSet):
     queryset = CourseTaskSubmission.objects.all().order_by("-submitted_at")
     serializer_class = CourseTaskSubmissionSerializer
     permission_classes = [drf_permissions.IsAuthenticated]
@@ -1234,7 +2004,7 @@ class AdminDashboardAPIView(APIView):
 
 
         # Pending essay grading
-        pending_essay_grading = UserAnswer.objects.filter(text_answer__isnull=False).exclude(text_answer="").filter(graded=False).count()
+        pending_essay_grading = manual_answer_queryset().count()
 
         # Running / active courses (overlapping today)
         running_courses_qs = Course.objects.filter(start_date__lte=today, end_date__gte=today).order_by("start_date")[:10]
@@ -1,6 +1,6 @@
 from django.shortcuts import render,redirect
 from exam.models import CourseParticipant, Exam
-from cv.models import UserProfile
+from cv.profiles import get_profile
 from django.contrib.auth.decorators import login_required
 from django.template.loader import get_template
 
@@ -19,11 +19,8 @@ def dashboard_view(request):
     tasks_count = 0  # nanti dihubungkan dengan CourseTask
 
     # CV Status
-    try:
-        profile = UserProfile.objects.get(user=user)
-        cv_complete = bool(profile.full_name)
-    except UserProfile.DoesNotExist:
-        cv_complete = False
+    profile = get_profile(request)
+    cv_complete = bool(profile and profile.full_name)
 
     context = {
         "courses": courses,
@@ -26,10 +26,7 @@ document.addEventListener("DOMContentLoaded", () => {
     // ============================================================
     // LOAD MAIN COURSE INFO
     // ============================================================
-    async function loadCourse() {
-        const res = await fetch(`/api/exam/courses/${COURSE_ID}/`);
-        const data = await res.json();
-
+    function renderCourse(data) {
         // Header
         titleBox.innerText = data.title;
         descBox.innerText = data.description || "-";
@@ -119,10 +116,7 @@ document.addEventListener("DOMContentLoaded", () => {
     // ============================================================
     // REQUIREMENT TAB
     // ============================================================
-    async function loadRequirementStatus() {
-        const res = await fetch(`/api/exam/courses/${COURSE_ID}/requirements/`);
-        const data = await res.json();
-
+    function renderRequirementStatus(data) {
         reqFillBtn.href = `/courses/${COURSE_ID}/requirements/`;
 
         if (!data.templates.length) {
@@ -155,9 +149,7 @@ document.addEventListener("DOMContentLoaded", () => {
     // ============================================================
     // SYLLABUS
     // ============================================================
-    async function loadSyllabus() {
-        const res = await fetch(`/api/exam/courses/${COURSE_ID}/syllabus/`);
-        const data = await res.json();
+    function renderSyllabus(data) {
 
         if (!data.length) {
             syllabusList.innerHTML = `<div class="text-muted">Belum ada syllabus.</div>`;
@@ -180,9 +172,7 @@ document.addEventListener("DOMContentLoaded", () => {
     // ============================================================
     // MATERIALS
     // ============================================================
-    async function loadMaterials() {
-        const res = await fetch(`/api/exam/courses/${COURSE_ID}/materials/`);
-        const data = await res.json();
+    function renderMaterials(data) {
 
         if (!data.length) {
             materialsList.innerHTML = `<div class="text-muted">Belum ada materi.</div>`;
@@ -204,9 +194,7 @@ document.addEventListener("DOMContentLoaded", () => {
     // ============================================================
     // TASKS
     // ============================================================
-    async function loadTasks() {
-        const res = await fetch(`/api/exam/courses/${COURSE_ID}/tasks/`);
-        const data = await res.json();
+    function renderTasks(data) {
 
         if (!data.length) {
             tasksList.innerHTML = `<div class="text-muted">Belum ada tugas.</div>`;
@@ -230,9 +218,7 @@ document.addEventListener("DOMContentLoaded", () => {
     // ============================================================
     // EXAMS
     // ============================================================
-    async function loadExams() {
-        const res = await fetch(`/api/exam/courses/${COURSE_ID}/exams/`);
-        const data = await res.json();
+    function renderExams(data) {
 
         if (!data.length) {
             examsList.innerHTML = `<div class="text-muted">Belum ada ujian.</div>`;
@@ -268,12 +254,21 @@ document.addEventListener("DOMContentLoaded", () => {
 
 
     // ============================================================
-    // INIT
+    // INIT — satu request (bundle), browser revalidasi lewat ETag
     // ============================================================
-    loadCourse();
-    loadRequirementStatus();
-    loadSyllabus();
-    loadMaterials();
-    loadTasks();
-    loadExams();
+    async function loadBundle() {
+        const res = await fetch(`/api/exam/courses/${COURSE_ID}/bundle/`, {
+            credentials: "same-origin"
+        });
+        const data = await res.json();
+
+        renderCourse(data.course);
+        renderRequirementStatus(data.requirements);
+        renderSyllabus(data.syllabus);
+        renderMaterials(data.materials);
+        renderTasks(data.tasks);
+        renderExams(data.exams);
+    }
+
+    loadBundle();
 });
@@ -57,7 +57,8 @@ const ExamApp = (() => {
     tbody.innerHTML = `<tr><td colspan="5">Memuat…</td></tr>`;
 
     try {
-      const exams = await xhrJson(`${API_BASE}/`);
+      const data = await xhrJson(`${API_BASE}/`);
+      const exams = Array.isArray(data) ? data : (data && data.results) || [];
 
       if (!Array.isArray(exams) || exams.length === 0) {
         tbody.innerHTML = `<tr><td colspan="5">Tidak ada ujian.</td></tr>`;
@@ -110,7 +111,7 @@ const ExamApp = (() => {
   ========================================================================= */
   async function initStartPage(examId) {
     try {
-      const ex = await xhrJson(`${API_BASE}/${examId}/`);
+      const ex = await xhrJson(`${API_BASE}/${examId}/summary/`);
 
       document.getElementById("exam-title").textContent = ex.title;
       document.getElementById("exam-desc").textContent = ex.description || "-";
@@ -44,7 +44,7 @@
 
   async function loadExamInfo() {
     try {
-        const data = await jsonFetch(`/api/exam/exams/${EXAM_ID}/`);
+        const data = await jsonFetch(`/api/exam/exams/${EXAM_ID}/summary/?fields=id,title`);
         document.getElementById("exam-title").innerText = data.title || "Ujian";
     } catch (e) {
         document.getElementById("exam-title").innerText = "Judul tidak dapat dimuat";
@@ -95,8 +95,9 @@
   // -----------------------
   async function loadTimer() {
     try {
-      const list = await jsonFetch(`/api/exam/exams/${EXAM_ID}/results/`);
-      const attempt = Array.isArray(list) ? list.find(x => x.id === ATTEMPT_ID) : (list || null);
+      const data = await jsonFetch(`/api/exam/exams/${EXAM_ID}/results/?paginate=false`);
+      const list = Array.isArray(data) ? data : (data && data.results) || [];
+      const attempt = list.find(x => x.id === ATTEMPT_ID) || null;
       if (!attempt) return;
       examStart = attempt.start_time;
       examDuration = (attempt.exam && attempt.exam.duration_minutes) ? attempt.exam.duration_minutes : attempt.duration_minutes;
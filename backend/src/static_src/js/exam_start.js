@@ -8,14 +8,15 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     async function loadExam() {
-        const res = await fetch(`/api/exam/exams/${EXAM_ID}/`);
+        const res = await fetch(`/api/exam/exams/${EXAM_ID}/summary/`);
         const data = await res.json();
 
         document.getElementById("exam-title").innerText = data.title;
         document.getElementById("exam-desc").innerText = data.description || "-";
         document.getElementById("exam-duration").innerText = data.duration_minutes || "-";
         document.getElementById("exam-passing").innerText = data.passing_grade || "-";
-        document.getElementById("exam-attempt").innerText = data.user_attempt || "0";
+        document.getElementById("exam-attempt").innerText =
+            data.attempt_limit ? `${data.attempts_used} / ${data.attempt_limit}` : (data.attempts_used || "0");
     }
 
     document.getElementById("btn-start-exam").onclick = async () => {